@@ -0,0 +1,134 @@
+# Batch scanning for BiasRadar - fans documents out over a warm process pool
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    from _bias_detection import hybrid_detect_bias, cached_hybrid_detect_bias, build_scan_response, DEFAULT_MAX_OCCURRENCES_PER_TERM
+except ImportError:
+    from api.biasradar._bias_detection import hybrid_detect_bias, cached_hybrid_detect_bias, build_scan_response, DEFAULT_MAX_OCCURRENCES_PER_TERM
+
+BATCH_WORKERS = int(os.environ.get("BIASRADAR_BATCH_WORKERS", os.cpu_count() or 1))
+MAX_BATCH_DOCUMENTS = 1000
+MAX_DOCUMENT_LENGTH = 50000
+
+# The pool lives as long as the process, so warm invocations reuse workers
+# that have already imported the lexicons and built the matchers.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_unavailable = False
+_END = object()
+
+
+def _init_worker() -> None:
+    """Run one tiny scan so lazy state is built before the first real document."""
+    hybrid_detect_bias("warm up")
+
+
+def get_batch_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared worker pool, creating it on first use.
+    
+    Returns None where the platform cannot host a process pool (no
+    /dev/shm or fork support); callers then scan documents inline.
+    """
+    global _pool, _pool_unavailable
+    if _pool is None and not _pool_unavailable and BATCH_WORKERS > 1:
+        try:
+            _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, initializer=_init_worker)
+        except (OSError, NotImplementedError) as e:
+            print(f"[BIASRADAR BATCH] Process pool unavailable, scanning inline: {e}")
+            _pool_unavailable = True
+    return _pool
+
+
+def scan_document(document: Any, index: int = 0) -> Dict[str, Any]:
+    """
+    Scan one batch document and return {"id", "result"} or {"id", "error"}.
+    
+    Accepts the same per-document options as /scan: text, enable_ai,
+    ai_token_budget, ai_latency_budget, all_occurrences,
+    max_occurrences_per_term, flagged_only_heatmap and response_format. A missing id falls back to the document's index.
+    """
+    if not isinstance(document, dict):
+        return {"id": index, "error": "Each document must be a JSON object"}
+    
+    doc_id = document.get("id", index)
+    text = document.get("text", "")
+    max_occurrences_per_term = document.get("max_occurrences_per_term", DEFAULT_MAX_OCCURRENCES_PER_TERM)
+    response_format = document.get("response_format", "v1")
+    flagged_only_heatmap = bool(document.get("flagged_only_heatmap", False))
+    
+    if not isinstance(text, str) or len(text.strip()) == 0:
+        return {"id": doc_id, "error": "Text cannot be empty"}
+    if len(text) > MAX_DOCUMENT_LENGTH:
+        return {"id": doc_id, "error": "Text too long. Maximum 50,000 characters."}
+    if max_occurrences_per_term is not None and (
+        not isinstance(max_occurrences_per_term, int) or max_occurrences_per_term < 0
+    ):
+        return {"id": doc_id, "error": "max_occurrences_per_term must be a non-negative integer"}
+    ai_token_budget = document.get("ai_token_budget")
+    if ai_token_budget is not None and (not isinstance(ai_token_budget, int) or ai_token_budget < 0):
+        return {"id": doc_id, "error": "ai_token_budget must be a non-negative integer"}
+    ai_latency_budget = document.get("ai_latency_budget")
+    if ai_latency_budget is not None and (
+        isinstance(ai_latency_budget, bool) or not isinstance(ai_latency_budget, (int, float))
+        or ai_latency_budget < 0
+    ):
+        return {"id": doc_id, "error": "ai_latency_budget must be a non-negative number of seconds"}
+    if response_format not in ("v1", "v2"):
+        return {"id": doc_id, "error": "response_format must be 'v1' or 'v2'"}
+    
+    try:
+        result = cached_hybrid_detect_bias(
+            text,
+            enable_ai=bool(document.get("enable_ai", False)),
+            all_occurrences=bool(document.get("all_occurrences", False)),
+            max_occurrences_per_term=max_occurrences_per_term,
+            flagged_only_heatmap=flagged_only_heatmap,
+            response_format=response_format,
+            ai_token_budget=ai_token_budget,
+            ai_latency_budget=ai_latency_budget
+        )
+    except Exception as e:
+        return {"id": doc_id, "error": f"Error processing document: {str(e)}"}
+    
+    return {"id": doc_id, "result": build_scan_response(result, response_format, flagged_only_heatmap)}
+
+
+def iter_batch_results(documents: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Scan documents across the worker pool, yielding each result as it finishes.
+    
+    Results arrive in completion order, not input order; use the id to
+    match them up. At most two documents per worker are in flight, so a
+    long input stream is consumed as workers free up rather than all at once.
+    """
+    pool = get_batch_pool()
+    if pool is None:
+        for index, document in enumerate(documents):
+            yield scan_document(document, index)
+        return
+    
+    max_in_flight = BATCH_WORKERS * 2
+    pending = {}
+    documents = iter(documents)
+    index = 0
+    while True:
+        while len(pending) < max_in_flight:
+            document = next(documents, _END)
+            if document is _END:
+                break
+            pending[pool.submit(scan_document, document, index)] = (document, index)
+            index += 1
+        if not pending:
+            return
+        
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            document, doc_index = pending.pop(future)
+            try:
+                yield future.result()
+            except Exception as e:
+                # A crashed worker should cost one document, not the whole batch
+                doc_id = document.get("id", doc_index) if isinstance(document, dict) else doc_index
+                yield {"id": doc_id, "error": f"Error processing document: {str(e)}"}
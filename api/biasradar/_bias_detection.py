@@ -1,15 +1,30 @@
 # Shared bias detection logic for BiasRadar - Enterprise Edition
 # Updated with context-aware detection and EEO auto-whitelist
 import re
-from typing import List, Dict, Any
-
-# Import profanity detection
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+_IMPORT_STARTED = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+# The LLM cache and transport (sqlite3, http.client, ssl) are imported on the
+# first AI-enabled scan, so plain pattern scans never pay for them at cold start
 try:
-    from better_profanity import profanity
-    profanity.load_censor_words()
-    PROFANITY_AVAILABLE = True
+    from _result_cache import ResultCache
+    from _text_windows import iter_text_windows as _iter_windows, window_cut as _window_cut
 except ImportError:
-    PROFANITY_AVAILABLE = False
+    from api.biasradar._result_cache import ResultCache
+    from api.biasradar._text_windows import iter_text_windows as _iter_windows, window_cut as _window_cut
 
 # EEO WHITELIST - Skip ALL bias checks in these paragraphs
 EEO_WHITELIST_PHRASES = [
@@ -185,19 +200,434 @@ LANGUAGE_TONE_WORDS = {
                            "bullcrap", "idiotic", "moronic", "stupid"]
 }
 
+# Words only flagged as cultural bias when followed by one of these words
+CULTURAL_CONTEXT_SENSITIVE = {
+    "developing": ["countries", "nations", "regions", "world", "markets"],
+    "underdeveloped": ["countries", "regions", "nations"]
+}
+
+# Words that often sit next to coded language but are too ambiguous to flag
+# on their own, grouped by the protected attribute (as EEO statements list
+# them) or the coded-language family they point at; with enable_ai a
+# sentence containing one gets an LLM second opinion (see select_ai_spans).
+# Terms the detectors already flag are left out, and so are words with
+# common neutral senses ("race condition", "border radius", "background job").
+SUBTLE_BIAS_TRIGGER_FAMILIES = {
+    # Protected attributes
+    "age": [
+        "older", "elderly", "seniors", "retirees", "energetic", "high energy",
+        "young blood", "fresh blood", "fresh faces", "recent grad", "recent grads"
+    ],
+    "sex_and_family_status": [
+        "mothers", "fathers", "moms", "dads", "pregnant", "pregnancy", "maternity",
+        "paternity", "childcare", "childless", "family status", "marital status"
+    ],
+    "national_origin": [
+        "mother tongue", "native speaker", "native speakers", "accent", "accents",
+        "citizens", "citizenship", "immigrants", "undocumented", "heritage", "ethnicity"
+    ],
+    "race_and_color": ["minorities", "minority", "racial", "skin color", "skin colour", "complexion"],
+    "religion": ["faith", "faiths", "religious", "worship", "church", "mosque", "synagogue"],
+    "disability": [
+        "disabled", "disability", "disabilities", "able-bodied", "health conditions",
+        "medical conditions", "mental health", "mental illness"
+    ],
+    "sexual_orientation_and_gender_identity": ["lifestyle", "sexual orientation", "gender identity", "same-sex"],
+    "veteran_status": ["veteran", "veterans", "military service"],
+    # Coded-language families
+    "culture_fit": [
+        "culture fit", "cultural fit", "rockstar", "ninja", "guru", "work hard play hard",
+        "like a family", "one of us"
+    ],
+    "class_proxies": [
+        "low-income", "public assistance", "food stamps", "neighborhood", "neighbourhood",
+        "zip code", "pedigree", "prestigious"
+    ],
+    "in_group_framing": [
+        "patriotic", "mainstream", "traditions", "border security", "open borders",
+        "normal people", "ordinary people", "our values"
+    ],
+    "emotional_framing": ["emotionally", "emotional", "hysterical", "shrill", "bossy", "abrasive"],
+}
+SUBTLE_BIAS_TRIGGERS = [word for words in SUBTLE_BIAS_TRIGGER_FAMILIES.values() for word in words]
+
+_NEXT_WORD_RE = re.compile(r'\s+(\w+)')
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the regex \\w class"""
+    return ch.isalnum() or ch == "_"
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """True if a regex \\b would match at this index"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class MultiPatternMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of phrases.
+
+    The automaton is built once; every occurrence of every phrase is then
+    found in a single left-to-right pass over the text. With
+    word_boundaries=True a hit is only reported when a regex \\b would match
+    on both sides of it, so results are identical to searching for
+    r'\\b' + re.escape(phrase) + r'\\b' phrase by phrase.
+    """
+
+    def __init__(self, phrases: Iterable[str], word_boundaries: bool = True):
+        self.phrases = list(dict.fromkeys(phrase.lower() for phrase in phrases))
+        self.word_boundaries = word_boundaries
+
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[int]] = [[]]
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    output.append([])
+                state = next_state
+            output[state].append(index)
+
+        # Breadth-first pass to build failure links and merge outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = [tuple(indexes) for indexes in output]
+        self._lengths = [len(phrase) for phrase in self.phrases]
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def finditer(self, text_lower: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start, phrase) for every hit, ordered by end position"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+        phrases = self.phrases
+        check_boundaries = self.word_boundaries
+        state = 0
+
+        for i, ch in enumerate(text_lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            end = i + 1
+            for index in output[state]:
+                start = end - lengths[index]
+                if check_boundaries and not (
+                    _at_word_boundary(text_lower, start) and _at_word_boundary(text_lower, end)
+                ):
+                    continue
+                yield start, phrases[index]
+
+    def find_all(self, text_lower: str) -> Dict[str, List[int]]:
+        """Map each phrase found in the text to its sorted start positions"""
+        matches: Dict[str, List[int]] = {}
+        for start, phrase in self.finditer(text_lower):
+            positions = matches.get(phrase)
+            if positions is None:
+                matches[phrase] = [start]
+            else:
+                positions.append(start)
+        return matches
+
+
+def _lexicon_terms() -> Iterator[str]:
+    """Every phrase the rule-based detectors look up"""
+    lexicons = [
+        GENDER_BIAS_WORDS, RACE_BIAS_WORDS, AGE_BIAS_WORDS, DISABILITY_BIAS_WORDS,
+        CULTURAL_BIAS_WORDS, POLITICAL_BIAS_WORDS, RELIGION_BIAS_WORDS, LGBTQ_BIAS_WORDS,
+        SOCIOECONOMIC_BIAS_WORDS, TRUTH_SEEKING_WORDS, IDEOLOGICAL_NEUTRALITY_WORDS,
+        LANGUAGE_TONE_WORDS
+    ]
+    for lexicon in lexicons:
+        for words in lexicon.values():
+            yield from words
+    yield from CULTURAL_CONTEXT_SENSITIVE
+    # Not flagged by any detector; matched in the same pass for select_ai_spans
+    yield from SUBTLE_BIAS_TRIGGERS
+
+
+# Compiled once at import; one pass per request finds every lexicon hit
+LEXICON_MATCHER = MultiPatternMatcher(_lexicon_terms())
+
+
+def find_lexicon_matches(text_lower: str) -> Dict[str, List[int]]:
+    """Run the shared lexicon automaton over already-lowercased text"""
+    return LEXICON_MATCHER.find_all(text_lower)
+
+
+# Context term groups consulted by the context-aware rules. Unlike lexicon
+# terms these match as plain substrings, e.g. "market" inside "marketing".
+CONTEXT_TERM_GROUPS = {
+    "gender_whitelist": GENDER_CONTEXT_WHITELIST,
+    "age_neutral": AGE_CONTEXT_NEUTRAL,
+    "age_hiring": AGE_CONTEXT_HIRING
+}
+
+CONTEXT_MATCHER = MultiPatternMatcher(
+    (term for terms in CONTEXT_TERM_GROUPS.values() for term in terms),
+    word_boundaries=False
+)
+
+
+class ContextIndex:
+    """
+    Positions of every context term in a document, grouped by rule.
+
+    Built with one pass of CONTEXT_MATCHER. Each group keeps its hits sorted
+    by start along with a suffix minimum of their end offsets, so "does any
+    term of this group lie entirely inside [lo, hi)" is a single bisect no
+    matter how many terms the group has or how many hits the text contains.
+    """
+
+    __slots__ = ("_starts", "_min_ends", "_length")
+
+    def __init__(self, text_lower: str):
+        groups_of_term: Dict[str, List[str]] = {}
+        for group, terms in CONTEXT_TERM_GROUPS.items():
+            for term in terms:
+                groups_of_term.setdefault(term, []).append(group)
+
+        spans: Dict[str, List[Tuple[int, int]]] = {group: [] for group in CONTEXT_TERM_GROUPS}
+        for start, term in CONTEXT_MATCHER.finditer(text_lower):
+            for group in groups_of_term[term]:
+                spans[group].append((start, start + len(term)))
+
+        self._starts: Dict[str, array] = {}
+        self._min_ends: Dict[str, array] = {}
+        for group, group_spans in spans.items():
+            group_spans.sort()
+            min_ends = array('I', (end for _, end in group_spans))
+            for i in range(len(min_ends) - 2, -1, -1):
+                if min_ends[i + 1] < min_ends[i]:
+                    min_ends[i] = min_ends[i + 1]
+            self._starts[group] = array('I', (start for start, _ in group_spans))
+            self._min_ends[group] = min_ends
+        self._length = len(text_lower)
+
+    def has_term_in_span(self, group: str, lo: int, hi: int) -> bool:
+        """True if some term of the group occurs entirely inside [lo, hi)"""
+        starts = self._starts[group]
+        i = bisect_left(starts, lo)
+        return i < len(starts) and self._min_ends[group][i] <= hi
+
+    def has_term_near(self, group: str, position: int, window_size: int = 100) -> bool:
+        """
+        Same answer as checking every term of the group against
+        get_context_window(text, position, window_size).
+        """
+        lo = max(0, position - window_size)
+        hi = min(self._length, position + window_size)
+        return self.has_term_in_span(group, lo, hi)
+
+
+# Per-term issue cap used in all-occurrences mode (None or 0 means unlimited)
+DEFAULT_MAX_OCCURRENCES_PER_TERM = 50
+
+_TOKEN_RE = re.compile(r'\S+')
+_SENTENCE_BREAK_RE = re.compile(r'[.!?]+')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n[ \t\r\f\v]*\n\s*')
+
+
+def _span_arrays(text: str, breaks: "re.Pattern[str]") -> Tuple[array, array]:
+    """Start/end offsets of the non-empty pieces between matches of breaks"""
+    starts, ends = array('I'), array('I')
+    cursor = 0
+    for match in breaks.finditer(text):
+        if match.start() > cursor:
+            starts.append(cursor)
+            ends.append(match.start())
+        cursor = match.end()
+    if cursor < len(text):
+        starts.append(cursor)
+        ends.append(len(text))
+    return starts, ends
+
+
+class AnalyzedText:
+    """
+    Immutable view of one document, segmented once per request.
+
+    Token, sentence and paragraph boundaries are stored as offsets in
+    compact array('I') buffers rather than as substrings, and the lexicon
+    hits are computed up front, so every detector, the heatmap and the
+    intersectional stage share a single segmentation pass.
+
+    Tokens are whitespace-delimited (same as str.split()) and index into
+    text. Sentences (delimited by runs of . ! ?) and paragraphs (delimited by
+    blank lines) index into text_lower, like issue positions do; the two only
+    differ for the rare characters whose lowercase form is longer.
+
+    By default detectors report the first hit of each term. With
+    all_occurrences=True they report every hit, up to
+    max_occurrences_per_term per term.
+    """
+
+    __slots__ = (
+        "text", "text_lower", "matches",
+        "token_starts", "token_ends",
+        "sentence_starts", "sentence_ends",
+        "paragraph_starts", "paragraph_ends",
+        "all_occurrences", "max_occurrences_per_term", "_context",
+    )
+
+    def __init__(self, text: str, all_occurrences: bool = False,
+                 max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM):
+        set_field = object.__setattr__
+        text_lower = text.lower()
+        token_starts, token_ends = array('I'), array('I')
+        for match in _TOKEN_RE.finditer(text):
+            token_starts.append(match.start())
+            token_ends.append(match.end())
+        sentence_starts, sentence_ends = _span_arrays(text_lower, _SENTENCE_BREAK_RE)
+        paragraph_starts, paragraph_ends = _span_arrays(text_lower, _PARAGRAPH_BREAK_RE)
+
+        set_field(self, "text", text)
+        set_field(self, "text_lower", text_lower)
+        set_field(self, "matches", find_lexicon_matches(text_lower))
+        set_field(self, "token_starts", token_starts)
+        set_field(self, "token_ends", token_ends)
+        set_field(self, "sentence_starts", sentence_starts)
+        set_field(self, "sentence_ends", sentence_ends)
+        set_field(self, "paragraph_starts", paragraph_starts)
+        set_field(self, "paragraph_ends", paragraph_ends)
+        set_field(self, "all_occurrences", all_occurrences)
+        set_field(self, "max_occurrences_per_term", max_occurrences_per_term)
+        set_field(self, "_context", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("AnalyzedText is immutable")
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def tokens(self) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of every token"""
+        return zip(self.token_starts, self.token_ends)
+
+    def sentences(self) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of every sentence"""
+        return zip(self.sentence_starts, self.sentence_ends)
+
+    def paragraphs(self) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of every paragraph"""
+        return zip(self.paragraph_starts, self.paragraph_ends)
+
+    def occurrence_count(self, word: str) -> int:
+        """Total hits for a lexicon term, regardless of the per-term cap"""
+        return len(self.matches.get(word, ()))
+
+    def iter_occurrences(self, word: str, every: bool = False) -> Iterator[int]:
+        """
+        Stream the positions of a lexicon term in text order.
+
+        Yields only the first hit unless the document is in all-occurrences
+        mode or every=True. The per-term cap applies in all-occurrences mode.
+        """
+        positions = self.matches.get(word)
+        if not positions:
+            return iter(())
+        if not self.all_occurrences:
+            return iter(positions if every else positions[:1])
+        if self.max_occurrences_per_term:
+            return islice(positions, self.max_occurrences_per_term)
+        return iter(positions)
+
+    @property
+    def context(self) -> ContextIndex:
+        """Context-term index, built on first use by a context-aware rule"""
+        if self._context is None:
+            object.__setattr__(self, "_context", ContextIndex(self.text_lower))
+        return self._context
+
+    def has_context_near(self, group: str, position: int, window_size: int = 100) -> bool:
+        """True if a term of the context group lies within window_size chars of position"""
+        return self.context.has_term_near(group, position, window_size)
+
+    def has_context_within_tokens(self, group: str, position: int, token_count: int) -> bool:
+        """True if a term of the context group lies within token_count tokens of position"""
+        if not self.token_starts:
+            return False
+        index = max(0, bisect_right(self.token_starts, position) - 1)
+        lo = self.token_starts[max(0, index - token_count)]
+        hi = self.token_ends[min(len(self.token_ends) - 1, index + token_count)]
+        return self.context.has_term_in_span(group, lo, hi)
+
+
+def analyze_text(text: str, all_occurrences: bool = False,
+                 max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM) -> AnalyzedText:
+    """Segment a document once so every detection stage can share it"""
+    return AnalyzedText(text, all_occurrences, max_occurrences_per_term)
+
+
+def _ensure_analyzed(text: str, analyzed: Optional[AnalyzedText]) -> AnalyzedText:
+    """Use the caller's AnalyzedText, or build one for standalone detector calls"""
+    return analyzed if analyzed is not None else AnalyzedText(text)
+
+
+# EEO phrases match as plain substrings, like the original `phrase in text` check
+EEO_MATCHER = MultiPatternMatcher(EEO_WHITELIST_PHRASES, word_boundaries=False)
+
+# Changes whenever a lexicon, context list or EEO phrase changes, so cached
+# results never outlive the word lists that produced them
+LEXICON_FINGERPRINT = hashlib.sha256(json.dumps([
+    LEXICON_MATCHER.phrases, CONTEXT_TERM_GROUPS, CULTURAL_CONTEXT_SENSITIVE, EEO_WHITELIST_PHRASES
+], sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
 
 def is_eeo_paragraph(text: str) -> bool:
     """
     Check if text is part of an EEO statement.
     If yes, skip ALL bias checks for this paragraph.
     """
-    text_lower = text.lower()
-    for phrase in EEO_WHITELIST_PHRASES:
-        if phrase in text_lower:
-            return True
+    for _ in EEO_MATCHER.finditer(text.lower()):
+        return True
     return False
 
 
+def find_eeo_paragraphs(analyzed: AnalyzedText) -> List[Tuple[int, int]]:
+    """
+    Spans of the paragraphs that contain an EEO phrase.
+    One matcher pass over the whole document, then a merge against the
+    sorted paragraph spans.
+    """
+    eeo_spans = []
+    paragraphs = list(analyzed.paragraphs())
+    index = 0
+    for start, phrase in EEO_MATCHER.finditer(analyzed.text_lower):
+        end = start + len(phrase)
+        while index < len(paragraphs) and paragraphs[index][1] < end:
+            index += 1
+        if index == len(paragraphs):
+            break
+        paragraph = paragraphs[index]
+        if paragraph[0] <= start and (not eeo_spans or eeo_spans[-1] != paragraph):
+            eeo_spans.append(paragraph)
+    return eeo_spans
+
+
 def get_context_window(text: str, position: int, window_size: int = 100) -> str:
     """Get surrounding context around a position"""
     start = max(0, position - window_size)
@@ -212,60 +642,49 @@ def find_word_in_text(text_lower: str, word: str) -> int:
     return match.start() if match else -1
 
 
-def detect_gender_bias(text: str, text_lower: str) -> List[Dict[str, Any]]:
+def detect_gender_bias(text: str, text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """
     Detect gender bias with context awareness.
     Only flag personality-coded words when describing people, NOT compensation.
     """
+    analyzed = _ensure_analyzed(text, analyzed)
     issues = []
     
     for category, words in GENDER_BIAS_WORDS.items():
         for word in words:
-            pos = find_word_in_text(text_lower, word)
-            if pos == -1:
-                continue
-            
-            # Get context around the word
-            context = get_context_window(text, pos, 50)
-            
-            # Rule 1A: Gender-coded language context filtering
-            if category in ["male_stereotypes", "female_stereotypes"]:
-                # Check if used in compensation/technical context
-                skip_word = False
-                for whitelist_term in GENDER_CONTEXT_WHITELIST:
-                    if whitelist_term in context:
-                        skip_word = True
-                        break
+            for pos in analyzed.iter_occurrences(word):
+                # Rule 1A: Gender-coded language context filtering
+                if category in ["male_stereotypes", "female_stereotypes"]:
+                    # Check if used in compensation/technical context
+                    if analyzed.has_context_near("gender_whitelist", pos, 50):
+                        continue
                 
-                if skip_word:
-                    continue
-            
-            # Determine severity
-            if category == "gendered_titles":
-                severity = "high"
-                explanation = f"'{word}' is gendered language. Use gender-neutral alternatives instead."
-            else:
-                severity = "medium"
-                explanation = f"'{word}' may reinforce gender stereotypes when describing personality traits"
-            
-            issues.append({
-                "word": word,
-                "bias_type": "gender",
-                "severity": severity,
-                "explanation": explanation,
-                "position": pos
-            })
+                # Determine severity
+                if category == "gendered_titles":
+                    severity = "high"
+                    explanation = f"'{word}' is gendered language. Use gender-neutral alternatives instead."
+                else:
+                    severity = "medium"
+                    explanation = f"'{word}' may reinforce gender stereotypes when describing personality traits"
+                
+                issues.append({
+                    "word": word,
+                    "bias_type": "gender",
+                    "severity": severity,
+                    "explanation": explanation,
+                    "position": pos
+                })
     
     return issues
 
 
-def detect_race_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_race_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect racial bias in text"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, words in RACE_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "race",
@@ -276,61 +695,45 @@ def detect_race_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_age_bias(text: str, text_lower: str) -> List[Dict[str, Any]]:
+def detect_age_bias(text: str, text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """
     Detect age bias with context awareness.
     Only flag 'young' when used in hiring/personality contexts.
     """
+    analyzed = _ensure_analyzed(text, analyzed)
     issues = []
     
     for category, words in AGE_BIAS_WORDS.items():
         for word in words:
-            pos = find_word_in_text(text_lower, word)
-            if pos == -1:
-                continue
-            
-            # Context-aware detection for "young"
-            if category == "youth_context_sensitive" and word == "young":
-                context = get_context_window(text, pos, 50)
-                
-                # Skip if in neutral context
-                skip_word = False
-                for neutral_term in AGE_CONTEXT_NEUTRAL:
-                    if neutral_term in context:
-                        skip_word = True
-                        break
-                
-                if skip_word:
-                    continue
+            for pos in analyzed.iter_occurrences(word):
+                # Context-aware detection for "young"
+                if category == "youth_context_sensitive" and word == "young":
+                    # Skip if in neutral context
+                    if analyzed.has_context_near("age_neutral", pos, 50):
+                        continue
+                    
+                    # Only flag if in hiring/personality context
+                    if not analyzed.has_context_near("age_hiring", pos, 50):
+                        continue
                 
-                # Only flag if in hiring/personality context
-                in_hiring_context = False
-                for hiring_term in AGE_CONTEXT_HIRING:
-                    if hiring_term in context:
-                        in_hiring_context = True
-                        break
-                
-                if not in_hiring_context:
-                    continue
-            
-            issues.append({
-                "word": word,
-                "bias_type": "age",
-                "severity": "medium",
-                "explanation": f"'{word}' may reflect age-based assumptions in hiring contexts",
-                "position": pos
-            })
+                issues.append({
+                    "word": word,
+                    "bias_type": "age",
+                    "severity": "medium",
+                    "explanation": f"'{word}' may reflect age-based assumptions in hiring contexts",
+                    "position": pos
+                })
     
     return issues
 
 
-def detect_disability_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_disability_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect disability bias (ableism) in text"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, words in DISABILITY_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "disability",
@@ -341,23 +744,20 @@ def detect_disability_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_cultural_bias(text: str, text_lower: str) -> List[Dict[str, Any]]:
+def detect_cultural_bias(text: str, text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """
     Detect cultural bias with context awareness.
     Rule 1B: Only flag 'developing' when referring to countries/regions.
     """
+    analyzed = _ensure_analyzed(text, analyzed)
     issues = []
     
     # Context-sensitive words
-    context_sensitive = {
-        "developing": ["countries", "nations", "regions", "world", "markets"],
-        "underdeveloped": ["countries", "regions", "nations"]
-    }
-    
-    for word, next_words in context_sensitive.items():
-        pattern = r'\b' + re.escape(word) + r'\s+(\w+)'
-        matches = re.finditer(pattern, text_lower)
-        for match in matches:
+    for word, next_words in CULTURAL_CONTEXT_SENSITIVE.items():
+        for pos in analyzed.iter_occurrences(word, every=True):
+            match = _NEXT_WORD_RE.match(text_lower, pos + len(word))
+            if not match:
+                continue
             next_word = match.group(1)
             if next_word in next_words:
                 issues.append({
@@ -365,14 +765,13 @@ def detect_cultural_bias(text: str, text_lower: str) -> List[Dict[str, Any]]:
                     "bias_type": "culture",
                     "severity": "medium",
                     "explanation": f"'{word} {next_word}' may reflect cultural bias",
-                    "position": match.start()
+                    "position": pos
                 })
     
     # Non-context-sensitive words
     for category, words in CULTURAL_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "culture",
@@ -384,13 +783,13 @@ def detect_cultural_bias(text: str, text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_political_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_political_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect political/ideological bias in text"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, words in POLITICAL_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "political",
@@ -401,13 +800,13 @@ def detect_political_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_religion_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_religion_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect religious bias in text"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, words in RELIGION_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "religion",
@@ -418,13 +817,13 @@ def detect_religion_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_lgbtq_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_lgbtq_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect LGBTQ+ bias in text"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, words in LGBTQ_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "lgbtq",
@@ -435,13 +834,13 @@ def detect_lgbtq_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_socioeconomic_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_socioeconomic_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect socioeconomic/class bias in text"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, words in SOCIOECONOMIC_BIAS_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
+            for pos in analyzed.iter_occurrences(word):
                 issues.append({
                     "word": word,
                     "bias_type": "socioeconomic",
@@ -452,13 +851,13 @@ def detect_socioeconomic_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_truth_seeking_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_truth_seeking_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect deviations from factual accuracy"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, phrases in TRUTH_SEEKING_WORDS.items():
         for phrase in phrases:
-            if find_word_in_text(text_lower, phrase) != -1:
-                pos = find_word_in_text(text_lower, phrase)
+            for pos in analyzed.iter_occurrences(phrase):
                 issues.append({
                     "word": phrase,
                     "bias_type": "truth_seeking",
@@ -469,13 +868,13 @@ def detect_truth_seeking_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_ideological_neutrality_bias(text_lower: str) -> List[Dict[str, Any]]:
+def detect_ideological_neutrality_bias(text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """Detect partisan slants and non-neutral framing"""
+    analyzed = _ensure_analyzed(text_lower, analyzed)
     issues = []
     for category, phrases in IDEOLOGICAL_NEUTRALITY_WORDS.items():
         for phrase in phrases:
-            if find_word_in_text(text_lower, phrase) != -1:
-                pos = find_word_in_text(text_lower, phrase)
+            for pos in analyzed.iter_occurrences(phrase):
                 issues.append({
                     "word": phrase,
                     "bias_type": "ideological_neutrality",
@@ -486,19 +885,18 @@ def detect_ideological_neutrality_bias(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def detect_language_tone_bias(text: str, text_lower: str) -> List[Dict[str, Any]]:
+def detect_language_tone_bias(text: str, text_lower: str, analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """
     Detect profanity, slurs, hate speech.
     Rule 1C: Do NOT flag 'sex' or 'sexual' (removed from profanity list).
     """
+    analyzed = _ensure_analyzed(text, analyzed)
     issues = []
     detected_positions = set()
     
     for category, words in LANGUAGE_TONE_WORDS.items():
         for word in words:
-            if find_word_in_text(text_lower, word) != -1:
-                pos = find_word_in_text(text_lower, word)
-                
+            for pos in analyzed.iter_occurrences(word):
                 if pos in detected_positions:
                     continue
                 
@@ -527,25 +925,35 @@ def detect_language_tone_bias(text: str, text_lower: str) -> List[Dict[str, Any]
     return issues
 
 
-def detect_intersectional_bias(text: str, all_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def detect_intersectional_bias(text: str, all_issues: List[Dict[str, Any]],
+                               analyzed: Optional[AnalyzedText] = None) -> List[Dict[str, Any]]:
     """
     Rule 1E: Only trigger intersectional bias when 2+ confirmed biases exist
     in the same subject/sentence.
+    
+    Issues are attributed to sentences by position: both are sorted and
+    merged in one pass, and every sentence with two or more bias types is
+    reported with its span.
     """
     if len(all_issues) < 2:
         return []
     
-    sentences = re.split(r'[.!?]+', text)
+    analyzed = _ensure_analyzed(text, analyzed)
+    located = sorted(
+        (issue["position"], issue["bias_type"]) for issue in all_issues
+        if issue["bias_type"] != "intersectional" and isinstance(issue.get("position"), int)
+        and issue["position"] >= 0
+    )
     intersectional_issues = []
+    index = 0
     
-    for sentence in sentences:
-        sentence_lower = sentence.lower()
+    for sentence_start, sentence_end in analyzed.sentences():
+        while index < len(located) and located[index][0] < sentence_start:
+            index += 1
         sentence_biases = set()
-        
-        for issue in all_issues:
-            word = issue.get("word", "").lower()
-            if word in sentence_lower and issue["bias_type"] != "intersectional":
-                sentence_biases.add(issue["bias_type"])
+        while index < len(located) and located[index][0] < sentence_end:
+            sentence_biases.add(located[index][1])
+            index += 1
         
         if len(sentence_biases) >= 2:
             combined_types = " + ".join(sorted(sentence_biases))
@@ -554,8 +962,11 @@ def detect_intersectional_bias(text: str, all_issues: List[Dict[str, Any]]) -> L
                 "bias_type": "intersectional",
                 "severity": "high",
                 "explanation": f"Intersectional bias: {combined_types}. Multiple bias types compound discrimination.",
-                "position": 0
+                "position": sentence_start,
+                "sentence_span": [sentence_start, sentence_end]
             })
+        
+        if index == len(located):
             break
     
     return intersectional_issues
@@ -583,59 +994,163 @@ def get_severity_label(score: int) -> str:
         return "high"
 
 
-def create_heatmap(text: str, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Create word-by-word heatmap of bias"""
-    words = text.split()
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3}
+SEVERITY_LEVELS = ["none", "low", "medium", "high"]
+_COMPACT_CORE_KEYS = ("word", "position", "bias_type", "severity", "explanation")
+
+
+def _iter_token_issues(analyzed: AnalyzedText, issues: List[Dict[str, Any]]):
+    """
+    Yield (token_index, word_start, word_end, matching_issues) for every token.
+    
+    Issues are sorted once and swept together with the token offsets, so
+    each issue is visited a single time.
+    """
+    ordered = sorted(
+        (issue for issue in issues if isinstance(issue.get("position"), int)),
+        key=lambda issue: issue["position"]
+    )
+    cursor = 0
+    
+    for index, (word_start, word_end) in enumerate(analyzed.tokens()):
+        while cursor < len(ordered) and ordered[cursor]["position"] < word_start:
+            cursor += 1
+        first = cursor
+        while cursor < len(ordered) and ordered[cursor]["position"] < word_end:
+            cursor += 1
+        yield index, word_start, word_end, ordered[first:cursor]
+
+
+def _max_severity(issues: List[Dict[str, Any]]) -> str:
+    return max((issue["severity"] for issue in issues), key=lambda s: SEVERITY_RANK.get(s, 0))
+
+
+def create_heatmap(text: str, issues: List[Dict[str, Any]],
+                   analyzed: Optional[AnalyzedText] = None,
+                   flagged_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    Create word-by-word heatmap of bias.
+    
+    With flagged_only=True only biased tokens are emitted, each tagged with
+    its token index; the total token count is len(analyzed.token_starts).
+    """
+    analyzed = _ensure_analyzed(text, analyzed)
     heatmap = []
-    current_pos = 0
     
-    for word in words:
-        word_start = text.find(word, current_pos)
-        word_end = word_start + len(word)
-        
-        matching_issues = [
-            issue for issue in issues
-            if issue["position"] >= word_start and issue["position"] < word_end
-        ]
-        
+    for index, word_start, word_end, matching_issues in _iter_token_issues(analyzed, issues):
         if matching_issues:
-            max_severity = max(
-                (issue["severity"] for issue in matching_issues),
-                key=lambda s: {"low": 1, "medium": 2, "high": 3}[s]
-            )
-            bias_types = list(set(issue["bias_type"] for issue in matching_issues))
-            
-            heatmap.append({
-                "word": word,
+            entry = {
+                "word": text[word_start:word_end],
                 "biased": True,
-                "severity": max_severity,
-                "bias_types": bias_types
-            })
-        else:
+                "severity": _max_severity(matching_issues),
+                "bias_types": list(dict.fromkeys(issue["bias_type"] for issue in matching_issues))
+            }
+            if flagged_only:
+                entry["index"] = index
+            heatmap.append(entry)
+        elif not flagged_only:
             heatmap.append({
-                "word": word,
+                "word": text[word_start:word_end],
                 "biased": False,
                 "severity": "none",
                 "bias_types": []
             })
-        
-        current_pos = word_end
     
     return heatmap
 
 
+def create_heatmap_ranges(text: str, issues: List[Dict[str, Any]],
+                          analyzed: Optional[AnalyzedText] = None) -> Dict[str, List[int]]:
+    """
+    Run-length encoded heatmap for the v2 response format.
+    
+    Consecutive tokens with the same severity collapse into one range given
+    as parallel offset/length/severity arrays; severity is an index into
+    SEVERITY_LEVELS. Ranges cover the text from the first to the last token.
+    """
+    analyzed = _ensure_analyzed(text, analyzed)
+    offsets: List[int] = []
+    lengths: List[int] = []
+    severities: List[int] = []
+    
+    for _, word_start, word_end, matching_issues in _iter_token_issues(analyzed, issues):
+        level = SEVERITY_LEVELS.index(_max_severity(matching_issues)) if matching_issues else 0
+        if severities and severities[-1] == level:
+            lengths[-1] = word_end - offsets[-1]
+        else:
+            offsets.append(word_start)
+            lengths.append(word_end - word_start)
+            severities.append(level)
+    
+    return {"offset": offsets, "length": lengths, "severity": severities}
+
+
+def _explanation_template(issue: Dict[str, Any]) -> str:
+    """Replace the quoted term in an explanation with a {word} placeholder."""
+    explanation = issue.get("explanation", "")
+    quoted = f"'{issue.get('word', '')}'"
+    if quoted != "''" and quoted in explanation:
+        return explanation.replace(quoted, "'{word}'")
+    return explanation
+
+
+def compact_issues(issues: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Any]], Dict[str, List[str]]]:
+    """
+    Pack issues into parallel arrays for the v2 response format.
+    
+    bias_type, severity and explanation columns hold indices into the
+    returned lookup tables. Explanations are interned as templates; clients
+    rebuild the text by substituting the issue's word for {word}. Optional
+    keys (occurrences, sentence_span, ...) become columns padded with None.
+    Returns (columns, tables).
+    """
+    bias_types: Dict[str, int] = {}
+    templates: Dict[str, int] = {}
+    columns: Dict[str, List[Any]] = {
+        "word": [], "position": [], "bias_type": [], "severity": [], "explanation": []
+    }
+    
+    for row, issue in enumerate(issues):
+        columns["word"].append(issue.get("word", ""))
+        columns["position"].append(issue.get("position"))
+        columns["bias_type"].append(bias_types.setdefault(issue.get("bias_type", ""), len(bias_types)))
+        severity = issue.get("severity", "medium")
+        columns["severity"].append(SEVERITY_LEVELS.index(severity) if severity in SEVERITY_LEVELS else 2)
+        columns["explanation"].append(templates.setdefault(_explanation_template(issue), len(templates)))
+        
+        for key, value in issue.items():
+            if key not in _COMPACT_CORE_KEYS:
+                columns.setdefault(key, [None] * row).append(value)
+        for column in columns.values():
+            if len(column) == row:
+                column.append(None)
+    
+    tables = {
+        "bias_type": list(bias_types),
+        "severity": list(SEVERITY_LEVELS),
+        "explanation": list(templates)
+    }
+    return columns, tables
+
+
+# Group nouns that 'All [GROUP] are ...' generalizations are built on
+STEREOTYPE_GROUPS = [
+    r'(muslims?|christians?|jews?|hindus?|buddhists?|atheists?)',
+    r'(asians?|blacks?|whites?|latinos?|hispanics?|arabs?)',
+    r'(men|women|males?|females?)',
+    r'(gay|lesbian|transgender|lgbtq)',
+    r'(poor|rich|wealthy) (people|person)',
+    r'(young|old|elderly) (people|person)',
+]
+
+GROUP_NOUN_RE = re.compile(r'\b(?:' + '|'.join(STEREOTYPE_GROUPS) + r')\b')
+
+
 def detect_stereotype_patterns(text_lower: str) -> List[Dict[str, Any]]:
     """Detect bias patterns like 'All [GROUP] are [NEGATIVE]'"""
     issues = []
     
-    group_patterns = [
-        r'\ball (muslims?|christians?|jews?|hindus?|buddhists?|atheists?)',
-        r'\ball (asians?|blacks?|whites?|latinos?|hispanics?|arabs?)',
-        r'\ball (men|women|males?|females?)',
-        r'\ball (gay|lesbian|transgender|lgbtq)',
-        r'\ball (poor|rich|wealthy) (people|person)',
-        r'\ball (young|old|elderly) (people|person)',
-    ]
+    group_patterns = [r'\ball ' + group for group in STEREOTYPE_GROUPS]
     
     for pattern in group_patterns:
         matches = re.finditer(pattern, text_lower)
@@ -653,30 +1168,8 @@ def detect_stereotype_patterns(text_lower: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def validate_with_openai(text: str, enable_ai: bool = False) -> List[Dict[str, Any]]:
-    """
-    Use OpenAI to validate complex biases.
-    Only runs if enable_ai flag is True (cost control).
-    """
-    if not enable_ai:
-        return []
-    
-    try:
-        import os
-        from openai import OpenAI
-        
-        AI_INTEGRATIONS_OPENAI_API_KEY = os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
-        AI_INTEGRATIONS_OPENAI_BASE_URL = os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL")
-        
-        if not AI_INTEGRATIONS_OPENAI_API_KEY or not AI_INTEGRATIONS_OPENAI_BASE_URL:
-            return []
-        
-        client = OpenAI(
-            api_key=AI_INTEGRATIONS_OPENAI_API_KEY,
-            base_url=AI_INTEGRATIONS_OPENAI_BASE_URL
-        )
-        
-        prompt = f"""Analyze the following text for bias across these dimensions:
+# Prompt for validate_with_openai; {text} is the document, literal braces are doubled
+VALIDATION_PROMPT_TEMPLATE = """Analyze the following text for bias across these dimensions:
 1. Gender bias
 2. Racial/ethnic bias
 3. Age bias
@@ -706,44 +1199,512 @@ Return ONLY biased phrases/words found. For each bias found, respond in JSON for
 }}
 
 If no bias detected, return {{"biases": []}}"""
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            max_completion_tokens=1000,
-            temperature=0.3
-        )
-        
-        import json
-        result = json.loads(response.choices[0].message.content or "{}")
-        biases = result.get("biases", [])
-        
-        for bias in biases:
-            word = bias.get("word", "")
-            bias["position"] = text.lower().find(word.lower()) if word else 0
-        
-        return biases
-        
-    except Exception as e:
-        print(f"OpenAI validation error: {str(e)}")
+
+OPENAI_VALIDATION_MODEL = "gpt-4o-mini"
+# Bumps automatically whenever the prompt wording changes
+VALIDATION_PROMPT_VERSION = hashlib.sha256(VALIDATION_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+_LLM_CACHE = None
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache():
+    """The on-disk validation cache, opened on first use by whichever thread gets there first"""
+    global _LLM_CACHE
+    if _LLM_CACHE is None:
+        try:
+            from _llm_cache import default_llm_cache
+        except ImportError:
+            from api.biasradar._llm_cache import default_llm_cache
+        with _LLM_CACHE_LOCK:
+            if _LLM_CACHE is None:
+                _LLM_CACHE = default_llm_cache()
+    return _LLM_CACHE
+
+
+# Long texts are validated in sentence-aligned chunks, several at a time
+AI_CHUNK_CHARS = int(os.environ.get("BIASRADAR_AI_CHUNK_CHARS", 4000))
+AI_MAX_PARALLEL = int(os.environ.get("BIASRADAR_AI_MAX_PARALLEL", 4))
+
+
+def _ai_chunks(text: str, chunk_chars: int = AI_CHUNK_CHARS) -> List[Tuple[int, int]]:
+    """
+    (start, end) spans tiling text, each at most chunk_chars long and cut at
+    the latest paragraph break, else sentence end, else whitespace in its
+    second half. Whitespace-only spans are dropped.
+    """
+    spans = []
+    start = 0
+    while start < len(text):
+        end = len(text)
+        if end - start > chunk_chars:
+            end = _window_cut(text, start + chunk_chars // 2, start + chunk_chars)
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = end
+    return spans
+
+
+def _phrase_pattern(phrase: str) -> Optional["re.Pattern"]:
+    words = phrase.lower().split()
+    if not words:
+        return None
+    # Tolerate the model collapsing line breaks or repeated spaces inside a phrase
+    return re.compile(r'\s+'.join(re.escape(word) for word in words))
+
+
+def _locate_llm_biases(chunk_lower: str, base: int, biases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Copy one chunk's LLM findings with document offsets. A phrase reported n
+    times maps to its first n occurrences in the chunk; a phrase that does not
+    occur in the chunk is dropped, since any position given to it would
+    highlight unrelated text and anchor intersectional checks on it.
+    """
+    located = []
+    cursors: Dict[str, int] = {}
+    for bias in biases:
+        bias = dict(bias)
+        word = str(bias.get("word", ""))
+        pattern = _phrase_pattern(word)
+        match = pattern.search(chunk_lower, cursors.get(word.lower(), 0)) if pattern else None
+        if match is None and pattern is not None:
+            match = pattern.search(chunk_lower)
+        if match is None:
+            continue
+        cursors[word.lower()] = match.end()
+        bias["position"] = base + match.start()
+        located.append(bias)
+    return located
+
+
+def _validate_chunk(transport: Any, chunk: str) -> List[Dict[str, Any]]:
+    """Raw LLM findings for one chunk, from the cache or a single completion"""
+    cache_key = "|".join((
+        hashlib.sha256(chunk.encode("utf-8", "surrogatepass")).hexdigest(),
+        OPENAI_VALIDATION_MODEL,
+        VALIDATION_PROMPT_VERSION
+    ))
+    cached = get_llm_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    if transport is None:
+        return []
+    
+    prompt = VALIDATION_PROMPT_TEMPLATE.format(text=chunk)
+    
+    content = transport.chat(
+        [{"role": "user", "content": prompt}],
+        model=OPENAI_VALIDATION_MODEL,
+        response_format={"type": "json_object"},
+        max_completion_tokens=1000,
+        temperature=0.3
+    )
+    
+    result = json.loads(content or "{}")
+    biases = [bias for bias in result.get("biases", []) if isinstance(bias, dict)]
+    get_llm_cache().put(cache_key, biases)
+    return biases
+
+
+# Excerpts packed into one prompt are separated by a blank line
+_EXCERPT_SEPARATOR = "\n\n"
+
+
+def _pack_excerpts(spans: List[Tuple[int, int]], chunk_chars: int = AI_CHUNK_CHARS) -> List[List[Tuple[int, int]]]:
+    """Group sorted (start, end) excerpts, in order, into prompts of at most chunk_chars"""
+    groups: List[List[Tuple[int, int]]] = []
+    size = 0
+    for start, end in spans:
+        length = end - start
+        if groups and size + len(_EXCERPT_SEPARATOR) + length <= chunk_chars:
+            groups[-1].append((start, end))
+            size += len(_EXCERPT_SEPARATOR) + length
+        else:
+            groups.append([(start, end)])
+            size = length
+    return groups
+
+
+class AIValidationError(RuntimeError):
+    """Some chunks of an AI validation failed; raised with raise_on_error=True"""
+
+
+def validate_with_openai(text: str, enable_ai: bool = False,
+                         spans: Optional[List[Tuple[int, int]]] = None,
+                         raise_on_error: bool = False) -> List[Dict[str, Any]]:
+    """
+    Use OpenAI to validate complex biases.
+    Only runs if enable_ai flag is True (cost control).
+    
+    The text is split into sentence-aligned chunks of up to AI_CHUNK_CHARS,
+    validated up to AI_MAX_PARALLEL at a time, and each finding's position
+    is the exact document offset of the phrase within its chunk. Findings
+    are cached on disk per chunk by text hash, model and prompt version, so
+    rescanning an edited document only pays for the chunks that changed.
+    A chunk whose call fails is logged and contributes no findings; with
+    raise_on_error, AIValidationError is raised instead once every chunk
+    has finished (the ones that succeeded are still cached).
+    
+    With spans (sorted, disjoint (start, end) excerpts, see select_ai_spans)
+    only those excerpts are sent, packed several to a prompt.
+    """
+    if not enable_ai:
         return []
+    
+    try:
+        from _llm_transport import get_llm_transport
+    except ImportError:
+        from api.biasradar._llm_transport import get_llm_transport
+    transport = get_llm_transport()
+    
+    if spans is None:
+        groups = [[span] for span in _ai_chunks(text)]
+    else:
+        groups = _pack_excerpts(spans)
+    
+    def validate_group(group: List[Tuple[int, int]]) -> Optional[List[Dict[str, Any]]]:
+        """Document-positioned findings for one prompt, or None if the call failed"""
+        chunk = _EXCERPT_SEPARATOR.join(text[start:end] for start, end in group)
+        try:
+            located = _locate_llm_biases(chunk.lower(), 0, _validate_chunk(transport, chunk))
+        except Exception:
+            logger.warning("AI validation failed for a %d-char chunk", len(chunk), exc_info=True)
+            return None
+        # Map prompt offsets back to the document, excerpt by excerpt
+        chunk_starts = []
+        cursor = 0
+        for start, end in group:
+            chunk_starts.append(cursor)
+            cursor += end - start + len(_EXCERPT_SEPARATOR)
+        for bias in located:
+            index = max(0, bisect_right(chunk_starts, bias["position"]) - 1)
+            start, end = group[index]
+            bias["position"] = min(start + bias["position"] - chunk_starts[index], max(start, end - 1))
+        return located
+    
+    if len(groups) <= 1 or AI_MAX_PARALLEL <= 1:
+        per_chunk = [validate_group(group) for group in groups]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(AI_MAX_PARALLEL, len(groups))) as pool:
+            per_chunk = list(pool.map(validate_group, groups))
+    
+    failed = sum(1 for biases in per_chunk if biases is None)
+    if failed and raise_on_error:
+        raise AIValidationError(f"{failed} of {len(groups)} AI validation chunks failed")
+    return [bias for biases in per_chunk if biases is not None for bias in biases]
+
+
+# Selective escalation: with enable_ai, only sentences the rules are unsure
+# about go to the LLM, up to a per-request budget of prompt tokens
+AI_TOKEN_BUDGET = int(os.environ.get("BIASRADAR_AI_TOKEN_BUDGET", 1500))
+_CHARS_PER_TOKEN = 4
+
+# Signal weights: a hit the context rules let go outranks a group noun,
+# which outranks a trigger word
+_ESCALATE_WHITELISTED = 3
+_ESCALATE_GROUP_NOUN = 2
+_ESCALATE_TRIGGER = 1
+
+
+def _context_suppressed_hits(analyzed: AnalyzedText) -> Iterator[int]:
+    """Positions of context-sensitive terms that a context rule chose not to flag"""
+    for category in ("male_stereotypes", "female_stereotypes"):
+        for word in GENDER_BIAS_WORDS[category]:
+            for pos in analyzed.iter_occurrences(word, every=True):
+                if analyzed.has_context_near("gender_whitelist", pos, 50):
+                    yield pos
+    for pos in analyzed.iter_occurrences("young", every=True):
+        if analyzed.has_context_near("age_neutral", pos, 50) or \
+                not analyzed.has_context_near("age_hiring", pos, 50):
+            yield pos
+    for word, next_words in CULTURAL_CONTEXT_SENSITIVE.items():
+        for pos in analyzed.iter_occurrences(word, every=True):
+            match = _NEXT_WORD_RE.match(analyzed.text_lower, pos + len(word))
+            if not match or match.group(1) not in next_words:
+                yield pos
+
+
+def _escalation_unit(analyzed: AnalyzedText, position: int) -> Tuple[int, int]:
+    """
+    The sentence around position, trimmed of surrounding whitespace and
+    including its closing punctuation. A sentence longer than AI_CHUNK_CHARS
+    is narrowed to the chunk of it that contains position.
+    """
+    text_lower = analyzed.text_lower
+    index = bisect_right(analyzed.sentence_starts, position) - 1
+    if index < 0:
+        return position, position
+    start, end = analyzed.sentence_starts[index], analyzed.sentence_ends[index]
+    if end - start > AI_CHUNK_CHARS:
+        for chunk_start, chunk_end in _ai_chunks(text_lower[start:end]):
+            if start + chunk_start <= position < start + chunk_end:
+                start, end = start + chunk_start, start + chunk_end
+                break
+    while start < end and text_lower[start].isspace():
+        start += 1
+    while end < len(text_lower) and text_lower[end] in ".!?" and end - start < AI_CHUNK_CHARS:
+        end += 1
+    return start, end
+
+
+def select_ai_spans(analyzed: AnalyzedText, excluded: List[Tuple[int, int]],
+                    token_budget: int = AI_TOKEN_BUDGET) -> List[Tuple[int, int]]:
+    """
+    Sentences worth an LLM second opinion, as sorted (start, end) spans.
+    
+    A sentence is a candidate if it contains a context-sensitive term a
+    context rule let go, a group noun from STEREOTYPE_GROUPS, or a
+    SUBTLE_BIAS_TRIGGERS word. Candidates are ranked by their summed signal
+    weights and taken greedily while their text fits in token_budget
+    (estimated at _CHARS_PER_TOKEN characters per token). Sentences in
+    excluded spans (EEO paragraphs) are never sent.
+    """
+    if token_budget <= 0:
+        return []
+    text_lower = analyzed.text_lower
+    signals = [(pos, _ESCALATE_WHITELISTED) for pos in _context_suppressed_hits(analyzed)]
+    signals.extend((match.start(), _ESCALATE_GROUP_NOUN) for match in GROUP_NOUN_RE.finditer(text_lower))
+    for word in SUBTLE_BIAS_TRIGGERS:
+        signals.extend((pos, _ESCALATE_TRIGGER) for pos in analyzed.matches.get(word, ()))
+    
+    scores: Dict[Tuple[int, int], int] = {}
+    for position, weight in signals:
+        if _in_spans(position, excluded):
+            continue
+        span = _escalation_unit(analyzed, position)
+        if span[0] < span[1]:
+            scores[span] = scores.get(span, 0) + weight
+    
+    chars_left = token_budget * _CHARS_PER_TOKEN
+    chosen = []
+    for span in sorted(scores, key=lambda span: (-scores[span], span[0])):
+        length = span[1] - span[0]
+        if length <= chars_left:
+            chosen.append(span)
+            chars_left -= length
+    return sorted(chosen)
+
+
+# AI validation runs on a background pool while the rules scan; a scan waits
+# for it at most this long before answering with the rule-based result
+AI_LATENCY_BUDGET_SECONDS = float(os.environ.get("BIASRADAR_AI_LATENCY_BUDGET_SECONDS", 10))
+AI_BACKGROUND_WORKERS = int(os.environ.get("BIASRADAR_AI_BACKGROUND_WORKERS", 4))
+_AI_EXECUTOR = None
+
+
+def get_ai_executor():
+    """Thread pool for in-flight AI validations, created on first use"""
+    global _AI_EXECUTOR
+    if _AI_EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _AI_EXECUTOR = ThreadPoolExecutor(max_workers=AI_BACKGROUND_WORKERS,
+                                          thread_name_prefix="biasradar-ai")
+    return _AI_EXECUTOR
+
+
+def _await_ai_issues(future: Any, deadline: float) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    AI findings and status once the rules are done. Waits until deadline
+    (a time.perf_counter() value). Past it, a validation that is still
+    running keeps going and fills the LLM cache ("ai_pending": repeating
+    the scan picks its findings up); one that never left the queue is
+    cancelled ("ai_timeout"). A validation that failed gives "ai_error"
+    and no findings.
+    """
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    try:
+        return future.result(timeout=max(0.0, deadline - time.perf_counter())), "complete"
+    except FutureTimeoutError:
+        return [], "ai_timeout" if future.cancel() else "ai_pending"
+    except Exception as e:
+        # Chunk failures were logged with their tracebacks where they happened
+        logger.warning("AI validation failed, returning rule-based findings only: %s", e)
+        return [], "ai_error"
+
+
+def _merge_ai_issues(all_issues: List[Dict[str, Any]], ai_issues: List[Dict[str, Any]],
+                     eeo_paragraphs: List[Tuple[int, int]], all_occurrences: bool) -> None:
+    """
+    Append AI findings that add something to the rule-based issues: drop any
+    that overlap a rule-based match or another accepted AI finding, fall in
+    an EEO paragraph, or (in first-occurrence mode) repeat a reported word.
+    """
+    taken = sorted(
+        (issue.get("position", 0), issue.get("position", 0) + max(1, len(issue.get("word", ""))))
+        for issue in all_issues
+    )
+    starts = [span[0] for span in taken]
+    existing_words = set(issue.get("word", "").lower() for issue in all_issues)
+    for ai_issue in sorted(ai_issues, key=lambda issue: issue["position"]):
+        word = str(ai_issue.get("word", ""))
+        start = ai_issue["position"]
+        end = start + max(1, len(word))
+        if _in_spans(start, eeo_paragraphs):
+            continue
+        if not all_occurrences and word.lower() in existing_words:
+            continue
+        index = bisect_left(starts, end)
+        if any(taken_start < end and start < taken_end for taken_start, taken_end in taken[:index]):
+            continue
+        all_issues.append(ai_issue)
+        taken.insert(index, (start, end))
+        starts.insert(index, start)
+        existing_words.add(word.lower())
+
+
+def detect_rule_based_issues(analyzed: AnalyzedText) -> List[Dict[str, Any]]:
+    """Run every lexicon detector and the stereotype patterns over one unit of text"""
+    text = analyzed.text
+    text_lower = analyzed.text_lower
+    
+    # Step 1: Manual word list detection (context-aware)
+    issues = []
+    issues.extend(detect_gender_bias(text, text_lower, analyzed))
+    issues.extend(detect_race_bias(text_lower, analyzed))
+    issues.extend(detect_age_bias(text, text_lower, analyzed))
+    issues.extend(detect_disability_bias(text_lower, analyzed))
+    issues.extend(detect_cultural_bias(text, text_lower, analyzed))
+    issues.extend(detect_political_bias(text_lower, analyzed))
+    issues.extend(detect_religion_bias(text_lower, analyzed))
+    issues.extend(detect_lgbtq_bias(text_lower, analyzed))
+    issues.extend(detect_socioeconomic_bias(text_lower, analyzed))
+    issues.extend(detect_truth_seeking_bias(text_lower, analyzed))
+    issues.extend(detect_ideological_neutrality_bias(text_lower, analyzed))
+    issues.extend(detect_language_tone_bias(text, text_lower, analyzed))
+    
+    if analyzed.all_occurrences:
+        for issue in issues:
+            issue["occurrences"] = analyzed.occurrence_count(issue["word"])
+    
+    # Step 2: Pattern matching (stereotype detection)
+    issues.extend(detect_stereotype_patterns(text_lower))
+    return issues
+
+
+def _is_first_hit_issue(issue: Dict[str, Any]) -> bool:
+    """
+    True for lexicon issues that first-occurrence mode reports once per term.
+    Stereotype patterns, context-sensitive cultural terms and sentence-level
+    issues are reported at every occurrence in either mode.
+    """
+    if "sentence_span" in issue or issue["bias_type"] == "pattern_stereotype":
+        return False
+    return not (issue["bias_type"] == "culture" and issue["word"] in CULTURAL_CONTEXT_SENSITIVE)
+
+
+def _scan_segment(segment: str, offset: int, all_occurrences: bool,
+                  max_occurrences_per_term: Optional[int]) -> List[Dict[str, Any]]:
+    """Rule-based scan of one paragraph, with positions shifted to document offsets"""
+    issues = detect_rule_based_issues(AnalyzedText(segment, all_occurrences, max_occurrences_per_term))
+    for issue in issues:
+        issue["position"] += offset
+    return issues
 
 
-def hybrid_detect_bias(text: str, enable_ai: bool = False) -> Dict[str, Any]:
+def scan_segments(text_lower: str, segments: List[Tuple[int, int]], all_occurrences: bool = False,
+                  max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM,
+                  executor: Any = None) -> List[Dict[str, Any]]:
+    """
+    Scan each (start, end) segment independently and merge in document order.
+    Segments are self-contained, so an optional concurrent.futures executor
+    can scan them in parallel. First-occurrence mode keeps the first hit of
+    each lexicon term across all segments, as an unsplit scan would; in
+    all-occurrences mode counts are summed and the per-term cap is applied
+    across the whole document. Issues reported at every occurrence (see
+    _is_first_hit_issue) are kept as they are.
+    """
+    args = (
+        [text_lower[start:end] for start, end in segments],
+        [start for start, _ in segments],
+        [all_occurrences] * len(segments),
+        [max_occurrences_per_term] * len(segments)
+    )
+    results = executor.map(_scan_segment, *args) if executor is not None else map(_scan_segment, *args)
+    merged = []
+    totals: Dict[str, int] = {}
+    for issues in results:
+        counted = set()
+        for issue in issues:
+            word = issue["word"]
+            if "occurrences" in issue and word not in counted:
+                counted.add(word)
+                totals[word] = totals.get(word, 0) + issue["occurrences"]
+        merged.extend(issues)
+    
+    if not all_occurrences:
+        first_hits = []
+        seen = set()
+        for issue in merged:
+            if _is_first_hit_issue(issue):
+                key = (issue["bias_type"], issue["word"])
+                if key in seen:
+                    continue
+                seen.add(key)
+            first_hits.append(issue)
+        return first_hits
+    
+    capped = []
+    reported: Dict[Tuple[str, str], int] = {}
+    for issue in merged:
+        if "occurrences" in issue:
+            key = (issue["bias_type"], issue["word"])
+            reported[key] = reported.get(key, 0) + 1
+            if max_occurrences_per_term and reported[key] > max_occurrences_per_term:
+                continue
+            issue["occurrences"] = totals[issue["word"]]
+        capped.append(issue)
+    return capped
+
+
+def _complement_spans(spans: Iterable[Tuple[int, int]], excluded: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Spans that are not in the (sorted) excluded list"""
+    skip = set(excluded)
+    return [span for span in spans if span not in skip]
+
+
+def _in_spans(position: int, spans: List[Tuple[int, int]]) -> bool:
+    """True if position falls inside one of the sorted, disjoint spans"""
+    index = bisect_right(spans, (position, float("inf"))) - 1
+    return index >= 0 and spans[index][0] <= position < spans[index][1]
+
+
+def hybrid_detect_bias(text: str, enable_ai: bool = False, all_occurrences: bool = False,
+                       max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM,
+                       executor: Any = None, flagged_only_heatmap: bool = False,
+                       response_format: str = "v1", ai_token_budget: Optional[int] = None,
+                       ai_latency_budget: Optional[float] = None) -> Dict[str, Any]:
     """
     Enterprise-grade hybrid bias detection with EEO auto-whitelist.
     
     Args:
         text: Text to analyze
         enable_ai: Whether to use OpenAI for enhanced detection
+        all_occurrences: Report every occurrence of a flagged term, not just the first
+        max_occurrences_per_term: Cap on issues per term in all-occurrences mode (None = no cap)
+        executor: Optional concurrent.futures executor used to scan paragraphs in parallel
+        flagged_only_heatmap: Emit only biased tokens in the heatmap, plus a token_count
+        response_format: "v2" returns the heatmap as run-length encoded ranges
+            (see create_heatmap_ranges) plus a token_count; issues are unchanged
+        ai_token_budget: Prompt tokens of document text the AI step may spend
+            (None = AI_TOKEN_BUDGET); see select_ai_spans
+        ai_latency_budget: Seconds from the call until the scan answers without
+            AI findings (None = AI_LATENCY_BUDGET_SECONDS); the result's
+            ai_status then says "ai_pending" or "ai_timeout" instead of "complete".
+            A failed AI call gives "ai_error" and rule-based findings only
     
     Returns:
         Complete bias detection results
     """
-    # Rule 1D: EEO Auto-Whitelist - Skip ALL bias checks
-    if is_eeo_paragraph(text):
-        return {
+    started = time.perf_counter()
+    
+    # Segment once; every stage below shares the same offsets and lexicon hits
+    analyzed = analyze_text(text, all_occurrences, max_occurrences_per_term)
+    text_lower = analyzed.text_lower
+    
+    # Rule 1D: EEO Auto-Whitelist - Skip ALL bias checks in EEO paragraphs
+    eeo_paragraphs = find_eeo_paragraphs(analyzed)
+    if eeo_paragraphs and len(eeo_paragraphs) == len(analyzed.paragraph_starts):
+        result = {
             "score": 0,
             "severity": "none",
             "issues": [],
@@ -752,48 +1713,327 @@ def hybrid_detect_bias(text: str, enable_ai: bool = False) -> Dict[str, Any]:
             "detection_method": "eeo_whitelisted",
             "note": "EEO/legal paragraph detected - bias checks skipped"
         }
+        if response_format == "v2":
+            result["heatmap"] = create_heatmap_ranges(text, [], analyzed)
+            result["token_count"] = len(analyzed.token_starts)
+        return result
     
-    text_lower = text.lower()
-    
-    # Step 1: Manual word list detection (context-aware)
-    all_issues = []
-    all_issues.extend(detect_gender_bias(text, text_lower))
-    all_issues.extend(detect_race_bias(text_lower))
-    all_issues.extend(detect_age_bias(text, text_lower))
-    all_issues.extend(detect_disability_bias(text_lower))
-    all_issues.extend(detect_cultural_bias(text, text_lower))
-    all_issues.extend(detect_political_bias(text_lower))
-    all_issues.extend(detect_religion_bias(text_lower))
-    all_issues.extend(detect_lgbtq_bias(text_lower))
-    all_issues.extend(detect_socioeconomic_bias(text_lower))
-    all_issues.extend(detect_truth_seeking_bias(text_lower))
-    all_issues.extend(detect_ideological_neutrality_bias(text_lower))
-    all_issues.extend(detect_language_tone_bias(text, text_lower))
+    # Step 0: Start the optional AI validation first, limited to the
+    # sentences the escalation policy picks and to the request's token
+    # budget, so the LLM round trip overlaps the rule-based scan
+    ai_future = None
+    ai_spans: List[Tuple[int, int]] = []
+    if enable_ai:
+        ai_spans = select_ai_spans(analyzed, eeo_paragraphs,
+                                   AI_TOKEN_BUDGET if ai_token_budget is None else ai_token_budget)
+        if ai_spans:
+            ai_future = get_ai_executor().submit(validate_with_openai, text, True, ai_spans, True)
     
-    # Step 2: Pattern matching (stereotype detection)
-    all_issues.extend(detect_stereotype_patterns(text_lower))
+    # Steps 1-2: Rule-based detection. Without EEO paragraphs the whole
+    # document is one unit; otherwise each remaining paragraph is scanned
+    # independently and its issues shifted back to document offsets.
+    if eeo_paragraphs:
+        segments = _complement_spans(analyzed.paragraphs(), eeo_paragraphs)
+        all_issues = scan_segments(text_lower, segments, all_occurrences,
+                                   max_occurrences_per_term, executor)
+    else:
+        all_issues = detect_rule_based_issues(analyzed)
     
-    # Step 3: OpenAI validation (optional)
-    if enable_ai:
-        ai_issues = validate_with_openai(text, enable_ai=True)
-        existing_words = set(issue.get("word", "").lower() for issue in all_issues)
-        for ai_issue in ai_issues:
-            if ai_issue.get("word", "").lower() not in existing_words:
-                all_issues.append(ai_issue)
+    # Step 3: Merge the AI findings, if they arrive within the latency budget
+    ai_status = "complete"
+    if ai_future is not None:
+        if ai_latency_budget is None:
+            ai_latency_budget = AI_LATENCY_BUDGET_SECONDS
+        ai_issues, ai_status = _await_ai_issues(ai_future, started + ai_latency_budget)
+        _merge_ai_issues(all_issues, ai_issues, eeo_paragraphs, all_occurrences)
     
     # Step 4: Intersectional bias (only if 2+ biases in same sentence)
-    all_issues.extend(detect_intersectional_bias(text, all_issues))
+    all_issues.extend(detect_intersectional_bias(text, all_issues, analyzed))
     
     # Calculate metrics
     score = calculate_bias_score(all_issues)
     severity = get_severity_label(score)
-    heatmap = create_heatmap(text, all_issues)
+    if response_format == "v2":
+        heatmap = create_heatmap_ranges(text, all_issues, analyzed)
+    else:
+        heatmap = create_heatmap(text, all_issues, analyzed, flagged_only=flagged_only_heatmap)
     
-    return {
+    result = {
         "score": score,
         "severity": severity,
         "issues": all_issues,
         "issue_count": len(all_issues),
         "heatmap": heatmap,
-        "detection_method": "hybrid" if enable_ai else "manual_with_patterns"
+        "detection_method": "hybrid" if enable_ai and ai_status == "complete" else "manual_with_patterns"
+    }
+    if enable_ai:
+        result["ai_status"] = ai_status
+        result["ai_spans"] = [list(span) for span in ai_spans]
+    if flagged_only_heatmap or response_format == "v2":
+        result["token_count"] = len(analyzed.token_starts)
+    if eeo_paragraphs:
+        result["eeo_paragraphs_skipped"] = len(eeo_paragraphs)
+        result["note"] = f"{len(eeo_paragraphs)} EEO/legal paragraph(s) detected - bias checks skipped for those paragraphs"
+    return result
+
+
+def _summary_text(issue_count: int, bias_type_counts: Dict[str, int]) -> str:
+    if issue_count:
+        return f"Found {issue_count} potential bias issue(s): " + ", ".join(
+            f"{count} {bias_type}" for bias_type, count in bias_type_counts.items()
+        )
+    return "No significant biases detected. Great job!"
+
+
+def build_scan_response(result: Dict[str, Any], response_format: str = "v1",
+                        flagged_only_heatmap: bool = False) -> Dict[str, Any]:
+    """Shape a hybrid_detect_bias result into the /scan response body."""
+    bias_type_counts = {}
+    for issue in result["issues"]:
+        bias_type_counts[issue["bias_type"]] = bias_type_counts.get(issue["bias_type"], 0) + 1
+    summary = _summary_text(len(result["issues"]), bias_type_counts)
+    
+    if response_format == "v2":
+        issue_columns, tables = compact_issues(result["issues"])
+        response = {
+            "format": "v2",
+            "score": result["score"],
+            "severity": result["severity"],
+            "issues": issue_columns,
+            "heatmap": result["heatmap"],
+            "tables": tables,
+            "token_count": result["token_count"],
+            "summary": summary,
+            "detection_method": result["detection_method"]
+        }
+        if "ai_status" in result:
+            response["ai_status"] = result["ai_status"]
+        return response
+    
+    response = {
+        "score": result["score"],
+        "severity": result["severity"],
+        "issues": result["issues"],
+        "heatmap": result["heatmap"],
+        "summary": summary,
+        "detection_method": result["detection_method"]
+    }
+    if flagged_only_heatmap:
+        response["token_count"] = result["token_count"]
+    if "ai_status" in result:
+        response["ai_status"] = result["ai_status"]
+    return response
+
+
+# Streaming scans cut text of any length into overlapping windows. Each
+# window is scanned whole but only reports issues in the part it owns, and
+# the overlap on either side covers the longest lexicon or context phrase
+# plus the widest look-around a detector uses (the stereotype patterns read
+# 100 characters ahead; context checks reach 50).
+_DETECTOR_REACH = 100
+STREAM_WINDOW_OVERLAP = max(len(phrase) for phrase in LEXICON_MATCHER.phrases) + \
+    max(len(phrase) for phrase in CONTEXT_MATCHER.phrases) + _DETECTOR_REACH
+STREAM_WINDOW_SIZE = 20000
+
+
+def iter_text_windows(chunks: Iterable[str], window_size: int = STREAM_WINDOW_SIZE,
+                      overlap: int = STREAM_WINDOW_OVERLAP) -> Iterator[Tuple[int, str, int, int]]:
+    """Overlapping windows sized for these detectors; see _text_windows.iter_text_windows"""
+    return _iter_windows(chunks, window_size, overlap)
+
+
+def _scan_window(analyzed: AnalyzedText, eeo_paragraphs: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """
+    Every flagged occurrence in one window outside the given EEO paragraphs.
+    Paragraphs are always scanned independently (as hybrid_detect_bias does
+    once EEO boilerplate is present), so a window edge only matters to the
+    paragraph it cuts; iter_streaming_scan settles those across windows.
+    """
+    segments = _complement_spans(analyzed.paragraphs(), eeo_paragraphs)
+    issues = scan_segments(analyzed.text_lower, segments, True, None)
+    issues.extend(detect_intersectional_bias(analyzed.text, issues, analyzed))
+    return issues
+
+
+def _paragraph_at(analyzed: AnalyzedText, position: int) -> Optional[Tuple[int, int]]:
+    """The (start, end) span of the paragraph containing position, if any"""
+    index = bisect_right(analyzed.paragraph_starts, position) - 1
+    if index >= 0 and position < analyzed.paragraph_ends[index]:
+        return analyzed.paragraph_starts[index], analyzed.paragraph_ends[index]
+    return None
+
+
+def iter_streaming_scan(chunks: Iterable[str], all_occurrences: bool = False,
+                        max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM,
+                        window_size: int = STREAM_WINDOW_SIZE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Rule-based scan of text of any length, one window at a time.
+    
+    Yields ("issue", issue) as each window finishes, with positions as
+    document offsets, then a single ("summary", {...}). Lexicon terms are
+    reported at their first flagged occurrence, or at every one up to
+    max_occurrences_per_term in all-occurrences mode. Per-term totals are
+    only known at the end, so they go in the summary's "occurrences" map
+    rather than on each issue. No heatmap is built.
+    
+    A paragraph cut by a window edge is EEO boilerplate if an EEO phrase
+    appears anywhere in it, so whether a phrase has been seen is carried
+    from window to window, and issues in a paragraph that runs past the
+    owned range are held back until its end is in view.
+    """
+    limit = (max_occurrences_per_term or None) if all_occurrences else 1
+    reported: Dict[Tuple[str, str], int] = {}
+    totals: Dict[str, int] = {}
+    bias_type_counts: Dict[str, int] = {}
+    score = 0
+    issue_count = 0
+    windows = 0
+    eeo_skipped = 0
+    length = 0
+    # The paragraph across the last owned edge: is it EEO so far, and its held issues
+    open_eeo = False
+    pending: List[Dict[str, Any]] = []
+    
+    for base, window, own_start, own_end in iter_text_windows(chunks, window_size):
+        windows += 1
+        length = base + len(window)
+        analyzed = analyze_text(window, all_occurrences=True, max_occurrences_per_term=None)
+        eeo_paragraphs = find_eeo_paragraphs(analyzed)
+        
+        # The paragraph the previous window's owned range ended in
+        carried = _paragraph_at(analyzed, own_start - 1) if own_start else None
+        carried_open = bool(pending)
+        if carried is not None and open_eeo and carried not in eeo_paragraphs:
+            eeo_paragraphs = sorted(eeo_paragraphs + [carried])
+        eeo_skipped += sum(
+            1 for span in eeo_paragraphs
+            if span[0] < own_end and span[1] > own_start and not (span == carried and open_eeo)
+        )
+        if carried is not None and carried in eeo_paragraphs:
+            pending = []
+        
+        owned = sorted(
+            (issue for issue in _scan_window(analyzed, eeo_paragraphs) if own_start <= issue["position"] < own_end),
+            key=lambda issue: issue["position"]
+        )
+        for issue in owned:
+            issue["position"] += base
+            if "sentence_span" in issue:
+                issue["sentence_span"] = [issue["sentence_span"][0] + base, issue["sentence_span"][1] + base]
+        
+        # The paragraph this window's owned range ends in, unless it is cut by the window's end
+        trailing = _paragraph_at(analyzed, own_end - 1)
+        open_eeo = trailing is not None and trailing in eeo_paragraphs
+        still_open = trailing is not None and not open_eeo and trailing[1] == len(window) and own_end < len(window)
+        cut = len(owned)
+        if still_open:
+            # Held from the first issue in that paragraph, or in a sentence running into it
+            cut = next((index for index, issue in enumerate(owned)
+                        if max(issue["position"], issue.get("sentence_span", (0, 0))[1] - 1) >= base + trailing[0]),
+                       cut)
+        owned, held = owned[:cut], owned[cut:]
+        if still_open and carried_open and carried == trailing:
+            ready, pending = owned, pending + held
+        else:
+            ready, pending = pending + owned, held
+        
+        for issue in ready:
+            if issue.pop("occurrences", None) is not None:
+                key = (issue["bias_type"], issue["word"])
+                reported[key] = reported.get(key, 0) + 1
+                totals[issue["word"]] = totals.get(issue["word"], 0) + 1
+                if limit and reported[key] > limit:
+                    continue
+            
+            score = min(100, score + calculate_bias_score([issue]))
+            issue_count += 1
+            bias_type_counts[issue["bias_type"]] = bias_type_counts.get(issue["bias_type"], 0) + 1
+            yield "issue", issue
+    
+    summary = {
+        "score": score,
+        "severity": get_severity_label(score),
+        "issue_count": issue_count,
+        "summary": _summary_text(issue_count, bias_type_counts),
+        "characters": length,
+        "windows": windows,
+        "detection_method": "streaming_windows"
+    }
+    if all_occurrences:
+        summary["occurrences"] = totals
+    if eeo_skipped:
+        summary["eeo_paragraphs_skipped"] = eeo_skipped
+    yield "summary", summary
+
+
+# Repeat scans of the same text are answered from memory. Sizes are the
+# compact JSON length of the result; 0 for either setting disables caching.
+SCAN_CACHE = ResultCache(
+    max_bytes=int(os.environ.get("BIASRADAR_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    ttl_seconds=float(os.environ.get("BIASRADAR_CACHE_TTL_SECONDS", 3600)),
+    size_of=lambda result: len(json.dumps(result, separators=(",", ":")))
+)
+
+
+def scan_cache_key(text: str, enable_ai: bool = False, all_occurrences: bool = False,
+                   max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM,
+                   flagged_only_heatmap: bool = False, response_format: str = "v1",
+                   ai_token_budget: Optional[int] = None) -> Tuple[Any, ...]:
+    """
+    Cache key for a hybrid_detect_bias call. The text is hashed as given:
+    issue offsets are part of the result, so any rewrite of the text (even
+    whitespace) must miss.
+    """
+    digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+    if ai_token_budget is None:
+        ai_token_budget = AI_TOKEN_BUDGET
+    return (digest, bool(enable_ai), bool(all_occurrences), max_occurrences_per_term or None,
+            bool(flagged_only_heatmap), response_format, ai_token_budget if enable_ai else None,
+            LEXICON_FINGERPRINT)
+
+
+def cached_hybrid_detect_bias(text: str, enable_ai: bool = False, all_occurrences: bool = False,
+                              max_occurrences_per_term: Optional[int] = DEFAULT_MAX_OCCURRENCES_PER_TERM,
+                              executor: Any = None, flagged_only_heatmap: bool = False,
+                              response_format: str = "v1", ai_token_budget: Optional[int] = None,
+                              ai_latency_budget: Optional[float] = None) -> Dict[str, Any]:
+    """
+    hybrid_detect_bias behind SCAN_CACHE. Cached results are shared between
+    callers and must not be mutated. Results whose AI step is still pending,
+    timed out or failed are not cached.
+    """
+    key = scan_cache_key(text, enable_ai, all_occurrences, max_occurrences_per_term,
+                         flagged_only_heatmap, response_format, ai_token_budget)
+    result = SCAN_CACHE.get(key)
+    if result is None:
+        result = hybrid_detect_bias(text, enable_ai, all_occurrences, max_occurrences_per_term,
+                                    executor, flagged_only_heatmap, response_format, ai_token_budget,
+                                    ai_latency_budget)
+        # A scan that answered without its AI findings must be able to get them next time
+        if result.get("ai_status", "complete") == "complete":
+            SCAN_CACHE.put(key, result)
+    return result
+
+
+IMPORT_MS = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
+
+
+def warmup() -> Dict[str, Any]:
+    """
+    Exercise the full rule-based scan path once so the first real request
+    does not pay for lazy initialisation. Safe to call repeatedly; serves
+    as the target of platform warm-up pings.
+    """
+    started = time.perf_counter()
+    result = hybrid_detect_bias(
+        "The chairman wants young, energetic salesmen.\n\nWe are an equal employment opportunity employer.",
+        all_occurrences=True,
+        response_format="v2"
+    )
+    build_scan_response(result, "v2")
+    return {
+        "status": "warm",
+        "import_ms": IMPORT_MS,
+        "warmup_ms": round((time.perf_counter() - started) * 1000, 1),
+        "issues": len(result["issues"])
     }
@@ -0,0 +1,113 @@
+# On-disk cache for LLM validation results, shared by every worker on a node
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResultCache:
+    """
+    SQLite-backed cache of LLM responses keyed by an opaque string.
+
+    SQLite's file locking makes the cache safe to share between processes;
+    each thread keeps its own connection. Once the stored payloads exceed
+    max_bytes, the least recently used rows are deleted. ttl_seconds is
+    optional (None or 0 means entries never expire). Storage errors are
+    logged and treated as misses, so a broken cache never fails a scan.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds or None
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_results ("
+                " key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_results_last_used ON llm_results (last_used)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the decoded payload for key, or None on a miss or expiry"""
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT payload, created FROM llm_results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if self.ttl_seconds and now - row[1] >= self.ttl_seconds:
+                conn.execute("DELETE FROM llm_results WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_results SET last_used = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("LLM cache read error: %s", e)
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value as JSON, then trim least recently used rows to max_bytes"""
+        if self.max_bytes <= 0:
+            return
+        payload = json.dumps(value, separators=(",", ":"))
+        if len(payload) > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_results (key, payload, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_results").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total - self.max_bytes)
+        except sqlite3.Error as e:
+            logger.warning("LLM cache write error: %s", e)
+
+    def _evict(self, conn: sqlite3.Connection, excess: int) -> None:
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM llm_results ORDER BY last_used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM llm_results WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        try:
+            entries, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_results"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, total = 0, 0
+        return {"path": self.path, "entries": entries, "bytes": total,
+                "max_bytes": self.max_bytes, "ttl_seconds": self.ttl_seconds}
+
+
+def default_llm_cache() -> LLMResultCache:
+    """Cache configured from the environment; /tmp is shared by all workers on a node"""
+    return LLMResultCache(
+        path=os.environ.get(
+            "BIASRADAR_LLM_CACHE_PATH",
+            os.path.join(tempfile.gettempdir(), "biasradar_llm_cache.sqlite3")
+        ),
+        max_bytes=int(os.environ.get("BIASRADAR_LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+        ttl_seconds=float(os.environ.get("BIASRADAR_LLM_CACHE_TTL_SECONDS", 0))
+    )
@@ -0,0 +1,196 @@
+# Shared keep-alive HTTP transport for OpenAI-compatible chat completions (stdlib only)
+import http.client
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+
+class LLMError(Exception):
+    """Non-2xx response from the LLM endpoint"""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"OpenAI API error: {status} - {body}")
+        self.status = status
+        self.body = body
+
+
+# A reused socket the server already closed fails with one of these on first use
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                            BrokenPipeError, ConnectionResetError)
+
+
+class LLMTransport:
+    """
+    Pool of persistent HTTP/1.1 connections to one OpenAI-compatible base URL.
+    
+    Up to pool_size connections are kept open and reused, so only the first
+    calls on each connection pay for the TCP and TLS handshakes. Safe to share
+    between threads: a caller borrows a connection for the length of one
+    request and waits (up to timeout) when all of them are busy. Async code
+    calls achat(), which runs the request on a worker thread.
+    """
+
+    def __init__(self, base_url: str, api_key: str, pool_size: int = 4, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.base_url = base_url
+        self.api_key = api_key
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._path_prefix = parts.path.rstrip("/")
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if self._https:
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _request(self, path: str, payload: Dict[str, Any]):
+        """Send payload on a pooled connection; returns (conn, response) with headers read"""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
+        }
+        try:
+            conn, reused = self._idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._new_connection(), False
+        
+        try:
+            return conn, self._send(conn, path, body, headers)
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a fresh one
+            conn = self._new_connection()
+            try:
+                return conn, self._send(conn, path, body, headers)
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+    def _send(self, conn: http.client.HTTPConnection, path: str, body: bytes,
+              headers: Dict[str, str]) -> http.client.HTTPResponse:
+        conn.request("POST", self._path_prefix + path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def _release(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        # Only a fully read response leaves the connection ready for another request
+        if response.will_close or not response.isclosed():
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def _acquire_slot(self) -> None:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("Timed out waiting for a free LLM connection")
+
+    def post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST payload as JSON to base_url + path and return the decoded response"""
+        self._acquire_slot()
+        try:
+            conn, response = self._request(path, payload)
+            try:
+                status, data = response.status, response.read()
+            finally:
+                self._release(conn, response)
+        finally:
+            self._slots.release()
+        
+        if status >= 400:
+            raise LLMError(status, data.decode("utf-8", "replace"))
+        return json.loads(data.decode("utf-8"))
+
+    def chat(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini", **options: Any) -> str:
+        """Run one chat completion and return the first choice's message content"""
+        payload = {"model": model, "messages": messages}
+        payload.update(options)
+        result = self.post_json("/chat/completions", payload)
+        return result["choices"][0]["message"]["content"] or ""
+
+    def stream_chat(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini",
+                    **options: Any) -> Iterator[str]:
+        """
+        Run a streamed chat completion and yield content deltas as they arrive.
+        The connection stays borrowed until the generator is exhausted or closed.
+        """
+        payload = {"model": model, "messages": messages, "stream": True}
+        payload.update(options)
+        self._acquire_slot()
+        try:
+            conn, response = self._request("/chat/completions", payload)
+            try:
+                if response.status >= 400:
+                    raise LLMError(response.status, response.read().decode("utf-8", "replace"))
+                # Server-sent events: one "data: {chunk}" line per delta, then "data: [DONE]"
+                for raw_line in response:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or []
+                    delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+                response.read()
+            finally:
+                self._release(conn, response)
+        finally:
+            self._slots.release()
+
+    async def achat(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini", **options: Any) -> str:
+        """chat() for async callers; the blocking request runs on a worker thread"""
+        import asyncio
+        return await asyncio.to_thread(self.chat, messages, model, **options)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_transport: Optional[LLMTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_llm_transport() -> Optional[LLMTransport]:
+    """
+    The process-wide transport, created on first use from the environment.
+    Returns None when no API key is configured.
+    """
+    global _transport
+    if _transport is None:
+        api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
+        if not api_key:
+            return None
+        base_url = (os.environ.get("OPENAI_BASE_URL") or os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL")
+                    or "https://api.openai.com/v1")
+        with _transport_lock:
+            if _transport is None:
+                _transport = LLMTransport(
+                    base_url,
+                    api_key,
+                    pool_size=int(os.environ.get("BIASRADAR_LLM_POOL_SIZE", 4)),
+                    timeout=float(os.environ.get("BIASRADAR_LLM_TIMEOUT_SECONDS", 30))
+                )
+    return _transport
@@ -0,0 +1,62 @@
+# Overlapping windows over a stream of text, for scanning documents of any length
+import re
+from typing import Iterable, Iterator, Tuple
+
+# Cut points sit where a new paragraph or sentence span would start, so a
+# span never straddles the boundary between two windows' owned ranges.
+WINDOW_CUT_PATTERNS = (
+    re.compile(r'(?<=\S)\n[ \t\r\f\v]*\n'),  # paragraph break
+    re.compile(r'(?<=[.!?])\s'),             # sentence end
+    re.compile(r'\s'),
+)
+
+
+def window_cut(buffer: str, lo: int, hi: int) -> int:
+    """Latest paragraph break in buffer[lo:hi], else sentence end, else whitespace, else hi"""
+    for pattern in WINDOW_CUT_PATTERNS:
+        last = None
+        for last in pattern.finditer(buffer, lo, hi):
+            pass
+        if last is not None:
+            return last.start()
+    return hi
+
+
+def iter_text_windows(chunks: Iterable[str], window_size: int, overlap: int) -> Iterator[Tuple[int, str, int, int]]:
+    """
+    Split a stream of text chunks into overlapping windows.
+
+    Yields (base, window, own_start, own_end): window starts at document
+    offset base and owns window[own_start:own_end]. Owned ranges tile the
+    document, and each has at least `overlap` characters of context on both
+    sides except at the document edges. Windows end just past a paragraph or
+    sentence break where one is available. Only about one window of text is
+    held in memory at a time. The overlap should cover the longest phrase
+    and the widest look-around of whatever scans the windows.
+    """
+    if window_size < 4 * overlap:
+        raise ValueError("window_size must be at least four times the overlap")
+
+    chunks = iter(chunks)
+    buffer = ""
+    base = 0
+    own_start = 0
+    exhausted = False
+
+    while True:
+        while not exhausted and len(buffer) <= window_size:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+            else:
+                buffer += chunk
+
+        if exhausted and len(buffer) <= window_size:
+            yield base, buffer, own_start, len(buffer)
+            return
+
+        cut = window_cut(buffer, window_size // 2, window_size - overlap)
+        yield base, buffer[:cut + overlap], own_start, cut
+        buffer = buffer[cut - overlap:]
+        base += cut - overlap
+        own_start = overlap
@@ -1,47 +1,160 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import os
-import urllib.request
-import urllib.error
+import sys
+from contextlib import closing
 from datetime import datetime
 
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    from _llm_transport import get_llm_transport, LLMError
+except ImportError:
+    from api.biasradar._llm_transport import get_llm_transport, LLMError
+
 
 # Get OpenAI API key from environment
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY") or os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
-OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL") or "https://api.openai.com/v1"
 
 
-def call_openai(messages, temperature=0.7, max_tokens=500):
-    """Call OpenAI API using pure Python urllib (no dependencies)"""
-    if not OPENAI_API_KEY:
+REWRITE_SYSTEM_PROMPT = "You are a bias detection and correction expert. Your job is to rewrite text to remove all forms of bias including gender, racial, age, disability, cultural, political, religious, LGBTQ+, socioeconomic, intersectional bias, and offensive language & tone (profanity, slurs, hate speech, unprofessional language). Maintain the core message but use inclusive, neutral, and professional language. Be concise and professional."
+DEFAULT_IMPROVEMENTS = ["Removed biased language", "Used inclusive terminology", "Made text more neutral"]
+
+
+def rewrite_messages(text):
+    return [
+        {
+            "role": "system",
+            "content": REWRITE_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"Rewrite this text to remove all biases and offensive language while preserving the core message:\n\n{text}"
+        }
+    ]
+
+
+def improvements_messages(text, fixed_text):
+    return [
+        {
+            "role": "system",
+            "content": "List 3-5 specific improvements made to remove bias. Be brief and specific."
+        },
+        {
+            "role": "user",
+            "content": f"Original: {text}\n\nRevised: {fixed_text}\n\nList the key improvements:"
+        }
+    ]
+
+
+def structured_fix_messages(text):
+    return [
+        {
+            "role": "system",
+            "content": REWRITE_SYSTEM_PROMPT + ' Respond with a JSON object: {"fixed_text": "<the rewritten text>", "improvements": ["<3-5 brief, specific improvements made to remove bias>"]}'
+        },
+        {
+            "role": "user",
+            "content": f"Rewrite this text to remove all biases and offensive language while preserving the core message:\n\n{text}"
+        }
+    ]
+
+
+def parse_structured_fix(content):
+    """
+    (fixed_text, improvements) from a JSON-mode reply, or None when the reply
+    has no usable rewrite and the caller should fall back to the two-call path.
+    """
+    try:
+        result = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(result, dict):
+        return None
+    fixed_text = result.get("fixed_text")
+    if not isinstance(fixed_text, str) or not fixed_text.strip():
+        return None
+    improvements = result.get("improvements")
+    if not isinstance(improvements, list):
+        improvements = []
+    improvements = [imp.strip() for imp in improvements if isinstance(imp, str) and imp.strip()][:5]
+    return fixed_text.strip(), improvements if improvements else DEFAULT_IMPROVEMENTS
+
+
+def parse_improvements(improvements_text):
+    improvements = [imp.strip() for imp in improvements_text.split('\n') if imp.strip() and not imp.strip().startswith('#')]
+    improvements = [imp.lstrip('•-*123456789. ') for imp in improvements if imp][:5]
+    return improvements if improvements else DEFAULT_IMPROVEMENTS
+
+
+def call_openai(messages, temperature=0.7, max_tokens=500, **options):
+    """Call OpenAI over the shared keep-alive transport (no dependencies)"""
+    transport = get_llm_transport()
+    if transport is None:
         raise ValueError("OpenAI API key not configured")
     
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": messages,
-        "temperature": temperature,
-        "max_tokens": max_tokens
-    }
+    try:
+        content = transport.chat(
+            messages,
+            model="gpt-4o-mini",
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **options
+        )
+        return content.strip()
+    except LLMError:
+        raise
+    except Exception as e:
+        raise Exception(f"Failed to call OpenAI: {str(e)}")
+
+
+def generate_fix(text):
+    """
+    Rewrite and improvements from one JSON-mode completion. Falls back to a
+    plain rewrite followed by a separate improvements call when the structured
+    reply cannot be used, or when the JSON-mode call itself is refused (for
+    example a model or deployment that rejects response_format).
+    """
+    try:
+        structured = parse_structured_fix(call_openai(
+            messages=structured_fix_messages(text),
+            temperature=0.7,
+            max_tokens=700,
+            response_format={"type": "json_object"}
+        ))
+    except LLMError:
+        structured = None
+    if structured is not None:
+        return structured
     
-    req = urllib.request.Request(
-        f"{OPENAI_BASE_URL}/chat/completions",
-        data=json.dumps(payload).encode('utf-8'),
-        headers=headers,
-        method='POST'
+    fixed_text = call_openai(
+        messages=rewrite_messages(text),
+        temperature=0.7,
+        max_tokens=500
     )
+    improvements_text = call_openai(
+        messages=improvements_messages(text, fixed_text),
+        temperature=0.5,
+        max_tokens=200
+    )
+    return fixed_text, parse_improvements(improvements_text)
+
+
+def stream_openai(messages, temperature=0.7, max_tokens=500):
+    """Yield completion tokens from OpenAI as they are generated"""
+    transport = get_llm_transport()
+    if transport is None:
+        raise ValueError("OpenAI API key not configured")
     
     try:
-        with urllib.request.urlopen(req, timeout=30) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result['choices'][0]['message']['content'].strip()
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8')
-        raise Exception(f"OpenAI API error: {e.code} - {error_body}")
+        yield from transport.stream_chat(
+            messages,
+            model="gpt-4o-mini",
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+    except LLMError:
+        raise
     except Exception as e:
         raise Exception(f"Failed to call OpenAI: {str(e)}")
 
@@ -74,46 +187,18 @@ class handler(BaseHTTPRequestHandler):
                 self.send_error(400, "Text cannot be empty")
                 return
             
-            # Generate fixed text using OpenAI
-            fixed_text = call_openai(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a bias detection and correction expert. Your job is to rewrite text to remove all forms of bias including gender, racial, age, disability, cultural, political, religious, LGBTQ+, socioeconomic, intersectional bias, and offensive language & tone (profanity, slurs, hate speech, unprofessional language). Maintain the core message but use inclusive, neutral, and professional language. Be concise and professional."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Rewrite this text to remove all biases and offensive language while preserving the core message:\n\n{text}"
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            # Generate improvements list
-            improvements_text = call_openai(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "List 3-5 specific improvements made to remove bias. Be brief and specific."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Original: {text}\n\nRevised: {fixed_text}\n\nList the key improvements:"
-                    }
-                ],
-                temperature=0.5,
-                max_tokens=200
-            )
+            if data.get('stream') or 'text/event-stream' in self.headers.get('Accept', ''):
+                self.stream_fix(text)
+                return
             
-            improvements = [imp.strip() for imp in improvements_text.split('\n') if imp.strip() and not imp.strip().startswith('#')]
-            improvements = [imp.lstrip('•-*123456789. ') for imp in improvements if imp][:5]
+            # Rewrite and improvements in a single structured completion
+            fixed_text, improvements = generate_fix(text)
             
             # Send response
             response_data = {
                 "original_text": text,
                 "fixed_text": fixed_text,
-                "improvements": improvements if improvements else ["Removed biased language", "Used inclusive terminology", "Made text more neutral"]
+                "improvements": improvements
             }
             
             self.send_response(200)
@@ -127,6 +212,49 @@ class handler(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_error(500, f"Error generating fix: {str(e)}")
     
+    def stream_fix(self, text):
+        """
+        Server-sent events: one "token" event per rewrite delta as it arrives,
+        then a "done" event carrying the full FixResponse with improvements.
+        Failures after the stream has started arrive as an "error" event.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+        
+        try:
+            tokens = []
+            with closing(stream_openai(rewrite_messages(text), temperature=0.7, max_tokens=500)) as stream:
+                for token in stream:
+                    tokens.append(token)
+                    self.send_event("token", {"text": token})
+            fixed_text = "".join(tokens).strip()
+            
+            improvements_text = call_openai(
+                messages=improvements_messages(text, fixed_text),
+                temperature=0.5,
+                max_tokens=200
+            )
+            self.send_event("done", {
+                "original_text": text,
+                "fixed_text": fixed_text,
+                "improvements": parse_improvements(improvements_text)
+            })
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; the token stream was closed and its LLM connection dropped
+            pass
+        except Exception as e:
+            self.send_event("error", {"error": f"Error generating fix: {str(e)}"})
+    
+    def send_event(self, event, payload):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode('utf-8'))
+        self.wfile.flush()
+    
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
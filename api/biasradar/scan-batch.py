@@ -0,0 +1,78 @@
+from http.server import BaseHTTPRequestHandler
+import json
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    from _batch import iter_batch_results, MAX_BATCH_DOCUMENTS
+except ImportError:
+    from api.biasradar._batch import iter_batch_results, MAX_BATCH_DOCUMENTS
+
+
+def parse_ndjson(body: str):
+    """Yield one document per non-blank NDJSON line; unparseable lines yield None."""
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            ip_address = self.headers.get('X-Forwarded-For', self.client_address[0])
+            timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+            
+            # Parse request body: a JSON array, {"documents": [...]}, or NDJSON
+            content_length = int(self.headers['Content-Length'])
+            body = self.rfile.read(content_length).decode('utf-8')
+            content_type = self.headers.get('Content-Type', '')
+            
+            if 'ndjson' in content_type:
+                documents = list(parse_ndjson(body))
+            else:
+                data = json.loads(body)
+                documents = data.get('documents') if isinstance(data, dict) else data
+                if not isinstance(documents, list):
+                    self.send_error(400, "Body must be a JSON array of documents or {\"documents\": [...]}")
+                    return
+            
+            if len(documents) == 0:
+                self.send_error(400, "Batch cannot be empty")
+                return
+            
+            if len(documents) > MAX_BATCH_DOCUMENTS:
+                self.send_error(400, f"Batch too large. Maximum {MAX_BATCH_DOCUMENTS} documents.")
+                return
+            
+            print(f"[BIASRADAR SCAN BATCH] {timestamp} | IP: {ip_address} | Documents: {len(documents)}")
+            
+            # Stream one NDJSON line per document as soon as it finishes
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.end_headers()
+            
+            for result in iter_batch_results(documents):
+                self.wfile.write((json.dumps(result, separators=(',', ':')) + '\n').encode('utf-8'))
+                self.wfile.flush()
+        
+        except json.JSONDecodeError:
+            self.send_error(400, "Invalid JSON body")
+        except Exception as e:
+            self.send_error(500, f"Error processing request: {str(e)}")
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
@@ -0,0 +1,99 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import codecs
+import json
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    from _bias_detection import iter_streaming_scan, DEFAULT_MAX_OCCURRENCES_PER_TERM
+except ImportError:
+    from api.biasradar._bias_detection import iter_streaming_scan, DEFAULT_MAX_OCCURRENCES_PER_TERM
+
+MAX_STREAM_BYTES = 5 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def read_text_chunks(rfile, content_length: int):
+    """Decode a text/plain body chunk by chunk instead of reading it all at once"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    remaining = content_length
+    while remaining > 0:
+        data = rfile.read(min(READ_CHUNK_BYTES, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            ip_address = self.headers.get('X-Forwarded-For', self.client_address[0])
+            timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+            content_length = int(self.headers['Content-Length'])
+            content_type = self.headers.get('Content-Type', '')
+            
+            if content_length > MAX_STREAM_BYTES:
+                self.send_error(400, "Body too large. Maximum 5MB.")
+                return
+            
+            # Options come from the query string, or from the JSON body when one is sent
+            options = {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+            if content_type.startswith('text/plain'):
+                chunks = read_text_chunks(self.rfile, content_length)
+            else:
+                data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+                text = data.get('text', '')
+                if not isinstance(text, str) or len(text.strip()) == 0:
+                    self.send_error(400, "Text cannot be empty")
+                    return
+                options.update({key: value for key, value in data.items() if key != 'text'})
+                chunks = [text]
+            
+            all_occurrences = str(options.get('all_occurrences', False)).lower() in ('1', 'true')
+            max_occurrences_per_term = options.get('max_occurrences_per_term', DEFAULT_MAX_OCCURRENCES_PER_TERM)
+            if isinstance(max_occurrences_per_term, str):
+                max_occurrences_per_term = int(max_occurrences_per_term) if max_occurrences_per_term.isdigit() else -1
+            if max_occurrences_per_term is not None and (
+                not isinstance(max_occurrences_per_term, int) or max_occurrences_per_term < 0
+            ):
+                self.send_error(400, "max_occurrences_per_term must be a non-negative integer")
+                return
+            
+            use_sse = options.get('format') == 'sse' or 'text/event-stream' in self.headers.get('Accept', '')
+            
+            print(f"[BIASRADAR SCAN STREAM] {timestamp} | IP: {ip_address} | Body: {content_length} bytes | Format: {'sse' if use_sse else 'ndjson'}")
+            
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream' if use_sse else 'application/x-ndjson')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.end_headers()
+            
+            # Issues go out as each window finishes; the summary comes last
+            for event, payload in iter_streaming_scan(chunks, all_occurrences, max_occurrences_per_term):
+                if use_sse:
+                    line = f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+                else:
+                    line = json.dumps({"type": event, event: payload}, separators=(',', ':')) + '\n'
+                self.wfile.write(line.encode('utf-8'))
+                self.wfile.flush()
+        
+        except json.JSONDecodeError:
+            self.send_error(400, "Invalid JSON body")
+        except Exception as e:
+            self.send_error(500, f"Error processing request: {str(e)}")
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
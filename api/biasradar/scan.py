@@ -7,9 +7,9 @@ from datetime import datetime
 sys.path.append(os.path.dirname(__file__))
 
 try:
-    from _bias_detection import hybrid_detect_bias
+    from _bias_detection import cached_hybrid_detect_bias, build_scan_response, warmup, DEFAULT_MAX_OCCURRENCES_PER_TERM
 except ImportError:
-    from api.biasradar._bias_detection import hybrid_detect_bias
+    from api.biasradar._bias_detection import cached_hybrid_detect_bias, build_scan_response, warmup, DEFAULT_MAX_OCCURRENCES_PER_TERM
 
 
 class handler(BaseHTTPRequestHandler):
@@ -27,6 +27,12 @@ class handler(BaseHTTPRequestHandler):
             
             text = data.get('text', '')
             enable_ai = data.get('enable_ai', False)  # Feature flag for OpenAI validation
+            ai_token_budget = data.get('ai_token_budget')  # Prompt tokens the AI step may spend (None = default)
+            ai_latency_budget = data.get('ai_latency_budget')  # Seconds to wait for AI findings (None = default)
+            all_occurrences = bool(data.get('all_occurrences', False))  # Report every hit, not just the first
+            max_occurrences_per_term = data.get('max_occurrences_per_term', DEFAULT_MAX_OCCURRENCES_PER_TERM)
+            flagged_only_heatmap = bool(data.get('flagged_only_heatmap', False))  # Only biased tokens + token_count
+            response_format = data.get('response_format', 'v1')  # "v2" = compact columnar response
             
             # Log the scan request
             detection_mode = "AI-Enhanced" if enable_ai else "Standard (Pattern-Enhanced)"
@@ -42,30 +48,42 @@ class handler(BaseHTTPRequestHandler):
                 self.send_error(400, "Text too long. Maximum 50,000 characters.")
                 return
             
-            # Use hybrid detection system
-            result = hybrid_detect_bias(text, enable_ai=enable_ai)
+            if max_occurrences_per_term is not None and (
+                not isinstance(max_occurrences_per_term, int) or max_occurrences_per_term < 0
+            ):
+                self.send_error(400, "max_occurrences_per_term must be a non-negative integer")
+                return
             
-            # Create summary
-            bias_type_counts = {}
-            for issue in result["issues"]:
-                bias_type_counts[issue["bias_type"]] = bias_type_counts.get(issue["bias_type"], 0) + 1
+            if ai_token_budget is not None and (
+                not isinstance(ai_token_budget, int) or ai_token_budget < 0
+            ):
+                self.send_error(400, "ai_token_budget must be a non-negative integer")
+                return
             
-            if result["issues"]:
-                summary = f"Found {len(result['issues'])} potential bias issue(s): " + ", ".join(
-                    f"{count} {bias_type}" for bias_type, count in bias_type_counts.items()
-                )
-            else:
-                summary = "No significant biases detected. Great job!"
+            if ai_latency_budget is not None and (
+                isinstance(ai_latency_budget, bool) or not isinstance(ai_latency_budget, (int, float))
+                or ai_latency_budget < 0
+            ):
+                self.send_error(400, "ai_latency_budget must be a non-negative number of seconds")
+                return
+            
+            if response_format not in ('v1', 'v2'):
+                self.send_error(400, "response_format must be 'v1' or 'v2'")
+                return
+            
+            # Use hybrid detection system
+            result = cached_hybrid_detect_bias(
+                text,
+                enable_ai=enable_ai,
+                all_occurrences=all_occurrences,
+                max_occurrences_per_term=max_occurrences_per_term,
+                flagged_only_heatmap=flagged_only_heatmap,
+                response_format=response_format,
+                ai_token_budget=ai_token_budget,
+                ai_latency_budget=ai_latency_budget
+            )
             
-            # Send response
-            response = {
-                "score": result["score"],
-                "severity": result["severity"],
-                "issues": result["issues"],
-                "heatmap": result["heatmap"],
-                "summary": summary,
-                "detection_method": result["detection_method"]
-            }
+            response = build_scan_response(result, response_format, flagged_only_heatmap)
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
@@ -73,11 +91,26 @@ class handler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
             self.send_header('Access-Control-Allow-Headers', 'Content-Type')
             self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            if response_format == 'v2':
+                self.wfile.write(json.dumps(response, separators=(',', ':')).encode('utf-8'))
+            else:
+                self.wfile.write(json.dumps(response).encode('utf-8'))
             
         except Exception as e:
             self.send_error(500, f"Error processing request: {str(e)}")
     
+    def do_GET(self):
+        # Warm-up ping (e.g. a scheduled GET): initialise this instance without scanning user text
+        try:
+            response = warmup()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+        except Exception as e:
+            self.send_error(500, f"Error warming up: {str(e)}")
+    
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -84,7 +84,7 @@ export default async function handler(req, res) {
         });
       }
 
-      const { text, bias_types } = req.body;
+      const { text, bias_types, stream } = req.body;
 
       if (!text) {
         await prisma.$disconnect();
@@ -122,6 +122,54 @@ export default async function handler(req, res) {
       
       console.log('[DEBUG] Calling Python fix endpoint:', endpoint);
       
+      if (stream) {
+        // Relay the server-sent events as they arrive instead of buffering the rewrite
+        const pythonStream = await axios.post(endpoint, {
+          text: sanitizedText,
+          stream: true
+        }, {
+          headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+          responseType: 'stream',
+          timeout: 55000
+        });
+
+        res.writeHead(200, {
+          'Content-Type': 'text/event-stream',
+          'Cache-Control': 'no-cache',
+          'X-Accel-Buffering': 'no'
+        });
+
+        // The request counts against the quota only once the rewrite was delivered in full:
+        // the stream sent its "done" event and the response finished without the client aborting
+        let completed = false;
+        let tail = '';
+        pythonStream.data.on('data', (chunk) => {
+          const seen = tail + chunk.toString('utf8');
+          completed = completed || seen.includes('event: done\n');
+          tail = seen.slice(-16);
+        });
+        pythonStream.data.on('error', () => res.end());
+        res.on('close', async () => {
+          if (!res.writableFinished) {
+            pythonStream.data.destroy();
+          }
+          try {
+            if (completed && res.writableFinished) {
+              await prisma.organization.update({
+                where: { email: org.email },
+                data: { requests_made: { increment: 1 } }
+              });
+            }
+          } catch (updateError) {
+            console.error('Failed to record streamed fix request:', updateError);
+          } finally {
+            await prisma.$disconnect();
+          }
+        });
+        pythonStream.data.pipe(res);
+        return;
+      }
+
       const pythonResponse = await axios.post(endpoint, {
         text: sanitizedText,
         bias_types: bias_types || [
@@ -84,7 +84,7 @@ export default async function handler(req, res) {
         });
       }
 
-      const { text, bias_types } = req.body;
+      const { text, bias_types, all_occurrences, max_occurrences_per_term, flagged_only_heatmap, response_format } = req.body;
 
       if (!text) {
         await prisma.$disconnect();
@@ -133,7 +133,11 @@ export default async function handler(req, res) {
           'gender', 'race', 'age', 'disability', 'culture',
           'political', 'religious', 'lgbtq', 'socioeconomic',
           'truth_seeking', 'ideological_neutrality', 'intersectional', 'language_tone'
-        ]
+        ],
+        all_occurrences,
+        max_occurrences_per_term,
+        flagged_only_heatmap,
+        response_format
       }, {
         headers: { 'Content-Type': 'application/json' },
         timeout: 55000
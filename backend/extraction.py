@@ -0,0 +1,268 @@
+"""
+Text extraction for uploaded documents.
+
+Pages come out in document order as (page_number, text) pairs, where
+page_number counts PDF pages from 1 and is None for formats without pages.
+iter_upload_pages extracts them one at a time in the calling process;
+iter_parallel_pages extracts PDF page ranges across a process pool and
+reassembles them in order, so the joined text and every offset in it are
+the same either way. DOCX files are read straight from their zip parts
+with a streaming XML parser, one paragraph at a time.
+
+An upload is either bytes or a seekable binary file, such as the file
+Starlette spools a multipart upload into; files are read in place.
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from xml.parsers import expat
+from typing import List, Optional, Tuple
+
+UPLOAD_FILE_TYPES = ("pdf", "doc", "docx", "txt")
+
+# PDF page ranges extracted at once for one document, and pages per range.
+# In-flight ranges share the backend worker pool.
+EXTRACTION_WORKERS = int(os.environ.get("BIASRADAR_EXTRACTION_WORKERS", os.cpu_count() or 1))
+EXTRACTION_PAGES_PER_TASK = int(os.environ.get("BIASRADAR_EXTRACTION_PAGES_PER_TASK", 8))
+
+# WordprocessingML, as expat reports names with namespace_separator=' '
+WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main "
+MARKUP_COMPATIBILITY_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006 "
+# Characters a run element stands for, as python-docx renders them
+RUN_CHARACTERS = {WORD_NS + "tab": "\t", WORD_NS + "ptab": "\t", WORD_NS + "br": "\n", WORD_NS + "cr": "\n",
+                  WORD_NS + "noBreakHyphen": "-"}
+# Elements with nothing to read: paragraph and run properties (whose
+# w:tab is a tab stop), tracked deletions, and the fallback copy of text
+# boxes and shapes
+SKIPPED_ELEMENTS = {WORD_NS + "pPr", WORD_NS + "rPr", WORD_NS + "del", WORD_NS + "moveFrom",
+                    MARKUP_COMPATIBILITY_NS + "Fallback"}
+HEADER_FOOTER_PART = re.compile(r"word/(header|footer)(\d*)\.xml")
+DOCX_READ_BYTES = 64 * 1024
+
+def upload_size(upload) -> int:
+    """Size in bytes of a seekable binary file, found by seeking to its end; the file is rewound"""
+    size = upload.seek(0, io.SEEK_END)
+    upload.seek(0)
+    return size
+
+def upload_file(upload):
+    """A binary file for an upload, rewound: bytes are wrapped, files are read in place"""
+    if isinstance(upload, (bytes, bytearray)):
+        return io.BytesIO(upload)
+    upload.seek(0)
+    return upload
+
+def iter_pdf_pages(upload):
+    """
+    Yield (page_number, text) one PDF page at a time, numbered from 1.
+    Pages are only parsed when the consumer asks for them, so stopping
+    early skips the text extraction of every later page.
+    """
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(upload_file(upload))
+    for page_number, page in enumerate(pdf_reader.pages, start=1):
+        yield page_number, page.extract_text() or ""
+
+def iter_wordml_paragraphs(part):
+    """
+    Yield the text of each w:p in a WordprocessingML part (a binary file
+    object), in document order, read DOCX_READ_BYTES at a time with expat.
+    Only the paragraphs still open are held in memory, never a tree.
+    Paragraphs nested in another (text boxes) come out before it.
+    """
+    parser = expat.ParserCreate(namespace_separator=' ')
+    parser.buffer_text = True
+    finished = []
+    open_paragraphs = []  # text pieces of every w:p being read, innermost last
+    state = {"runs": 0, "in_text": False, "skipped": 0}
+    
+    def start(name, attributes):
+        if state["skipped"] or name in SKIPPED_ELEMENTS:
+            state["skipped"] += 1
+        elif name == WORD_NS + "p":
+            open_paragraphs.append([])
+        elif name == WORD_NS + "r":
+            state["runs"] += 1
+        elif name == WORD_NS + "t":
+            state["in_text"] = True
+        elif state["runs"] and open_paragraphs and name in RUN_CHARACTERS:
+            open_paragraphs[-1].append(RUN_CHARACTERS[name])
+    
+    def end(name):
+        if state["skipped"]:
+            state["skipped"] -= 1
+        elif name == WORD_NS + "p":
+            finished.append("".join(open_paragraphs.pop()))
+        elif name == WORD_NS + "r":
+            state["runs"] -= 1
+        elif name == WORD_NS + "t":
+            state["in_text"] = False
+    
+    def characters(data):
+        if state["in_text"] and not state["skipped"] and open_paragraphs:
+            open_paragraphs[-1].append(data)
+    
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+    while True:
+        block = part.read(DOCX_READ_BYTES)
+        parser.Parse(block, not block)
+        yield from finished
+        finished.clear()
+        if not block:
+            return
+
+def docx_text_parts(names: List[str]) -> List[str]:
+    """Zip parts holding a DOCX's text: headers, the document body, then footers"""
+    header_footers = sorted(
+        (match.group(1), int(match.group(2) or 0), name)
+        for name in names for match in [HEADER_FOOTER_PART.fullmatch(name)] if match
+    )
+    return ([name for kind, _, name in header_footers if kind == "header"] + ["word/document.xml"] +
+            [name for kind, _, name in header_footers if kind == "footer"])
+
+def iter_docx_paragraphs(source):
+    """
+    Yield every paragraph of a DOCX (a path or binary file object): headers,
+    then the body including table cells and text boxes, then footers.
+    Parts are decompressed and parsed as they are read, so stopping early
+    skips the rest of the document.
+    """
+    with zipfile.ZipFile(source) as docx:
+        names = docx.namelist()
+        if "word/document.xml" not in names:
+            raise ValueError("Not a Word document: word/document.xml is missing")
+        for name in docx_text_parts(names):
+            with docx.open(name) as part:
+                yield from iter_wordml_paragraphs(part)
+
+def iter_upload_pages(upload, file_ext: str):
+    """
+    Yield (page_number, text) for an uploaded file. Formats without pages
+    yield page_number None: one piece per DOCX paragraph, one for plain text.
+    """
+    if file_ext == 'pdf':
+        yield from iter_pdf_pages(upload)
+        return
+    
+    if file_ext in ['doc', 'docx']:
+        # Extract from Word document
+        for paragraph in iter_docx_paragraphs(upload_file(upload)):
+            yield None, paragraph
+        return
+    
+    # Extract from text file
+    yield None, upload_file(upload).read().decode('utf-8', errors='ignore')
+
+def join_pages(pages, char_limit: Optional[int] = None) -> str:
+    """
+    Join page texts with newlines. With char_limit, stops pulling pages as
+    soon as the text holds more than char_limit characters (and is not all
+    whitespace), which is enough to know it must be truncated.
+    """
+    text_parts = []
+    length = -1
+    has_text = False
+    for _, text in pages:
+        text_parts.append(text)
+        length += len(text) + 1
+        has_text = has_text or bool(text.strip())
+        if char_limit is not None and length > char_limit and has_text:
+            break
+    return '\n'.join(text_parts)
+
+def extract_upload_text(upload, file_ext: str, char_limit: Optional[int] = None) -> str:
+    """Extract plain text from an uploaded file in this process; see join_pages for char_limit"""
+    return join_pages(iter_upload_pages(upload, file_ext), char_limit)
+
+def read_until_text(pages) -> List[Tuple[Optional[int], str]]:
+    """Pull pages until one contains text; returns every page read (none with text if the file has none)"""
+    read = []
+    for page in pages:
+        read.append(page)
+        if page[1].strip():
+            break
+    return read
+
+def iter_page_chunks(pages, page_starts: List[int], page_numbers: List[int]):
+    """
+    Yield each page's text plus a separating newline, recording the document
+    offset where every numbered page starts as it goes.
+    """
+    offset = 0
+    for page_number, text in pages:
+        if page_number is not None:
+            page_starts.append(offset)
+            page_numbers.append(page_number)
+        yield text + '\n'
+        offset += len(text) + 1
+
+# Worker processes keep the last PDF they opened: a range task for the same
+# file then skips re-reading it and re-walking the page tree
+_opened = {"key": None, "reader": None}
+
+def open_pdf(path: str):
+    """Worker: a PdfReader for path, reused across range tasks"""
+    key = (path, os.path.getmtime(path))
+    if _opened["key"] != key:
+        import PyPDF2
+        _opened["key"], _opened["reader"] = None, None
+        _opened["reader"] = PyPDF2.PdfReader(path)
+        _opened["key"] = key
+    return _opened["reader"]
+
+def count_pdf_pages(path: str) -> int:
+    """Worker: number of pages in a PDF"""
+    return len(open_pdf(path).pages)
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Worker: text of PDF pages start to stop, counted from 0"""
+    pages = open_pdf(path).pages
+    return [pages[index].extract_text() or "" for index in range(start, stop)]
+
+def iter_parallel_pages(pool, upload, file_ext: str, max_in_flight: int = EXTRACTION_WORKERS,
+                        pages_per_task: int = EXTRACTION_PAGES_PER_TASK):
+    """
+    Yield the same (page_number, text) stream as iter_upload_pages, with
+    up to max_in_flight PDF page ranges extracting at once on pool (a
+    concurrent.futures executor). Other formats are extracted in this
+    process. The PDF is spilled to a temporary file once so workers read
+    it by path instead of receiving a copy per range. Ranges are
+    submitted in order and only as earlier ones are consumed, so a
+    consumer that stops early (see join_pages) leaves the rest unparsed.
+    """
+    if file_ext != 'pdf' or max_in_flight <= 1:
+        yield from iter_upload_pages(upload, file_ext)
+        return
+    
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as spill:
+        shutil.copyfileobj(upload_file(upload), spill)
+    pending = deque()
+    try:
+        page_count = pool.submit(count_pdf_pages, spill.name).result()
+        ranges = iter([(start, min(start + pages_per_task, page_count))
+                       for start in range(0, page_count, pages_per_task)])
+        
+        def submit_next():
+            next_range = next(ranges, None)
+            if next_range is not None:
+                pending.append((next_range[0], pool.submit(extract_page_range, spill.name, *next_range)))
+        
+        for _ in range(max_in_flight):
+            submit_next()
+        while pending:
+            start, future = pending.popleft()
+            texts = future.result()
+            submit_next()
+            for index, text in enumerate(texts):
+                yield start + index + 1, text
+    finally:
+        for _, future in pending:
+            future.cancel()
+        os.unlink(spill.name)
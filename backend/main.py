@@ -1,18 +1,106 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
-import spacy
-import numpy as np
-from openai import OpenAI
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Tuple, Union
 import os
 import re
-import PyPDF2
-from docx import Document
+import heapq
+import json
+import asyncio
+import bisect
+import hashlib
+import itertools
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import io
 
+# The result cache and text windowing are shared with the serverless
+# functions in api/biasradar; only their stdlib-only modules are imported
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api", "biasradar")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+from _result_cache import ResultCache
+from _text_windows import iter_text_windows
+
+try:
+    from extraction import (UPLOAD_FILE_TYPES, EXTRACTION_WORKERS, extract_upload_text, iter_page_chunks,
+                            iter_parallel_pages, iter_upload_pages, read_until_text, upload_size)
+except ImportError:
+    from backend.extraction import (UPLOAD_FILE_TYPES, EXTRACTION_WORKERS, extract_upload_text, iter_page_chunks,
+                                    iter_parallel_pages, iter_upload_pages, read_until_text, upload_size)
+
+# openai/httpx and PyPDF2 are imported on first use (or by
+# /warmup) so that importing this module stays fast
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
+
 app = FastAPI(title="BiasRadar API")
 
+# Largest accepted upload, and the room allowed on top of it for the rest
+# of the multipart form (boundaries, part headers, bias_types, stream)
+UPLOAD_MAX_BYTES = int(os.environ.get("BIASRADAR_UPLOAD_MAX_BYTES", 5 * 1024 * 1024))
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+# Largest /scan/stream request body, as in the serverless scan-stream.py
+MAX_STREAM_BYTES = 5 * 1024 * 1024
+
+def upload_too_large_detail(size: int) -> str:
+    return (f"File too large ({size / (1024 * 1024):.1f}MB). "
+            f"Maximum size is {UPLOAD_MAX_BYTES / (1024 * 1024):g}MB.")
+
+def stream_too_large_detail(size: int) -> str:
+    return f"Body too large ({size / (1024 * 1024):.1f}MB). Maximum {MAX_STREAM_BYTES / (1024 * 1024):g}MB."
+
+class BodySizeLimit:
+    """
+    ASGI middleware bounding the request body of one path while it is
+    received, before it is parsed or spooled: a Content-Length over
+    max_bytes is refused without reading the body, and a body sent without
+    one fails with a 400 as soon as the bytes received cross the limit.
+    detail(size) gives the error message.
+    """
+    
+    def __init__(self, app, path: str, max_bytes: int, detail):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+        self.detail = detail
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": self.detail(int(content_length))}, status_code=400)
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside body parsing, which lets HTTPException through to the 400 handler
+                    raise HTTPException(status_code=400, detail=self.detail(received))
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(BodySizeLimit, path="/upload-and-scan", max_bytes=UPLOAD_MAX_BYTES + UPLOAD_FORM_OVERHEAD_BYTES,
+                   detail=upload_too_large_detail)
+app.add_middleware(BodySizeLimit, path="/scan/stream", max_bytes=MAX_STREAM_BYTES, detail=stream_too_large_detail)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -21,21 +109,76 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading spaCy model...")
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
-
 AI_INTEGRATIONS_OPENAI_API_KEY = os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
 AI_INTEGRATIONS_OPENAI_BASE_URL = os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL")
 
-client = OpenAI(
-    api_key=AI_INTEGRATIONS_OPENAI_API_KEY,
-    base_url=AI_INTEGRATIONS_OPENAI_BASE_URL
-)
+# One OpenAI client per process, created on first use. Each wraps a single
+# httpx pool, so LLM calls reuse keep-alive connections instead of paying a
+# TCP/TLS handshake per request.
+LLM_POOL_SIZE = int(os.environ.get("BIASRADAR_LLM_POOL_SIZE", 4))
+LLM_TIMEOUT_SECONDS = float(os.environ.get("BIASRADAR_LLM_TIMEOUT_SECONDS", 30))
+_openai_client: Optional["OpenAI"] = None
+_async_openai_client: Optional["AsyncOpenAI"] = None
+_openai_client_lock = threading.Lock()
+
+def llm_pool_limits() -> "httpx.Limits":
+    import httpx
+    return httpx.Limits(max_connections=LLM_POOL_SIZE, max_keepalive_connections=LLM_POOL_SIZE)
+
+def get_openai_client() -> "OpenAI":
+    """Shared sync client for worker threads and scripts"""
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            import httpx
+            from openai import OpenAI
+            _openai_client = OpenAI(
+                api_key=AI_INTEGRATIONS_OPENAI_API_KEY,
+                base_url=AI_INTEGRATIONS_OPENAI_BASE_URL,
+                timeout=LLM_TIMEOUT_SECONDS,
+                http_client=httpx.Client(limits=llm_pool_limits(), timeout=LLM_TIMEOUT_SECONDS)
+            )
+        return _openai_client
+
+def get_async_openai_client() -> "AsyncOpenAI":
+    """Shared async client for request handlers; awaiting it never blocks the event loop"""
+    global _async_openai_client
+    with _openai_client_lock:
+        if _async_openai_client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            _async_openai_client = AsyncOpenAI(
+                api_key=AI_INTEGRATIONS_OPENAI_API_KEY,
+                base_url=AI_INTEGRATIONS_OPENAI_BASE_URL,
+                timeout=LLM_TIMEOUT_SECONDS,
+                http_client=httpx.AsyncClient(limits=llm_pool_limits(), timeout=LLM_TIMEOUT_SECONDS)
+            )
+        return _async_openai_client
+
+# Caps in-flight LLM calls per server process; excess /fix requests wait
+# here without holding a connection or blocking the event loop.
+LLM_MAX_CONCURRENCY = int(os.environ.get("BIASRADAR_LLM_MAX_CONCURRENCY", LLM_POOL_SIZE))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    # Created on first use so it belongs to the server's running event loop
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+async def llm_completion(**kwargs):
+    """One chat completion on the shared async client, within the concurrency cap"""
+    async with get_llm_semaphore():
+        return await get_async_openai_client().chat.completions.create(**kwargs)
+
+# Batch scans fan out over worker processes created at startup; each worker
+# loads the document parsers in its initializer, off the request path.
+# /scan and /upload-and-scan run their detector and parsing work on
+# the same pool so the event loop stays free for other requests.
+BATCH_WORKERS = int(os.environ.get("BIASRADAR_BATCH_WORKERS", os.cpu_count() or 1))
+MAX_BATCH_DOCUMENTS = 1000
+batch_pool: Optional[ProcessPoolExecutor] = None
 
 GENDER_BIAS_WORDS = {
     "male": ["aggressive", "dominant", "assertive", "competitive", "ambitious", "decisive", 
@@ -124,12 +267,22 @@ IDEOLOGICAL_NEUTRALITY_WORDS = {
                            "the actual facts", "the only answer"]
 }
 
+DEFAULT_BIAS_TYPES = ["gender", "race", "age", "disability", "lgbtq", "religion", "socioeconomic", "culture", "intersectional", "political", "ideological_neutrality", "truth_seeking"]
+
 class ScanRequest(BaseModel):
     text: str
-    bias_types: List[str] = ["gender", "race", "age", "disability", "lgbtq", "religion", "socioeconomic", "culture", "intersectional", "political", "ideological_neutrality", "truth_seeking"]
+    bias_types: List[str] = DEFAULT_BIAS_TYPES
+    flagged_only_heatmap: bool = False
+    response_format: str = "v1"
+
+class ScanStreamRequest(BaseModel):
+    text: str
+    bias_types: List[str] = DEFAULT_BIAS_TYPES
+    format: str = "ndjson"
 
 class FixRequest(BaseModel):
     text: str
+    stream: bool = False
 
 class BiasIssue(BaseModel):
     word: str
@@ -144,6 +297,17 @@ class ScanResponse(BaseModel):
     issues: List[BiasIssue]
     heatmap: List[Dict[str, Any]]
     summary: str
+    token_count: Optional[int] = None
+
+class ScanResponseV2(BaseModel):
+    format: str = "v2"
+    score: int
+    severity: str
+    issues: Dict[str, List[Any]]
+    heatmap: Dict[str, List[int]]
+    tables: Dict[str, List[str]]
+    token_count: int
+    summary: str
 
 class FixResponse(BaseModel):
     original_text: str
@@ -177,7 +341,33 @@ def get_severity_label(score: int) -> str:
     else:
         return "High Risk"
 
-def detect_gender_bias(doc, text_lower: str) -> List[BiasIssue]:
+GENDERED_PRONOUNS = {"he": "male", "she": "female", "his": "male", "her": "female", 
+                     "him": "male", "himself": "male", "herself": "female"}
+# Whole-word matches; contractions like "he's" count as "he", as spaCy tokenizes them
+PRONOUN_RE = re.compile(r'\b(?:' + '|'.join(GENDERED_PRONOUNS) + r')\b')
+
+def count_gendered_pronouns(text_lower: str) -> Dict[str, int]:
+    """Count male and female pronouns without a tokenizer model"""
+    pronoun_count = {"male": 0, "female": 0}
+    for match in PRONOUN_RE.finditer(text_lower):
+        pronoun_count[GENDERED_PRONOUNS[match.group()]] += 1
+    return pronoun_count
+
+def detect_pronoun_imbalance(pronoun_count: Dict[str, int]) -> List[BiasIssue]:
+    total_pronouns = sum(pronoun_count.values())
+    if total_pronouns > 3:
+        ratio = max(pronoun_count.values()) / total_pronouns if total_pronouns > 0 else 0
+        if ratio > 0.7:
+            return [BiasIssue(
+                word="pronoun imbalance",
+                bias_type="gender",
+                severity="medium",
+                explanation=f"Pronoun usage is heavily skewed ({pronoun_count}), which may indicate gender bias",
+                position=0
+            )]
+    return []
+
+def detect_gender_bias(text_lower: str, count_pronouns: bool = True) -> List[BiasIssue]:
     issues = []
     
     for category, words in GENDER_BIAS_WORDS.items():
@@ -202,25 +392,9 @@ def detect_gender_bias(doc, text_lower: str) -> List[BiasIssue]:
                     position=position
                 ))
     
-    gendered_pronouns = {"he": "male", "she": "female", "his": "male", "her": "female", 
-                          "him": "male", "himself": "male", "herself": "female"}
-    pronoun_count = {"male": 0, "female": 0}
-    
-    for token in doc:
-        if token.text.lower() in gendered_pronouns:
-            pronoun_count[gendered_pronouns[token.text.lower()]] += 1
-    
-    total_pronouns = sum(pronoun_count.values())
-    if total_pronouns > 3:
-        ratio = max(pronoun_count.values()) / total_pronouns if total_pronouns > 0 else 0
-        if ratio > 0.7:
-            issues.append(BiasIssue(
-                word="pronoun imbalance",
-                bias_type="gender",
-                severity="medium",
-                explanation=f"Pronoun usage is heavily skewed ({pronoun_count}), which may indicate gender bias",
-                position=0
-            ))
+    # Streaming windows pass count_pronouns=False and tally pronouns across the whole document
+    if count_pronouns:
+        issues.extend(detect_pronoun_imbalance(count_gendered_pronouns(text_lower)))
     
     return issues
 
@@ -538,107 +712,278 @@ def detect_ideological_neutrality_bias(text_lower: str) -> List[BiasIssue]:
     
     return issues
 
-def create_heatmap(text: str, issues: List[BiasIssue]) -> List[Dict]:
-    heatmap = []
-    words = text.split()
-    current_pos = 0
-    
-    for word in words:
-        word_start = text.find(word, current_pos)
-        word_end = word_start + len(word)
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3}
+SEVERITY_LEVELS = ["none", "low", "medium", "high"]
+
+def iter_token_issues(text: str, issues: List[BiasIssue]):
+    """
+    Sweep tokens and position-sorted issues together, yielding
+    (token_index, match, matching_issues). An issue marks every token its
+    [position, position + len(word)) range touches, so multi-word issues
+    still cover all of their tokens.
+    """
+    ordered = sorted(issues, key=lambda issue: issue.position)
+    active = []  # min-heap of (issue_end, order, issue) for issues that may cover the next token
+    cursor = 0
+    
+    for index, match in enumerate(re.finditer(r'\S+', text)):
+        word_start, word_end = match.span()
         
-        matching_issues = [
-            issue for issue in issues 
-            if word_start <= issue.position < word_end or 
-            issue.position <= word_start < issue.position + len(issue.word)
-        ]
+        while cursor < len(ordered) and ordered[cursor].position < word_end:
+            issue = ordered[cursor]
+            heapq.heappush(active, (issue.position + max(len(issue.word), 1), cursor, issue))
+            cursor += 1
+        while active and active[0][0] <= word_start:
+            heapq.heappop(active)
         
+        yield index, match, [issue for _, _, issue in active]
+
+def max_severity(issues: List[BiasIssue]) -> str:
+    return max((issue.severity for issue in issues), key=lambda s: SEVERITY_RANK.get(s, 0))
+
+def create_heatmap(text: str, issues: List[BiasIssue], flagged_only: bool = False) -> List[Dict]:
+    """
+    Word-by-word heatmap. With flagged_only=True only biased tokens are
+    returned, each with its token index.
+    """
+    heatmap = []
+    
+    for index, match, matching_issues in iter_token_issues(text, issues):
         if matching_issues:
-            max_severity = max(
-                (issue.severity for issue in matching_issues),
-                key=lambda s: {"low": 1, "medium": 2, "high": 3}[s]
-            )
-            bias_types = list(set(issue.bias_type for issue in matching_issues))
-            
-            heatmap.append({
-                "word": word,
+            entry = {
+                "word": match.group(),
                 "biased": True,
-                "severity": max_severity,
-                "bias_types": bias_types
-            })
-        else:
+                "severity": max_severity(matching_issues),
+                "bias_types": list(dict.fromkeys(issue.bias_type for issue in matching_issues))
+            }
+            if flagged_only:
+                entry["index"] = index
+            heatmap.append(entry)
+        elif not flagged_only:
             heatmap.append({
-                "word": word,
+                "word": match.group(),
                 "biased": False,
                 "severity": "none",
                 "bias_types": []
             })
-        
-        current_pos = word_end
     
     return heatmap
 
+def create_heatmap_ranges(text: str, issues: List[BiasIssue]) -> Tuple[Dict[str, List[int]], int]:
+    """
+    Run-length encoded heatmap for the v2 response: consecutive tokens with
+    the same severity collapse into one offset/length/severity range, with
+    severity as an index into SEVERITY_LEVELS. Returns (ranges, token_count).
+    """
+    offsets, lengths, severities = [], [], []
+    token_count = 0
+    
+    for index, match, matching_issues in iter_token_issues(text, issues):
+        token_count = index + 1
+        level = SEVERITY_LEVELS.index(max_severity(matching_issues)) if matching_issues else 0
+        if severities and severities[-1] == level:
+            lengths[-1] = match.end() - offsets[-1]
+        else:
+            offsets.append(match.start())
+            lengths.append(match.end() - match.start())
+            severities.append(level)
+    
+    return {"offset": offsets, "length": lengths, "severity": severities}, token_count
+
+def compact_issues(issues: List[BiasIssue]) -> Tuple[Dict[str, List[Any]], Dict[str, List[str]]]:
+    """
+    Pack issues into parallel arrays for the v2 response. bias_type,
+    severity and explanation hold indices into the returned tables;
+    explanations are interned as templates with a {word} placeholder.
+    """
+    bias_types: Dict[str, int] = {}
+    templates: Dict[str, int] = {}
+    columns = {"word": [], "position": [], "bias_type": [], "severity": [], "explanation": []}
+    
+    for issue in issues:
+        quoted = f"'{issue.word}'"
+        template = issue.explanation.replace(quoted, "'{word}'") if issue.word else issue.explanation
+        columns["word"].append(issue.word)
+        columns["position"].append(issue.position)
+        columns["bias_type"].append(bias_types.setdefault(issue.bias_type, len(bias_types)))
+        columns["severity"].append(SEVERITY_LEVELS.index(issue.severity))
+        columns["explanation"].append(templates.setdefault(template, len(templates)))
+    
+    tables = {"bias_type": list(bias_types), "severity": list(SEVERITY_LEVELS), "explanation": list(templates)}
+    return columns, tables
+
+# Streaming scans cut text of any length into overlapping windows (see
+# _text_windows); each window reports only the issues inside the range it
+# owns. The overlap covers the longest lexicon phrase (under 30 chars) plus
+# the 20-char reach of intersectional pairing, with room to spare.
+STREAM_WINDOW_SIZE = 20000
+STREAM_WINDOW_OVERLAP = 128
+
+def iter_streaming_scan(chunks, bias_types: List[str], page_of=None):
+    """
+    Scan text of any length window by window. Yields ("issue", issue) with
+    document offsets as each window finishes, then one ("summary", {...}).
+    Pronoun balance is tallied across the whole document and reported
+    just before the summary. No heatmap is built. With page_of, a callable
+    mapping a document offset to a page number, issues also carry "page".
+    """
+    pronoun_count = {"male": 0, "female": 0}
+    bias_type_counts: Dict[str, int] = {}
+    score = 0
+    issue_count = 0
+    windows = 0
+    length = 0
+    
+    def emit(issue: BiasIssue):
+        nonlocal score, issue_count
+        score = min(100, score + calculate_bias_score([issue]))
+        issue_count += 1
+        bias_type_counts[issue.bias_type] = bias_type_counts.get(issue.bias_type, 0) + 1
+        payload = issue.model_dump()
+        if page_of is not None:
+            payload["page"] = page_of(issue.position)
+        return "issue", payload
+    
+    for base, window, own_start, own_end in iter_text_windows(chunks, STREAM_WINDOW_SIZE, STREAM_WINDOW_OVERLAP):
+        windows += 1
+        length = base + len(window)
+        window_lower = window.lower()
+        
+        if "gender" in bias_types:
+            for match in PRONOUN_RE.finditer(window_lower, own_start, own_end):
+                pronoun_count[GENDERED_PRONOUNS[match.group()]] += 1
+        
+        owned = [
+            issue for issue in collect_issues(window_lower, bias_types, count_pronouns=False)
+            if own_start <= issue.position < own_end
+        ]
+        for issue in sorted(owned, key=lambda issue: issue.position):
+            issue.position += base
+            yield emit(issue)
+    
+    if "gender" in bias_types:
+        for issue in detect_pronoun_imbalance(pronoun_count):
+            yield emit(issue)
+    
+    if issue_count:
+        summary = f"Found {issue_count} potential bias issue(s): " + ", ".join(
+            f"{count} {bias_type}" for bias_type, count in bias_type_counts.items()
+        )
+    else:
+        summary = "No significant biases detected. Great job!"
+    
+    yield "summary", {
+        "score": score,
+        "severity": get_severity_label(score),
+        "issue_count": issue_count,
+        "summary": summary,
+        "characters": length,
+        "windows": windows
+    }
+
+def stream_scan_response(chunks, bias_types: List[str], use_sse: bool, page_of=None) -> StreamingResponse:
+    """Wrap iter_streaming_scan as NDJSON lines or server-sent events"""
+    def lines():
+        for event, payload in iter_streaming_scan(chunks, bias_types, page_of):
+            if use_sse:
+                yield f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+            else:
+                yield json.dumps({"type": event, event: payload}, separators=(",", ":")) + "\n"
+    
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(lines(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
 @app.get("/")
 async def root():
     return {
         "message": "Welcome to BiasRadar API",
         "version": "2.0.0",
-        "endpoints": ["/scan", "/fix", "/upload-and-scan"]
+        "endpoints": ["/scan", "/scan/batch", "/scan/stream", "/fix", "/upload-and-scan", "/warmup"]
     }
 
-@app.post("/scan", response_model=ScanResponse)
-async def scan_text(request: ScanRequest):
-    if not request.text or len(request.text.strip()) == 0:
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
-    
-    if len(request.text) > 10000:
-        raise HTTPException(status_code=400, detail="Text too long. Maximum 10,000 characters.")
-    
-    doc = nlp(request.text)
-    text_lower = request.text.lower()
-    
+# Changes whenever a word list changes, so cached results never outlive
+# the lexicons that produced them
+LEXICON_FINGERPRINT = hashlib.sha256(json.dumps([
+    GENDER_BIAS_WORDS, RACE_BIAS_WORDS, AGE_BIAS_WORDS, DISABILITY_BIAS_WORDS, CULTURAL_BIAS_WORDS,
+    POLITICAL_BIAS_WORDS, RELIGION_BIAS_WORDS, LGBTQ_BIAS_WORDS, SOCIOECONOMIC_BIAS_WORDS,
+    TRUTH_SEEKING_WORDS, IDEOLOGICAL_NEUTRALITY_WORDS, GENDERED_PRONOUNS
+], sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+SCAN_CACHE = ResultCache(
+    max_bytes=int(os.environ.get("BIASRADAR_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    ttl_seconds=float(os.environ.get("BIASRADAR_CACHE_TTL_SECONDS", 3600)),
+    size_of=lambda response: len(response.model_dump_json())
+)
+
+def scan_cache_key(request: ScanRequest):
+    """
+    The text is hashed as given, since issue offsets are part of the
+    response; bias_types are order-insensitive. /scan has no AI step, so
+    there is no enable_ai flag to key on.
+    """
+    digest = hashlib.sha256(request.text.encode("utf-8", "surrogatepass")).hexdigest()
+    return (digest, tuple(sorted(set(request.bias_types))), request.response_format,
+            request.flagged_only_heatmap, LEXICON_FINGERPRINT)
+
+def collect_issues(text_lower: str, bias_types: List[str], count_pronouns: bool = True) -> List[BiasIssue]:
+    """Run the requested detectors; count_pronouns=False skips the pronoun-balance check"""
     all_issues = []
     
-    if "gender" in request.bias_types:
-        all_issues.extend(detect_gender_bias(doc, text_lower))
+    if "gender" in bias_types:
+        all_issues.extend(detect_gender_bias(text_lower, count_pronouns))
     
-    if "race" in request.bias_types:
+    if "race" in bias_types:
         all_issues.extend(detect_race_bias(text_lower))
     
-    if "age" in request.bias_types:
+    if "age" in bias_types:
         all_issues.extend(detect_age_bias(text_lower))
     
-    if "disability" in request.bias_types:
+    if "disability" in bias_types:
         all_issues.extend(detect_disability_bias(text_lower))
     
-    if "culture" in request.bias_types:
+    if "culture" in bias_types:
         all_issues.extend(detect_cultural_bias(text_lower))
     
-    if "political" in request.bias_types:
+    if "political" in bias_types:
         all_issues.extend(detect_political_bias(text_lower))
     
-    if "religion" in request.bias_types:
+    if "religion" in bias_types:
         all_issues.extend(detect_religion_bias(text_lower))
     
-    if "lgbtq" in request.bias_types:
+    if "lgbtq" in bias_types:
         all_issues.extend(detect_lgbtq_bias(text_lower))
     
-    if "socioeconomic" in request.bias_types:
+    if "socioeconomic" in bias_types:
         all_issues.extend(detect_socioeconomic_bias(text_lower))
     
-    if "truth_seeking" in request.bias_types:
+    if "truth_seeking" in bias_types:
         all_issues.extend(detect_truth_seeking_bias(text_lower))
     
-    if "ideological_neutrality" in request.bias_types:
+    if "ideological_neutrality" in bias_types:
         all_issues.extend(detect_ideological_neutrality_bias(text_lower))
     
     # Detect intersectional bias if requested
-    if "intersectional" in request.bias_types and len(all_issues) > 1:
+    if "intersectional" in bias_types and len(all_issues) > 1:
         all_issues.extend(detect_intersectional_bias(all_issues))
     
+    return all_issues
+
+def validate_scan_request(request: ScanRequest):
+    if not request.text or len(request.text.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    if len(request.text) > 10000:
+        raise HTTPException(status_code=400, detail="Text too long. Maximum 10,000 characters.")
+    
+    if request.response_format not in ("v1", "v2"):
+        raise HTTPException(status_code=400, detail="response_format must be 'v1' or 'v2'")
+
+def scan_uncached(request: ScanRequest) -> Union[ScanResponse, ScanResponseV2]:
+    """Run the detector chain for one validated request"""
+    all_issues = collect_issues(request.text.lower(), request.bias_types)
+    
     score = calculate_bias_score(all_issues)
     severity = get_severity_label(score)
-    heatmap = create_heatmap(request.text, all_issues)
     
     bias_type_counts = {}
     for issue in all_issues:
@@ -651,169 +996,376 @@ async def scan_text(request: ScanRequest):
     else:
         summary = "No significant biases detected. Great job!"
     
+    if request.response_format == "v2":
+        ranges, token_count = create_heatmap_ranges(request.text, all_issues)
+        issue_columns, tables = compact_issues(all_issues)
+        return ScanResponseV2(
+            score=score,
+            severity=severity,
+            issues=issue_columns,
+            heatmap=ranges,
+            tables=tables,
+            token_count=token_count,
+            summary=summary
+        )
+    
     return ScanResponse(
         score=score,
         severity=severity,
         issues=all_issues,
-        heatmap=heatmap,
-        summary=summary
+        heatmap=create_heatmap(request.text, all_issues, flagged_only=request.flagged_only_heatmap),
+        summary=summary,
+        token_count=len(request.text.split()) if request.flagged_only_heatmap else None
+    )
+
+async def run_cpu_bound(func, *args):
+    """Run CPU-heavy work on the worker pool (a thread when the pool is not started)"""
+    return await asyncio.get_running_loop().run_in_executor(batch_pool, func, *args)
+
+async def run_scan(request: ScanRequest) -> Union[ScanResponse, ScanResponseV2]:
+    """
+    Scan one validated request on the worker pool, answering repeats from
+    SCAN_CACHE. /scan and /scan/batch both come through here in the server
+    process, so they share one cache; cached responses must not be mutated.
+    """
+    key = scan_cache_key(request)
+    response = SCAN_CACHE.get(key)
+    if response is None:
+        response = await run_cpu_bound(scan_uncached, request)
+        SCAN_CACHE.put(key, response)
+    return response
+
+@app.post("/scan", response_model=Union[ScanResponse, ScanResponseV2])
+async def scan_text(request: ScanRequest):
+    validate_scan_request(request)
+    return await run_scan(request)
+
+def load_document_parsers():
+    import PyPDF2
+
+def init_batch_worker():
+    """Load the parsers and run one tiny document through the detectors so the worker is warm before real work arrives."""
+    load_document_parsers()
+    collect_issues("warm up: he said the chairman is aggressive", DEFAULT_BIAS_TYPES)
+
+async def scan_document(document: Any, index: int) -> Dict[str, Any]:
+    """Scan one batch document and return {"id", "result"} or {"id", "error"}."""
+    if not isinstance(document, dict):
+        return {"id": index, "error": "Each document must be a JSON object"}
+    
+    doc_id = document.get("id", index)
+    try:
+        request = ScanRequest(**{key: value for key, value in document.items() if key != "id"})
+        validate_scan_request(request)
+        response = await run_scan(request)
+        return {"id": doc_id, "result": response.model_dump()}
+    except HTTPException as e:
+        return {"id": doc_id, "error": e.detail}
+    except Exception as e:
+        return {"id": doc_id, "error": f"Error processing document: {str(e)}"}
+
+def parse_ndjson(body: bytes):
+    """Yield one document per non-blank NDJSON line; unparseable lines yield None."""
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+
+async def stream_batch_results(documents: List[Any]):
+    """
+    Fan documents out over the worker pool and yield one NDJSON line per
+    document in completion order. At most two documents per worker are in
+    flight.
+    """
+    pending = {}
+    index = 0
+    
+    async def drain():
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        lines = []
+        for future in done:
+            doc_id = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # A crashed worker should cost one document, not the whole batch
+                result = {"id": doc_id, "error": f"Error processing document: {str(e)}"}
+            lines.append(json.dumps(result, separators=(",", ":")) + "\n")
+        return lines
+    
+    for document in documents:
+        doc_id = document.get("id", index) if isinstance(document, dict) else index
+        future = asyncio.ensure_future(scan_document(document, index))
+        pending[future] = doc_id
+        index += 1
+        if len(pending) >= BATCH_WORKERS * 2:
+            for line in await drain():
+                yield line
+    
+    while pending:
+        for line in await drain():
+            yield line
+
+@app.on_event("startup")
+def start_batch_pool():
+    global batch_pool
+    batch_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, initializer=init_batch_worker)
+
+@app.on_event("shutdown")
+def stop_batch_pool():
+    if batch_pool is not None:
+        batch_pool.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("shutdown")
+async def close_openai_clients():
+    if _async_openai_client is not None:
+        await _async_openai_client.close()
+    if _openai_client is not None:
+        _openai_client.close()
+
+@app.get("/warmup")
+async def warmup():
+    """
+    Load everything that is otherwise loaded on first use: the worker pool
+    with the document parsers, and the OpenAI client. Point
+    platform warm-up or readiness hooks here; repeated calls are cheap.
+    """
+    timings = {"import_ms": IMPORT_MS}
+    
+    started = time.perf_counter()
+    # One job per worker makes the pool start (and initialise) all of them
+    await asyncio.gather(*(run_cpu_bound(init_batch_worker) for _ in range(BATCH_WORKERS)))
+    timings["workers_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    started = time.perf_counter()
+    if AI_INTEGRATIONS_OPENAI_API_KEY:
+        get_async_openai_client()
+    timings["llm_client_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    return {"status": "warm", **timings}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return SCAN_CACHE.stats()
+
+@app.post("/scan/batch")
+async def scan_batch(request: Request):
+    """
+    Scan many documents in one request. The body is a JSON array of
+    {"id", "text", ...ScanRequest fields} objects, {"documents": [...]}, or
+    an NDJSON stream (Content-Type: application/x-ndjson). Results stream
+    back as NDJSON, one {"id", "result"} or {"id", "error"} line per
+    document, in completion order.
+    """
+    # The whole body is read here, not from inside the response: once it
+    # streams, StreamingResponse listens for disconnects on the same receive
+    if "ndjson" in request.headers.get("content-type", ""):
+        items = list(parse_ndjson(await request.body()))
+        if len(items) == 0:
+            raise HTTPException(status_code=400, detail="Batch cannot be empty")
+    else:
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        items = data.get("documents") if isinstance(data, dict) else data
+        if not isinstance(items, list) or len(items) == 0:
+            raise HTTPException(status_code=400, detail="Body must be a non-empty JSON array of documents")
+    if len(items) > MAX_BATCH_DOCUMENTS:
+        raise HTTPException(status_code=400, detail=f"Batch too large. Maximum {MAX_BATCH_DOCUMENTS} documents.")
+    
+    return StreamingResponse(stream_batch_results(items), media_type="application/x-ndjson")
+
+@app.post("/scan/stream")
+async def scan_stream(request: ScanStreamRequest, http_request: Request):
+    """
+    Scan text past the /scan size limit in overlapping windows. Issues
+    stream back with document offsets as NDJSON ({"type": "issue", ...})
+    or, with format="sse" or Accept: text/event-stream, as server-sent
+    events; a summary event comes last. Bodies over MAX_STREAM_BYTES are
+    refused with a 400 (see BodySizeLimit).
+    """
+    if not request.text or len(request.text.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    use_sse = request.format == "sse" or "text/event-stream" in http_request.headers.get("accept", "")
+    return stream_scan_response([request.text], request.bias_types, use_sse)
+
+FIX_SYSTEM_PROMPT = "You are a bias detection and correction expert. Your job is to rewrite text to remove all forms of bias including gender, racial, age, disability, cultural, political, religious, LGBTQ+, socioeconomic, and intersectional bias. Maintain the core message but use inclusive, neutral language. Be concise and professional."
+DEFAULT_IMPROVEMENTS = ["Removed biased language", "Used inclusive terminology", "Made text more neutral"]
+
+def fix_messages(text: str) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": FIX_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"Rewrite this text to remove all biases while preserving the core message:\n\n{text}"
+        }
+    ]
+
+def structured_fix_messages(text: str) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": FIX_SYSTEM_PROMPT + ' Respond with a JSON object: {"fixed_text": "<the rewritten text>", "improvements": ["<3-5 brief, specific improvements made to remove bias>"]}'
+        },
+        {
+            "role": "user",
+            "content": f"Rewrite this text to remove all biases while preserving the core message:\n\n{text}"
+        }
+    ]
+
+def parse_structured_fix(content: str) -> Optional[Tuple[str, List[str]]]:
+    """(fixed_text, improvements) from a JSON-mode reply, or None when it has no usable rewrite"""
+    try:
+        result = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(result, dict):
+        return None
+    fixed_text = result.get("fixed_text")
+    if not isinstance(fixed_text, str) or not fixed_text.strip():
+        return None
+    improvements = result.get("improvements")
+    if not isinstance(improvements, list):
+        improvements = []
+    improvements = [imp.strip() for imp in improvements if isinstance(imp, str) and imp.strip()][:5]
+    return fixed_text.strip(), improvements if improvements else DEFAULT_IMPROVEMENTS
+
+async def generate_improvements(text: str, fixed_text: str) -> List[str]:
+    improvements_response = await llm_completion(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system",
+                "content": "List 3-5 specific improvements made to remove bias. Be brief and specific."
+            },
+            {
+                "role": "user",
+                "content": f"Original: {text}\n\nRevised: {fixed_text}\n\nList the key improvements:"
+            }
+        ],
+        temperature=0.5,
+        max_tokens=200
     )
+    
+    improvements_text = (improvements_response.choices[0].message.content or "").strip()
+    improvements = [imp.strip() for imp in improvements_text.split('\n') if imp.strip() and not imp.strip().startswith('#')]
+    improvements = [imp.lstrip('•-*123456789. ') for imp in improvements if imp][:5]
+    return improvements if improvements else DEFAULT_IMPROVEMENTS
+
+def sse_event(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+async def stream_fix_events(text: str):
+    """
+    Forward rewrite tokens as "token" events while the model generates them,
+    then send the full FixResponse, improvements included, as a "done" event.
+    """
+    try:
+        tokens = []
+        # The concurrency slot is held until the token stream is exhausted
+        async with get_llm_semaphore():
+            stream = await get_async_openai_client().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=fix_messages(text),
+                temperature=0.7,
+                max_tokens=500,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    tokens.append(delta)
+                    yield sse_event("token", {"text": delta})
+        
+        fixed_text = "".join(tokens).strip()
+        improvements = await generate_improvements(text, fixed_text)
+        yield sse_event("done", FixResponse(
+            original_text=text,
+            fixed_text=fixed_text,
+            improvements=improvements
+        ).model_dump())
+    except Exception as e:
+        yield sse_event("error", {"error": f"Error generating fix: {str(e)}"})
 
 @app.post("/fix", response_model=FixResponse)
-async def fix_text(request: FixRequest):
+async def fix_text(request: FixRequest, http_request: Request):
+    """
+    Rewrite text without bias. With stream=true or Accept: text/event-stream
+    the rewrite streams back token by token as server-sent events.
+    """
     if not request.text or len(request.text.strip()) == 0:
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
+    if request.stream or "text/event-stream" in http_request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_fix_events(request.text),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
     try:
-        response = client.chat.completions.create(
+        from openai import APIError
+        
+        # Rewrite and improvements in a single JSON-mode completion; an API
+        # error (such as a model that rejects response_format) falls back too
+        try:
+            response = await llm_completion(
+                model="gpt-4o-mini",
+                messages=structured_fix_messages(request.text),
+                response_format={"type": "json_object"},
+                temperature=0.7,
+                max_tokens=700
+            )
+            structured = parse_structured_fix(response.choices[0].message.content or "")
+        except APIError:
+            structured = None
+        if structured is not None:
+            fixed_text, improvements = structured
+            return FixResponse(original_text=request.text, fixed_text=fixed_text, improvements=improvements)
+        
+        # Fallback: plain rewrite, then a separate call for the improvements
+        response = await llm_completion(
             model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a bias detection and correction expert. Your job is to rewrite text to remove all forms of bias including gender, racial, age, disability, cultural, political, religious, LGBTQ+, socioeconomic, and intersectional bias. Maintain the core message but use inclusive, neutral language. Be concise and professional."
-                },
-                {
-                    "role": "user",
-                    "content": f"Rewrite this text to remove all biases while preserving the core message:\n\n{request.text}"
-                }
-            ],
+            messages=fix_messages(request.text),
             temperature=0.7,
             max_tokens=500
         )
         
         fixed_text = (response.choices[0].message.content or "").strip()
         
-        improvements_response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "List 3-5 specific improvements made to remove bias. Be brief and specific."
-                },
-                {
-                    "role": "user",
-                    "content": f"Original: {request.text}\n\nRevised: {fixed_text}\n\nList the key improvements:"
-                }
-            ],
-            temperature=0.5,
-            max_tokens=200
-        )
-        
-        improvements_text = (improvements_response.choices[0].message.content or "").strip()
-        improvements = [imp.strip() for imp in improvements_text.split('\n') if imp.strip() and not imp.strip().startswith('#')]
-        improvements = [imp.lstrip('•-*123456789. ') for imp in improvements if imp][:5]
-        
         return FixResponse(
             original_text=request.text,
             fixed_text=fixed_text,
-            improvements=improvements if improvements else ["Removed biased language", "Used inclusive terminology", "Made text more neutral"]
+            improvements=await generate_improvements(request.text, fixed_text)
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating fix: {str(e)}")
 
-@app.post("/upload-and-scan", response_model=UploadScanResponse)
-async def upload_and_scan(
-    file: UploadFile = File(...),
-    bias_types: str = Form(default='["gender","race","age","disability","culture","political","religion","lgbtq","socioeconomic","intersectional"]')
-):
-    """Upload a file (PDF, DOC, DOCX, TXT) and scan it for biases"""
-    
-    # Check file size (max 5MB)
-    contents = await file.read()
-    file_size_mb = len(contents) / (1024 * 1024)
-    if file_size_mb > 5:
-        raise HTTPException(status_code=400, detail=f"File too large ({file_size_mb:.1f}MB). Maximum size is 5MB.")
-    
-    # Get file extension
-    filename = file.filename or "unknown"
-    file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
-    
-    # Extract text based on file type
-    extracted_text = ""
-    try:
-        if file_ext == 'pdf':
-            # Extract from PDF
-            pdf_file = io.BytesIO(contents)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text_parts = []
-            for page in pdf_reader.pages:
-                text_parts.append(page.extract_text())
-            extracted_text = '\n'.join(text_parts)
-            
-        elif file_ext in ['doc', 'docx']:
-            # Extract from Word document
-            doc_file = io.BytesIO(contents)
-            doc = Document(doc_file)
-            text_parts = [paragraph.text for paragraph in doc.paragraphs]
-            extracted_text = '\n'.join(text_parts)
-            
-        elif file_ext == 'txt':
-            # Extract from text file
-            extracted_text = contents.decode('utf-8', errors='ignore')
-            
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file type: {file_ext}. Please upload PDF, DOC, DOCX, or TXT files."
-            )
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error extracting text from file: {str(e)}")
-    
-    # Check if we extracted any text
-    if not extracted_text or len(extracted_text.strip()) == 0:
-        raise HTTPException(status_code=400, detail="No text could be extracted from the file. Please ensure the file contains readable text.")
-    
-    # Truncate to 10,000 characters if needed
-    original_length = len(extracted_text)
-    if original_length > 10000:
-        extracted_text = extracted_text[:10000] + "..."
-    
-    # Parse bias_types from JSON string
-    import json
-    try:
-        bias_types_list = json.loads(bias_types)
-    except:
-        bias_types_list = ["gender", "race", "age", "disability", "culture", "political", "religion", "lgbtq", "socioeconomic", "intersectional"]
-    
-    # Run bias detection
-    doc = nlp(extracted_text)
-    text_lower = extracted_text.lower()
-    
-    all_issues = []
-    
-    if "gender" in bias_types_list:
-        all_issues.extend(detect_gender_bias(doc, text_lower))
-    
-    if "race" in bias_types_list:
-        all_issues.extend(detect_race_bias(text_lower))
-    
-    if "age" in bias_types_list:
-        all_issues.extend(detect_age_bias(text_lower))
-    
-    if "disability" in bias_types_list:
-        all_issues.extend(detect_disability_bias(text_lower))
-    
-    if "culture" in bias_types_list:
-        all_issues.extend(detect_cultural_bias(text_lower))
-    
-    if "political" in bias_types_list:
-        all_issues.extend(detect_political_bias(text_lower))
-    
-    if "religion" in bias_types_list:
-        all_issues.extend(detect_religion_bias(text_lower))
-    
-    if "lgbtq" in bias_types_list:
-        all_issues.extend(detect_lgbtq_bias(text_lower))
-    
-    if "socioeconomic" in bias_types_list:
-        all_issues.extend(detect_socioeconomic_bias(text_lower))
-    
-    if "intersectional" in bias_types_list and len(all_issues) > 1:
-        all_issues.extend(detect_intersectional_bias(all_issues))
+# Characters of an upload scanned without stream=true; extraction stops once it has this many
+UPLOAD_SCAN_CHARS = int(os.environ.get("BIASRADAR_UPLOAD_SCAN_CHARS", 10000))
+
+def upload_pages(upload, file_ext: str):
+    """
+    (page_number, text) pages of an upload, extracted in parallel page
+    ranges on the worker pool when EXTRACTION_WORKERS > 1. Consume from a
+    thread, not the event loop: it blocks on the pool.
+    """
+    if batch_pool is not None and EXTRACTION_WORKERS > 1:
+        return iter_parallel_pages(batch_pool, upload, file_ext, EXTRACTION_WORKERS)
+    return iter_upload_pages(upload, file_ext)
+
+def scan_upload_text(extracted_text: str, bias_types_list: List[str], filename: str) -> UploadScanResponse:
+    """Run bias detection on extracted upload text; runs on the worker pool"""
+    all_issues = collect_issues(extracted_text.lower(), bias_types_list)
     
     score = calculate_bias_score(all_issues)
     severity = get_severity_label(score)
@@ -840,6 +1392,95 @@ async def upload_and_scan(
         extracted_text=extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text  # Return first 500 chars for preview
     )
 
+@app.post("/upload-and-scan", response_model=UploadScanResponse)
+async def upload_and_scan(
+    file: UploadFile = File(...),
+    bias_types: str = Form(default='["gender","race","age","disability","culture","political","religion","lgbtq","socioeconomic","intersectional"]'),
+    stream: bool = Form(default=False)
+):
+    """
+    Upload a file (PDF, DOC, DOCX, TXT) and scan it for biases. Without
+    stream, only the first UPLOAD_SCAN_CHARS characters are extracted and
+    scanned. With stream=true every page is extracted and scanned as it
+    is produced, and issues stream back as NDJSON; issues in a PDF carry
+    their 1-based page number, and PDFs are extracted in parallel page
+    ranges (see extraction.iter_parallel_pages). DOCX files are read one
+    paragraph at a time either way. Files over UPLOAD_MAX_BYTES are
+    refused while they are still arriving (see BodySizeLimit).
+    """
+    
+    # Get file extension
+    filename = file.filename or "unknown"
+    file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
+    
+    if file_ext not in UPLOAD_FILE_TYPES:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported file type: {file_ext}. Please upload PDF, DOC, DOCX, or TXT files."
+        )
+    
+    # Starlette has already spooled the file (to disk past 1MB) while parsing
+    # the form, within the BodySizeLimit cap on the whole body. The parsers
+    # read that file in place; only the file's own size is checked here.
+    # FastAPI closes it once the response, streamed or not, has been sent
+    loop = asyncio.get_running_loop()
+    upload = file.file
+    file_size = upload_size(upload)
+    if file_size > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=upload_too_large_detail(file_size))
+    
+    # Parse bias_types from JSON string
+    try:
+        bias_types_list = json.loads(bias_types)
+    except:
+        bias_types_list = ["gender", "race", "age", "disability", "culture", "political", "religion", "lgbtq", "socioeconomic", "intersectional"]
+    
+    no_text_detail = "No text could be extracted from the file. Please ensure the file contains readable text."
+    
+    if stream:
+        # Pages are extracted one at a time while the response streams; read
+        # up to the first page with text here so bad files still get a 400
+        pages = upload_pages(upload, file_ext)
+        try:
+            first_pages = await loop.run_in_executor(None, read_until_text, pages)
+        except Exception as e:
+            pages.close()
+            raise HTTPException(status_code=400, detail=f"Error extracting text from file: {str(e)}")
+        if not any(text.strip() for _, text in first_pages):
+            pages.close()
+            raise HTTPException(status_code=400, detail=no_text_detail)
+        
+        page_starts: List[int] = []
+        page_numbers: List[int] = []
+        chunks = iter_page_chunks(itertools.chain(first_pages, pages), page_starts, page_numbers)
+        
+        def page_of(position: int) -> Optional[int]:
+            index = bisect.bisect_right(page_starts, position) - 1
+            return page_numbers[index] if index >= 0 else None
+        
+        return stream_scan_response(chunks, bias_types_list, use_sse=False, page_of=page_of)
+    
+    # Extract text based on file type, off the event loop, stopping once
+    # there is more than will be scanned. This reads the upload in a thread:
+    # an open file cannot be handed to the worker pool, and the cutoff
+    # keeps extraction to the first page or two
+    try:
+        extracted_text = await loop.run_in_executor(None, extract_upload_text, upload, file_ext, UPLOAD_SCAN_CHARS)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error extracting text from file: {str(e)}")
+    
+    # Check if we extracted any text
+    if not extracted_text or len(extracted_text.strip()) == 0:
+        raise HTTPException(status_code=400, detail=no_text_detail)
+    
+    # Truncate to the scan budget if needed
+    if len(extracted_text) > UPLOAD_SCAN_CHARS:
+        extracted_text = extracted_text[:UPLOAD_SCAN_CHARS] + "..."
+    
+    return await run_cpu_bound(scan_upload_text, extracted_text, bias_types_list, filename)
+
+IMPORT_MS = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,18 +1,8 @@
 # Shared bias detection logic for BiasRadar
-import spacy
+# Pure-Python: no detector needs syntax, so no spaCy model is loaded
 import re
 from typing import List, Dict, Any
 
-# Load spaCy model (must be pre-installed for serverless deployment)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    raise RuntimeError(
-        "spaCy model 'en_core_web_sm' not found. "
-        "For Vercel deployment, add 'en-core-web-sm @ https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl' "
-        "to requirements.txt"
-    )
-
 # Bias word dictionaries
 GENDER_BIAS_WORDS = {
     "male": ["aggressive", "dominant", "assertive", "competitive", "ambitious", "decisive", 
@@ -102,6 +92,34 @@ IDEOLOGICAL_NEUTRALITY_WORDS = {
 }
 
 
+GENDERED_PRONOUNS = {"he": "male", "she": "female", "his": "male", "her": "female",
+                     "him": "male", "himself": "male", "herself": "female"}
+# Whole-word matches; contractions like "he's" count as "he", as spaCy tokenizes them
+PRONOUN_RE = re.compile(r'\b(?:' + '|'.join(GENDERED_PRONOUNS) + r')\b')
+
+
+def count_gendered_pronouns(text_lower: str) -> Dict[str, int]:
+    """Count male and female pronouns without a tokenizer model"""
+    pronoun_count = {"male": 0, "female": 0}
+    for match in PRONOUN_RE.finditer(text_lower):
+        pronoun_count[GENDERED_PRONOUNS[match.group()]] += 1
+    return pronoun_count
+
+
+def detect_pronoun_imbalance(pronoun_count: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Flag text whose gendered pronouns are more than 70% one gender"""
+    total_pronouns = sum(pronoun_count.values())
+    if total_pronouns > 3 and max(pronoun_count.values()) / total_pronouns > 0.7:
+        return [{
+            "word": "pronoun imbalance",
+            "bias_type": "gender",
+            "severity": "medium",
+            "explanation": f"Pronoun usage is heavily skewed ({pronoun_count}), which may indicate gender bias",
+            "position": 0
+        }]
+    return []
+
+
 def find_word_in_text(text_lower: str, word: str) -> int:
     """Find position of word in text"""
     pattern = r'\b' + re.escape(word.lower()) + r'\b'
@@ -109,7 +127,7 @@ def find_word_in_text(text_lower: str, word: str) -> int:
     return match.start() if match else -1
 
 
-def detect_gender_bias(doc, text_lower: str) -> List[Dict[str, Any]]:
+def detect_gender_bias(text_lower: str) -> List[Dict[str, Any]]:
     """Detect gender bias in text"""
     issues = []
     for category, words in GENDER_BIAS_WORDS.items():
@@ -123,6 +141,7 @@ def detect_gender_bias(doc, text_lower: str) -> List[Dict[str, Any]]:
                     "explanation": f"'{word}' may reinforce gender stereotypes associated with {category} traits",
                     "position": pos
                 })
+    issues.extend(detect_pronoun_imbalance(count_gendered_pronouns(text_lower)))
     return issues
 
 
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmark on generated fixtures, checking both sides produce
+identical text:
+  - PDF: serial vs parallel page-range extraction
+  - DOCX: a python-docx Document vs the streaming extractor, with the
+    peak memory each needs to parse the document
+
+    python tests/bench_extraction.py [--pages 50 100 300] [--workers 4] [--min-speedup 0]
+
+Needs PyPDF2; python-docx is only needed for the DOCX comparison.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from extraction import extract_upload_text, iter_docx_paragraphs, iter_parallel_pages, join_pages
+
+LINES = [
+    "We are hiring a senior engineer to join our payments platform team.",
+    "The chairman expects young, energetic salesmen who are digital natives.",
+    "You will own services end to end, from design reviews to on-call.",
+    "Our guys work hard and play hard; the culture is fast and competitive.",
+    "Benefits include health cover, a learning budget and flexible hours.",
+]
+LINES_PER_PAGE = 45
+
+
+def page_lines(page):
+    return [f"Page {page + 1}, line {i + 1}: {LINES[(page + i) % len(LINES)]}" for i in range(LINES_PER_PAGE)]
+
+
+def make_pdf(pages):
+    """A plain PDF with one Helvetica text stream per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        text = " T* ".join(f"({line})Tj" for line in page_lines(page))
+        stream = f"BT /F1 9 Tf 11 TL 40 800 Td {text} ET".encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(pages):
+    """A minimal DOCX with LINES_PER_PAGE paragraphs per 'page'"""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for page in range(pages) for line in page_lines(page)
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml",
+                      '<?xml version="1.0" encoding="UTF-8"?>'
+                      '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                      '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                      '<Default Extension="xml" ContentType="application/xml"/>'
+                      '<Override PartName="/word/document.xml" ContentType="application/'
+                      'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+        docx.writestr("_rels/.rels",
+                      '<?xml version="1.0" encoding="UTF-8"?>'
+                      '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                      '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                      'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+        docx.writestr("word/document.xml",
+                      '<?xml version="1.0" encoding="UTF-8"?>'
+                      '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                      f'<w:body>{paragraphs}</w:body></w:document>')
+    return out.getvalue()
+
+
+def python_docx_text(contents):
+    from docx import Document
+    return '\n'.join(paragraph.text for paragraph in Document(io.BytesIO(contents)).paragraphs)
+
+
+def parallel_pdf_text(pool, workers):
+    return lambda contents: join_pages(iter_parallel_pages(pool, contents, "pdf", workers))
+
+
+def streaming_docx_text(contents):
+    return extract_upload_text(contents, "docx")
+
+
+def best_of(runs, func):
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def peak_memory(parse, contents):
+    """Peak traced memory while parsing, not counting the extracted text"""
+    tracemalloc.start()
+    try:
+        parse(contents)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def parse_python_docx(contents):
+    from docx import Document
+    Document(io.BytesIO(contents))
+
+
+def parse_streaming_docx(contents):
+    for _ in iter_docx_paragraphs(io.BytesIO(contents)):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 100, 300])
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=0.0,
+                        help="fail if either comparison is not this many times faster on the largest fixture")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"EXTRACTION BENCHMARK ({args.workers} workers, {os.cpu_count()} CPUs)")
+    print("=" * 80)
+
+    failures = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Start every worker before timing anything
+        list(pool.map(abs, range(args.workers * 4)))
+        comparisons = [
+            ("pdf", "PyPDF2", make_pdf, "serial", lambda contents: extract_upload_text(contents, "pdf"),
+             "parallel", parallel_pdf_text(pool, args.workers)),
+            ("docx", "docx", make_docx, "python-docx", python_docx_text, "streaming", streaming_docx_text),
+        ]
+        for file_ext, module, make, before_name, before, after_name, after in comparisons:
+            try:
+                __import__(module)
+            except ImportError:
+                print(f"{file_ext}: skipped ({module} not installed)")
+                continue
+            print(f"\n{'fixture':<14} {'size':>9} {before_name:>12} {after_name:>12} {'speedup':>8} "
+                  f"{'peak memory':>21}")
+            speedup = None
+            for pages in args.pages:
+                contents = make(pages)
+                before_text, before_time = best_of(args.runs, lambda: before(contents))
+                after_text, after_time = best_of(args.runs, lambda: after(contents))
+                speedup = before_time / after_time
+                memory = ""
+                if file_ext == "docx":
+                    memory = (f"{peak_memory(parse_python_docx, contents) / 1024:7.0f}KB -> "
+                              f"{peak_memory(parse_streaming_docx, contents) / 1024:6.0f}KB")
+                print(f"{f'{file_ext} {pages}p':<14} {len(contents) / 1024:7.0f}KB "
+                      f"{before_time * 1000:10.0f}ms {after_time * 1000:10.0f}ms {speedup:7.2f}x {memory:>21}")
+                if after_text != before_text:
+                    failures.append(f"{file_ext} {pages} pages: {after_name} text differs from {before_name}")
+                if f"Page {pages}, line {LINES_PER_PAGE}:" not in after_text:
+                    failures.append(f"{file_ext} {pages} pages: fixture text was not extracted")
+            if speedup is not None and speedup < args.min_speedup:
+                failures.append(f"{file_ext}: {speedup:.2f}x on {max(args.pages)} pages, expected {args.min_speedup}x")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Faster extraction paths match the reference extraction")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
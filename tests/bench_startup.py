@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import time and resident memory per module, each measured
+in a fresh interpreter, checked against an import-time budget.
+
+    python tests/bench_startup.py [--runs 5] [--budget-scale 1.0]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> import budget in milliseconds (median of fresh-interpreter runs)
+MODULES = {
+    "api/biasradar/_bias_detection.py": 150,
+    "api/biasradar/scan.py": 150,
+    "api/biasradar/scan-stream.py": 150,
+    "api/biasradar/scan-batch.py": 200,
+    "api/biasradar/fix.py": 100,
+    "backend/main.py": 1500,
+}
+
+# Runs in a fresh interpreter: import one file by path, then time a first scan if it has one
+PROBE = r"""
+import importlib.util, json, os, sys, time
+
+def rss_kb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(path))
+before = rss_kb()
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("probe_" + os.path.basename(path)[:-3].replace("-", "_"), path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+result = {"import_ms": (time.perf_counter() - started) * 1000, "rss_kb": rss_kb() - before}
+warmup = getattr(module, "warmup", None)
+if callable(warmup) and not hasattr(module, "app"):
+    started = time.perf_counter()
+    warmup()
+    result["first_scan_ms"] = (time.perf_counter() - started) * 1000
+result["heavy"] = sorted(name for name in ("spacy", "numpy", "openai", "httpx", "PyPDF2", "docx",
+                                           "better_profanity", "sqlite3", "ssl", "asyncio")
+                         if name in sys.modules)
+print(json.dumps(result))
+"""
+
+
+def probe(path):
+    completed = subprocess.run([sys.executable, "-c", PROBE, os.path.join(ROOT, path)],
+                               capture_output=True, text=True, cwd=ROOT)
+    if completed.returncode != 0:
+        last_line = (completed.stderr.strip().splitlines() or ["failed"])[-1]
+        return {"error": last_line}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. on slow CI machines")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("STARTUP BENCHMARK")
+    print("=" * 80)
+    print(f"{'module':<36} {'import':>9} {'budget':>8} {'RSS':>9} {'1st scan':>9}  heavy modules loaded")
+
+    failures = []
+    for path, budget_ms in MODULES.items():
+        runs = [probe(path) for _ in range(args.runs)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            print(f"{path:<36} {'skipped':>9}  ({errors[0]})")
+            continue
+        import_ms = median([run["import_ms"] for run in runs])
+        rss_mb = median([run["rss_kb"] for run in runs]) / 1024
+        first_scan = [run["first_scan_ms"] for run in runs if "first_scan_ms" in run]
+        budget_ms *= args.budget_scale
+        print(f"{path:<36} {import_ms:7.1f}ms {budget_ms:6.0f}ms {rss_mb:7.1f}MB "
+              f"{(f'{median(first_scan):7.1f}ms' if first_scan else ''):>9}  {', '.join(runs[0]['heavy']) or '-'}")
+        if import_ms > budget_ms:
+            failures.append(f"{path} imports in {import_ms:.1f}ms, budget {budget_ms:.0f}ms")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ All importable modules within their import budget")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Load test: /scan latency on the FastAPI backend with and without /fix calls in flight.
+
+By default it starts a slow stand-in LLM and the backend (uvicorn) itself:
+
+    python tests/load_test_backend.py
+
+To load an already running backend instead, point it at one whose LLM
+calls are slow, e.g. one using the stand-in:
+
+    python tests/load_test_backend.py --serve-llm 9100 &
+    AI_INTEGRATIONS_OPENAI_API_KEY=test AI_INTEGRATIONS_OPENAI_BASE_URL=http://127.0.0.1:9100/v1 \\
+        uvicorn main:app --app-dir backend --port 8000 &
+    python tests/load_test_backend.py --url http://127.0.0.1:8000
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+SCAN_TEXT = ("The chairman wants young, energetic salesmen who are digital natives. "
+             "Our guys work hard and the elderly staff should consider retiring. ") * 20
+
+
+class SlowLLM(BaseHTTPRequestHandler):
+    """OpenAI-compatible stand-in that takes `latency` seconds per completion"""
+    protocol_version = "HTTP/1.1"
+    latency = 2.0
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.latency)
+        content = json.dumps({"fixed_text": "The chair wants energetic salespeople.",
+                              "improvements": ["Replaced chairman", "Removed age preference"]})
+        if request.get("response_format") is None:
+            content = "The chair wants energetic salespeople."
+        body = json.dumps({
+            "id": "stand-in", "object": "chat.completion", "created": int(time.time()), "model": request["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}]
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_backend(llm_url):
+    """Run the backend under uvicorn against llm_url; returns (process, base_url) once it answers"""
+    port = free_port()
+    env = dict(os.environ, AI_INTEGRATIONS_OPENAI_API_KEY="test", AI_INTEGRATIONS_OPENAI_BASE_URL=llm_url)
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+                                "--port", str(port), "--log-level", "warning"], env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"backend exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/", timeout=1):
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("backend did not start within 60s")
+
+
+def post(url, payload, timeout=120):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                 headers={"Content-Type": "application/json"}, method='POST')
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def scan_latencies(base_url, run, requests, concurrency):
+    # Vary the text by run and request so the scan cache does not answer the requests
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(
+            lambda i: post(f"{base_url}/scan", {"text": f"{SCAN_TEXT} Run {run}, request {i}."}),
+            range(requests)
+        ))
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return statistics.median(ordered), p95
+
+
+def run_load(base_url, args):
+    """(p50, p95) of /scan alone, then with args.fixes /fix calls kept in flight, and the /fix latencies"""
+    # Start the worker pool and the LLM client before timing anything
+    urllib.request.urlopen(f"{base_url}/warmup", timeout=120).read()
+    scan_latencies(base_url, "warm", args.concurrency * 4, args.concurrency)
+    baseline = describe(scan_latencies(base_url, "alone", args.scans, args.concurrency))
+
+    # Keep /fix calls in flight for the whole second run
+    stop = threading.Event()
+    fix_latencies = []
+
+    def keep_fixing():
+        while not stop.is_set():
+            fix_latencies.append(post(f"{base_url}/fix", {"text": SCAN_TEXT[:200]}))
+
+    fixers = [threading.Thread(target=keep_fixing, daemon=True) for _ in range(args.fixes)]
+    for fixer in fixers:
+        fixer.start()
+    time.sleep(0.5)
+    loaded = describe(scan_latencies(base_url, "loaded", args.scans, args.concurrency))
+    stop.set()
+    for fixer in fixers:
+        fixer.join()
+    return baseline, loaded, fix_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="load a running backend instead of starting one")
+    parser.add_argument("--scans", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fixes", type=int, default=16, help="/fix calls kept in flight during the second run")
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="allowed p95 ratio before failing")
+    parser.add_argument("--serve-llm", type=int, metavar="PORT", help="only run the slow stand-in LLM")
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.serve_llm:
+        SlowLLM.latency = args.llm_latency
+        server = ThreadingHTTPServer(("127.0.0.1", args.serve_llm), SlowLLM)
+        print(f"Stand-in LLM on http://127.0.0.1:{args.serve_llm}/v1 ({args.llm_latency}s per call)")
+        server.serve_forever()
+        return
+
+    print("=" * 80)
+    print("BACKEND LOAD TEST: /scan WITH /fix IN FLIGHT")
+    print("=" * 80)
+
+    backend = None
+    base_url = args.url
+    if base_url is None:
+        SlowLLM.latency = args.llm_latency
+        llm = ThreadingHTTPServer(("127.0.0.1", 0), SlowLLM)
+        llm.daemon_threads = True
+        threading.Thread(target=llm.serve_forever, daemon=True).start()
+        backend, base_url = start_backend(f"http://127.0.0.1:{llm.server_address[1]}/v1")
+        print(f"Backend {base_url}, stand-in LLM {args.llm_latency}s per call, {os.cpu_count()} CPUs")
+    try:
+        baseline, loaded, fix_latencies = run_load(base_url, args)
+    finally:
+        if backend is not None:
+            backend.terminate()
+            backend.wait()
+
+    print(f"/scan alone:         p50 {baseline[0] * 1000:7.1f}ms  p95 {baseline[1] * 1000:7.1f}ms")
+    print(f"/scan with {args.fixes} /fix: p50 {loaded[0] * 1000:7.1f}ms  p95 {loaded[1] * 1000:7.1f}ms")
+    print(f"/fix calls completed: {len(fix_latencies)}, median {statistics.median(fix_latencies):.2f}s")
+
+    ratio = loaded[1] / baseline[1]
+    print()
+    if ratio > args.max_slowdown:
+        print(f"❌ /scan p95 slowed {ratio:.2f}x while /fix calls were in flight")
+        sys.exit(1)
+    print(f"✅ /scan p95 ratio {ratio:.2f}x with /fix calls in flight")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
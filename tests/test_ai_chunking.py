@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test chunked, concurrent LLM validation: exact offsets, bounded parallelism, dedup"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, 'api/biasradar')
+
+print("=" * 80)
+print("CHUNKED AI VALIDATION TEST")
+print("=" * 80)
+
+failures = []
+CALL_LATENCY = 0.1
+stand_in = {"chunks": [], "in_flight": 0, "max_in_flight": 0, "lock": threading.Lock()}
+
+
+class StandInLLM(BaseHTTPRequestHandler):
+    """Reports every "rockstar" and "crazy" in the prompt text, once per occurrence, plus a made-up phrase"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = request["messages"][0]["content"]
+        chunk = prompt.split('Text to analyze:\n"', 1)[1].rsplit('"\n\nReturn ONLY', 1)[0]
+        with stand_in["lock"]:
+            stand_in["chunks"].append(chunk)
+            stand_in["in_flight"] += 1
+            stand_in["max_in_flight"] = max(stand_in["max_in_flight"], stand_in["in_flight"])
+        time.sleep(CALL_LATENCY)
+        biases = [
+            {"word": match.group().capitalize(), "bias_type": "culture", "severity": "low", "explanation": "jargon"}
+            for match in re.finditer(r"\b(?:rockstar|crazy)\b", chunk.lower())
+        ]
+        # A hallucinated phrase that is nowhere in the chunk
+        biases.append({"word": "Ninja", "bias_type": "culture", "severity": "low", "explanation": "jargon"})
+        with stand_in["lock"]:
+            stand_in["in_flight"] -= 1
+        body = json.dumps({"choices": [{"message": {"content": json.dumps({"biases": biases})}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+llm = ThreadingHTTPServer(("127.0.0.1", 0), StandInLLM)
+llm.daemon_threads = True
+threading.Thread(target=llm.serve_forever, daemon=True).start()
+os.environ["OPENAI_API_KEY"] = "test"
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+os.environ["BIASRADAR_LLM_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "validation.sqlite3")
+os.environ["BIASRADAR_AI_CHUNK_CHARS"] = "1000"
+os.environ["BIASRADAR_AI_MAX_PARALLEL"] = "3"
+
+from _bias_detection import AI_MAX_PARALLEL, hybrid_detect_bias, validate_with_openai
+
+sentences = [
+    "Our platform team ships reliable services every week.",
+    "We want a rockstar who thrives under pressure.",
+    "The onboarding plan covers tooling, reviews and on-call.",
+    "Deadlines can get crazy near launches, and a rockstar stays calm.",
+    "Everyone pairs with a mentor during the first month.",
+]
+# Numbered so no two chunks are identical (identical chunks share a cache entry)
+text = " ".join(f"Item {i}: {sentences[i % len(sentences)]}" for i in range(120))
+expected = [match.start() for match in re.finditer(r"\b(?:rockstar|crazy)\b", text.lower())]
+
+started = time.perf_counter()
+findings = validate_with_openai(text, enable_ai=True)
+elapsed = time.perf_counter() - started
+chunks = stand_in["chunks"]
+print(f"{len(text):,} chars -> {len(chunks)} chunks, {elapsed * 1000:.0f}ms, "
+      f"max {stand_in['max_in_flight']} in flight (limit {AI_MAX_PARALLEL})")
+
+# Chunks (received in any order) tile the text, stay under the size limit and end on sentence boundaries
+if "".join(sorted(chunks, key=text.index)) != text:
+    failures.append("Chunks do not reassemble into the original text")
+if any(len(chunk) > 1000 for chunk in chunks):
+    failures.append("A chunk exceeds BIASRADAR_AI_CHUNK_CHARS")
+if any(not chunk.rstrip().endswith(".") for chunk in chunks):
+    failures.append("A chunk does not end at a sentence boundary")
+
+# Bounded, but real, parallelism
+if not 1 < stand_in["max_in_flight"] <= AI_MAX_PARALLEL:
+    failures.append(f"{stand_in['max_in_flight']} calls in flight, limit {AI_MAX_PARALLEL}")
+if elapsed > len(chunks) * CALL_LATENCY * 0.75:
+    failures.append(f"Chunks do not appear to run concurrently ({elapsed:.2f}s)")
+
+# Every occurrence maps to its exact document offset, not the first match
+positions = sorted(finding["position"] for finding in findings)
+if positions != expected:
+    failures.append(f"{len(positions)} findings at wrong offsets, expected {len(expected)}")
+if any(not text.lower().startswith(finding["word"].lower(), finding["position"]) for finding in findings):
+    failures.append("A finding's position does not point at its phrase")
+if any(finding["word"] == "Ninja" for finding in findings):
+    failures.append("A phrase that is not in the text was kept")
+
+# Replay from the per-chunk cache without calls
+calls = len(stand_in["chunks"])
+replayed = validate_with_openai(text, enable_ai=True)
+if len(stand_in["chunks"]) != calls or replayed != findings:
+    failures.append("Second validation did not replay from the cache")
+
+# Merged into hybrid results: rule-based "crazy" wins, each rockstar is added once
+result = hybrid_detect_bias(text, enable_ai=True, all_occurrences=True, max_occurrences_per_term=None)
+by_span = {}
+for issue in result["issues"]:
+    if issue["bias_type"] != "intersectional":
+        key = (issue["position"], issue["word"].lower())
+        by_span[key] = by_span.get(key, 0) + 1
+if any(count > 1 for count in by_span.values()):
+    failures.append("Duplicate issues at the same offset")
+rockstars = [i for i in result["issues"] if i["word"].lower() == "rockstar"]
+crazies = [i for i in result["issues"] if i["word"].lower() == "crazy"]
+if len(rockstars) != text.lower().count("rockstar"):
+    failures.append(f"{len(rockstars)} rockstar issues, expected one per occurrence")
+if any(issue.get("explanation") == "jargon" for issue in crazies):
+    failures.append("AI finding duplicated a rule-based match")
+if any(issue["word"] == "Ninja" for issue in result["issues"]):
+    failures.append("A phrase that is not in the text reached the hybrid result")
+first_only = hybrid_detect_bias(text, enable_ai=True)
+if len([i for i in first_only["issues"] if i["word"].lower() == "rockstar"]) != 1:
+    failures.append("First-occurrence mode should add one rockstar")
+
+llm.shutdown()
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Long texts validate in concurrent chunks with exact offsets")
+sys.exit(0)
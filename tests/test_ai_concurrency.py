@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Test that AI validation overlaps rule detection and respects the latency budget"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, 'api/biasradar')
+
+print("=" * 80)
+print("CONCURRENT AI VALIDATION TEST")
+print("=" * 80)
+
+failures = []
+stand_in = {"latency": 0.1, "prompts": [], "status": 200}
+
+
+class StandInLLM(BaseHTTPRequestHandler):
+    """Flags every "energetic" after a fixed delay, or fails with stand_in["status"]"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = request["messages"][0]["content"]
+        stand_in["prompts"].append(prompt)
+        time.sleep(stand_in["latency"])
+        if stand_in["status"] != 200:
+            body = b'{"error": {"message": "unavailable"}}'
+            self.send_response(stand_in["status"])
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        biases = [{"word": "energetic", "bias_type": "age", "severity": "medium", "explanation": "coded"}
+                  for _ in range(prompt.lower().count("energetic"))]
+        body = json.dumps({"choices": [{"message": {"content": json.dumps({"biases": biases})}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+llm = ThreadingHTTPServer(("127.0.0.1", 0), StandInLLM)
+llm.daemon_threads = True
+threading.Thread(target=llm.serve_forever, daemon=True).start()
+os.environ["OPENAI_API_KEY"] = "test"
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+os.environ["BIASRADAR_LLM_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "validation.sqlite3")
+os.environ["BIASRADAR_AI_BACKGROUND_WORKERS"] = "1"
+
+from _bias_detection import (SCAN_CACHE, analyze_text, cached_hybrid_detect_bias, detect_rule_based_issues,
+                             find_eeo_paragraphs, hybrid_detect_bias, scan_cache_key, select_ai_spans,
+                             validate_with_openai)
+
+SENTENCE = ("The chairman wants young, energetic salesmen who are digital natives. "
+            "Our guys work hard and the elderly staff should consider retiring.")
+
+
+def document(seed, copies=300):
+    # Numbered so each document misses the LLM and scan caches
+    return " ".join(f"{seed}-{i}: {SENTENCE}" for i in range(copies))
+
+
+def timed(run):
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+# Make the LLM about as slow as the rules, the case where overlap matters most
+COPIES = 900
+hybrid_detect_bias(document("warm", COPIES), all_occurrences=True)
+analyzed = analyze_text(document("rules", COPIES), all_occurrences=True)
+_, detectors_time = timed(lambda: detect_rule_based_issues(analyzed))
+stand_in["latency"] = max(0.1, detectors_time)
+
+# Sequential cost: rules, then picking the sentences and validating them
+sequential, concurrent = [], []
+for run in range(5):
+    text = document(f"seq{run}", COPIES)
+    analyzed = analyze_text(text, all_occurrences=True)
+    _, rules_only = timed(lambda: hybrid_detect_bias(text, all_occurrences=True))
+    _, ai_only = timed(lambda: validate_with_openai(
+        text, enable_ai=True, spans=select_ai_spans(analyzed, find_eeo_paragraphs(analyzed))
+    ))
+    sequential.append(rules_only + ai_only)
+    result, elapsed = timed(lambda: hybrid_detect_bias(document(f"conc{run}", COPIES),
+                                                       enable_ai=True, all_occurrences=True))
+    concurrent.append(elapsed)
+sequential_ms = sorted(sequential)[2] * 1000
+concurrent_ms = sorted(concurrent)[2] * 1000
+detectors_ms = detectors_time * 1000
+print(f"Rule detectors {detectors_ms:.0f}ms, LLM {stand_in['latency'] * 1000:.0f}ms per call")
+print(f"Rules then AI: {sequential_ms:.0f}ms   overlapped: {concurrent_ms:.0f}ms   "
+      f"saved {sequential_ms - concurrent_ms:.0f}ms")
+
+# Overlap can save at most the detectors' time; segmentation and scoring stay serial
+if sequential_ms - concurrent_ms < detectors_ms * 0.5:
+    failures.append(f"AI and rules do not overlap ({concurrent_ms:.0f}ms vs {sequential_ms:.0f}ms)")
+if result.get("ai_status") != "complete" or result["detection_method"] != "hybrid":
+    failures.append(f"Overlapped scan finished as {result.get('ai_status')}")
+if not any(issue["explanation"] == "coded" for issue in result["issues"]):
+    failures.append("AI findings were not merged")
+
+# A slow LLM: the rule result comes back on budget, the call keeps warming the LLM cache
+stand_in["latency"] = 0.6
+text = document("slow", copies=20)
+result, elapsed = timed(lambda: cached_hybrid_detect_bias(text, enable_ai=True, ai_latency_budget=0.1))
+print(f"Slow LLM, 100ms budget: answered in {elapsed * 1000:.0f}ms as {result.get('ai_status')}")
+if result.get("ai_status") != "ai_pending" or elapsed > 0.4:
+    failures.append(f"Expected a prompt ai_pending result, got {result.get('ai_status')} after {elapsed:.2f}s")
+if result["detection_method"] != "manual_with_patterns" or not result["issues"]:
+    failures.append("Pending result should carry the rule-based findings")
+if SCAN_CACHE.get(scan_cache_key(text, enable_ai=True)) is not None:
+    failures.append("A pending result was cached")
+time.sleep(stand_in["latency"] + 0.2)
+retry, elapsed = timed(lambda: cached_hybrid_detect_bias(text, enable_ai=True, ai_latency_budget=0.1))
+print(f"Retry after the call landed: {elapsed * 1000:.0f}ms as {retry.get('ai_status')}")
+if retry.get("ai_status") != "complete":
+    failures.append(f"Retry did not pick up the cached AI findings ({retry.get('ai_status')})")
+
+# The only background worker is busy: a queued validation is cancelled, never sent
+busy_text = document("busy", copies=20)
+queued_text = document("queued", copies=20)
+busy = threading.Thread(target=lambda: hybrid_detect_bias(busy_text, enable_ai=True))
+busy.start()
+time.sleep(0.1)
+result = hybrid_detect_bias(queued_text, enable_ai=True, ai_latency_budget=0.1)
+busy.join()
+time.sleep(0.1)
+print(f"Queued behind a busy worker: {result.get('ai_status')}")
+if result.get("ai_status") != "ai_timeout":
+    failures.append(f"Queued validation finished as {result.get('ai_status')}, expected ai_timeout")
+if any("queued-0:" in prompt for prompt in stand_in["prompts"]):
+    failures.append("A cancelled validation still reached the LLM")
+
+# A failing LLM: the scan says so, keeps the rule findings, and is not cached
+stand_in["latency"] = 0.01
+stand_in["status"] = 500
+text = document("failing", copies=20)
+result = cached_hybrid_detect_bias(text, enable_ai=True)
+print(f"LLM answering 500: {result.get('ai_status')} via {result['detection_method']}")
+if result.get("ai_status") != "ai_error" or result["detection_method"] != "manual_with_patterns":
+    failures.append(f"Failed validation finished as {result.get('ai_status')} via {result['detection_method']}")
+if not result["issues"]:
+    failures.append("Failed validation should still carry the rule-based findings")
+if SCAN_CACHE.get(scan_cache_key(text, enable_ai=True)) is not None:
+    failures.append("A result whose AI validation failed was cached")
+stand_in["status"] = 200
+retry = cached_hybrid_detect_bias(text, enable_ai=True)
+if retry.get("ai_status") != "complete":
+    failures.append(f"Retry once the LLM recovered finished as {retry.get('ai_status')}")
+
+llm.shutdown()
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ AI validation overlaps rule detection within its latency budget")
+sys.exit(0)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Test selective AI escalation: only uncertain sentences reach the LLM, within a token budget"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, 'api/biasradar')
+
+print("=" * 80)
+print("SELECTIVE AI ESCALATION TEST")
+print("=" * 80)
+
+failures = []
+CALL_LATENCY = 0.05
+REPORTED_PHRASES = ["single mothers", "outdated traditions", "strong", "culture fit", "patriotic citizens"]
+stand_in = {"calls": 0, "prompt_chars": 0, "chunks": [], "lock": threading.Lock()}
+
+
+class StandInLLM(BaseHTTPRequestHandler):
+    """Reports every REPORTED_PHRASES occurrence in the prompt text"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = request["messages"][0]["content"]
+        chunk = prompt.split('Text to analyze:\n"', 1)[1].rsplit('"\n\nReturn ONLY', 1)[0]
+        with stand_in["lock"]:
+            stand_in["calls"] += 1
+            stand_in["prompt_chars"] += len(prompt)
+            stand_in["chunks"].append(chunk)
+        time.sleep(CALL_LATENCY)
+        biases = [
+            {"word": match.group(), "bias_type": "subtle", "severity": "medium", "explanation": "coded"}
+            for match in re.finditer("|".join(REPORTED_PHRASES), chunk.lower())
+        ]
+        body = json.dumps({"choices": [{"message": {"content": json.dumps({"biases": biases})}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+llm = ThreadingHTTPServer(("127.0.0.1", 0), StandInLLM)
+llm.daemon_threads = True
+threading.Thread(target=llm.serve_forever, daemon=True).start()
+os.environ["OPENAI_API_KEY"] = "test"
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+os.environ["BIASRADAR_LLM_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "validation.sqlite3")
+
+from _bias_detection import AI_TOKEN_BUDGET, analyze_text, hybrid_detect_bias, select_ai_spans, validate_with_openai
+
+# From tests/test_subtle_bias.py: coded language the LLM should get to see
+SUBTLE_TEXT = ("Older low-income transgender single mothers and disabled veterans on public assistance "
+               "are undocumented residents who exaggerate health conditions, follow non-mainstream faiths, "
+               "and share emotionally charged social-media posts while patriotic citizens support border "
+               "security against outdated traditions.")
+NEUTRAL = [
+    "The service ingests events from the queue and writes them to the warehouse.",
+    "Each release is tested in staging before it reaches production.",
+    "Dashboards show latency, error rates and saturation for every region.",
+    "The on-call rotation is shared across the platform group.",
+]
+UNCERTAIN = [
+    "We need strong performance on the latency metrics.",     # whitelisted "strong"
+    "Candidates should be a real culture fit for the group.",  # trigger
+]
+
+
+def measure(run):
+    stand_in.update(calls=0, prompt_chars=0, chunks=[])
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started, stand_in["calls"], stand_in["prompt_chars"]
+
+
+def document(seed):
+    # Numbered so each run misses the per-chunk LLM cache
+    sentences = [f"{seed}.{i}: {NEUTRAL[i % len(NEUTRAL)]}" for i in range(80)]
+    sentences[20] = f"{seed}.20: {UNCERTAIN[0]}"
+    sentences[50] = f"{seed}.50: {UNCERTAIN[1]}"
+    sentences.insert(65, SUBTLE_TEXT)
+    return " ".join(sentences)
+
+
+# Whole-text validation vs the escalation policy on the same kind of document
+_, full_time, full_calls, full_chars = measure(lambda: validate_with_openai(document("a"), enable_ai=True))
+text = document("b")
+result, escalated_time, escalated_calls, escalated_chars = measure(
+    lambda: hybrid_detect_bias(text, enable_ai=True)
+)
+print(f"Whole text:  {full_calls} calls, {full_chars:,} prompt chars, {full_time * 1000:.0f}ms")
+print(f"Escalated:   {escalated_calls} calls, {escalated_chars:,} prompt chars, {escalated_time * 1000:.0f}ms")
+print(f"Sentences sent: {len(result['ai_spans'])}")
+
+if escalated_chars * 3 > full_chars:
+    failures.append(f"Escalation sent {escalated_chars} of {full_chars} prompt chars")
+spans = [tuple(span) for span in result["ai_spans"]]
+sent = " ".join(text[start:end] for start, end in spans)
+for expected in [SUBTLE_TEXT, UNCERTAIN[0], UNCERTAIN[1]]:
+    if expected not in sent:
+        failures.append(f"Not escalated: {expected[:40]!r}...")
+if any("warehouse" in text[start:end] for start, end in spans):
+    failures.append("A neutral sentence was escalated")
+
+# The LLM's findings in the escalated sentences land at their document offsets
+ai_words = {(issue["word"], issue["position"]) for issue in result["issues"] if issue["bias_type"] == "subtle"}
+for phrase in ["single mothers", "patriotic citizens", "culture fit", "strong"]:
+    if (phrase, text.lower().index(phrase)) not in ai_words:
+        failures.append(f"AI finding {phrase!r} missing or misplaced")
+# A phrase the rules already flag keeps its rule-based issue
+if any(issue["word"] == "outdated traditions" for issue in result["issues"]):
+    failures.append("AI finding duplicated the rule-based 'outdated'")
+if not any(issue["word"] == "undocumented residents" for issue in result["issues"]):
+    failures.append("Rule-based findings were lost")
+
+# Budgets: nothing at zero, never more text than the budget allows
+analyzed = analyze_text(text)
+if select_ai_spans(analyzed, [], 0):
+    failures.append("A zero budget still selected spans")
+for budget in [20, 60, AI_TOKEN_BUDGET]:
+    chars = sum(end - start for start, end in select_ai_spans(analyzed, [], budget))
+    if chars > budget * 4:
+        failures.append(f"Budget {budget} tokens: {chars} chars selected")
+small = select_ai_spans(analyzed, [], 60)
+if not any(text[start:end].endswith(UNCERTAIN[0]) for start, end in small):
+    failures.append(f"A small budget should keep the highest-ranked sentence, got {small}")
+_, _, calls, _ = measure(lambda: hybrid_detect_bias(document("c"), enable_ai=True, ai_token_budget=0))
+if calls:
+    failures.append("ai_token_budget=0 still called the LLM")
+
+# Nothing uncertain, nothing sent
+_, _, calls, _ = measure(lambda: hybrid_detect_bias(" ".join(NEUTRAL) + " Plain text.", enable_ai=True))
+if calls:
+    failures.append(f"A neutral document made {calls} LLM calls")
+
+# Each trigger family escalates on its own, on text unrelated to tests/test_subtle_bias.py;
+# technical prose that only shares a spelling with a trigger does not
+FAMILY_SENTENCES = [
+    "We would rather not hire retirees for this team.",                      # age
+    "Tell us about your childcare arrangements before the interview.",        # family status
+    "Applicants with a heavy accent may struggle on client calls.",          # national origin
+    "The panel noted the candidate's complexion in the feedback form.",       # race and color
+    "Staff are expected to share the founder's faith.",                       # religion
+    "Anyone with a history of mental illness should not apply.",              # disability
+    "We ask every candidate about their lifestyle outside work.",             # orientation, identity
+    "Preference goes to applicants without military service.",               # veteran status
+    "The hiring manager wants a ninja who never logs off.",                   # culture fit
+    "Applicants from a good zip code tend to do well here.",                  # class proxies
+    "We look for ordinary people who share our values.",                      # in-group framing
+    "She came across as shrill during the review.",                           # emotional framing
+]
+TECHNICAL = ("The background worker retries failed jobs. A race condition in the cache was fixed. "
+             "Set the border radius to four pixels in the theme. Fresh builds are cached for an hour. "
+             "Senior engineers review every schema migration before it ships.")
+family_text = " ".join(f"{TECHNICAL} {sentence}" for sentence in FAMILY_SENTENCES)
+family_spans = select_ai_spans(analyze_text(family_text), [])
+escalated = [family_text[start:end] for start, end in family_spans]
+print(f"Trigger families: {len(family_spans)} of {len(FAMILY_SENTENCES)} family sentences escalated")
+for sentence in FAMILY_SENTENCES:
+    if not any(sentence in span for span in escalated):
+        failures.append(f"Trigger sentence not escalated: {sentence!r}")
+if any(technical in span for span in escalated for technical in TECHNICAL.split(". ")):
+    failures.append("A technical sentence was escalated")
+if select_ai_spans(analyze_text(TECHNICAL), []):
+    failures.append("Technical prose with trigger look-alikes was escalated")
+
+# EEO paragraphs never reach the LLM
+eeo = "We are an equal opportunity employer. Veterans and disabled applicants are encouraged to apply."
+measure(lambda: hybrid_detect_bias(f"{UNCERTAIN[1]}\n\n{eeo}", enable_ai=True))
+if any("equal opportunity" in chunk or "Veterans" in chunk for chunk in stand_in["chunks"]):
+    failures.append("An EEO paragraph was sent to the LLM")
+
+llm.shutdown()
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Only uncertain sentences are escalated, within the token budget")
+sys.exit(0)
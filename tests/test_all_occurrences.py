@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Test all-occurrences mode: every hit reported, counted and capped"""
+
+import sys
+sys.path.insert(0, 'api/biasradar')
+
+from _bias_detection import hybrid_detect_bias
+
+test_text = " ".join(["Our guys are the best."] * 12) + " The chairman agrees. Ask the chairman."
+
+print("=" * 80)
+print("ALL-OCCURRENCES TEST")
+print("=" * 80)
+
+failures = []
+
+first_only = hybrid_detect_bias(test_text)
+guys_first = [i for i in first_only["issues"] if i["word"] == "guys"]
+print(f"\nDefault mode: {len(guys_first)} 'guys' issue(s)")
+if len(guys_first) != 1 or "occurrences" in guys_first[0]:
+    failures.append("default mode should report the first occurrence only")
+
+every = hybrid_detect_bias(test_text, all_occurrences=True, max_occurrences_per_term=None)
+guys_every = [i for i in every["issues"] if i["word"] == "guys"]
+positions = [i["position"] for i in guys_every]
+expected = [i for i in range(len(test_text)) if test_text.startswith("guys", i)]
+print(f"All-occurrences mode: {len(guys_every)} 'guys' issue(s) at {positions}")
+if positions != expected:
+    failures.append(f"expected positions {expected}, got {positions}")
+if any(i["occurrences"] != 12 for i in guys_every):
+    failures.append("each 'guys' issue should carry occurrences=12")
+
+capped = hybrid_detect_bias(test_text, all_occurrences=True, max_occurrences_per_term=3)
+guys_capped = [i for i in capped["issues"] if i["word"] == "guys"]
+chairman_capped = [i for i in capped["issues"] if i["word"] == "chairman"]
+print(f"Capped at 3: {len(guys_capped)} 'guys', {len(chairman_capped)} 'chairman'")
+if len(guys_capped) != 3 or guys_capped[0]["occurrences"] != 12:
+    failures.append("cap should limit issues to 3 while keeping the full count")
+if len(chairman_capped) != 2:
+    failures.append("terms under the cap should report every occurrence")
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! All-occurrences mode reports, counts and caps correctly!")
+    sys.exit(0)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test /scan/batch on the FastAPI backend: JSON and NDJSON bodies, one result per document"""
+
+import json
+import signal
+import sys
+sys.path.insert(0, 'backend')
+
+from fastapi.testclient import TestClient
+
+import main
+
+print("=" * 80)
+print("BACKEND BATCH ENDPOINT TEST")
+print("=" * 80)
+
+failures = []
+
+
+def timed_out(signum, frame):
+    raise TimeoutError("request did not finish")
+
+
+# A request that hangs should fail the test, not stall it
+signal.signal(signal.SIGALRM, timed_out)
+
+documents = [{"id": f"job-{i}", "text": f"Posting {i}: we want an aggressive closer."} for i in range(5)]
+documents.append({"id": "empty", "text": "  "})
+ndjson = "\n".join(json.dumps(document) for document in documents) + "\nnot json\n\n"
+
+
+def post(client, body, content_type):
+    signal.alarm(60)
+    try:
+        return client.post("/scan/batch", content=body, headers={"Content-Type": content_type})
+    except TimeoutError as e:
+        failures.append(f"{content_type} batch: {e}")
+        return None
+    finally:
+        signal.alarm(0)
+
+
+with TestClient(main.app) as client:
+    for content_type, body, expected in [
+        ("application/x-ndjson", ndjson.encode('utf-8'), len(documents) + 1),
+        ("application/json", json.dumps(documents).encode('utf-8'), len(documents)),
+    ]:
+        response = post(client, body, content_type)
+        if response is None:
+            continue
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        results = {line["id"]: line for line in lines}
+        print(f"{content_type}: {response.status_code}, {len(lines)} result lines")
+        if response.status_code != 200 or len(lines) != expected:
+            failures.append(f"{content_type}: expected {expected} result lines, got {len(lines)}")
+            continue
+        for document in documents[:5]:
+            issues = results.get(document["id"], {}).get("result", {}).get("issues", [])
+            if not any(issue["word"] == "aggressive" for issue in issues):
+                failures.append(f"{content_type}: {document['id']} was not scanned")
+        if "error" not in results.get("empty", {}):
+            failures.append(f"{content_type}: an empty document should return an error line")
+
+    # The unparseable NDJSON line is answered by its index
+    response = post(client, ndjson.encode('utf-8'), "application/x-ndjson")
+    if response is not None and not any("error" in json.loads(line) and json.loads(line)["id"] == len(documents)
+                                        for line in response.text.splitlines() if line):
+        failures.append("An unparseable NDJSON line should get an error line")
+
+    # Batch documents and /scan share the server's scan cache
+    hits = client.get("/cache/stats").json()["hits"]
+    scanned = client.post("/scan", json={"text": documents[0]["text"]})
+    if client.get("/cache/stats").json()["hits"] != hits + 1:
+        failures.append("/scan of a batch document was not answered from the shared cache")
+    elif scanned.json() != results.get("job-0", {}).get("result"):
+        failures.append("/scan and /scan/batch returned different results for one document")
+
+    for name, body in [("empty", b"\n\n"),
+                       ("too large", b"\n".join(b'{"text": "x"}' for _ in range(main.MAX_BATCH_DOCUMENTS + 1)))]:
+        response = post(client, body, "application/x-ndjson")
+        if response is not None and response.status_code != 400:
+            failures.append(f"An {name} NDJSON batch should be a 400, got {response.status_code}")
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Batch scans answer every JSON and NDJSON document")
+sys.exit(0)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test request body limits on the FastAPI backend: /scan/stream and /upload-and-scan"""
+
+import json
+import sys
+sys.path.insert(0, 'backend')
+
+from fastapi.testclient import TestClient
+
+import main
+
+print("=" * 80)
+print("BACKEND BODY LIMIT TEST")
+print("=" * 80)
+
+failures = []
+
+
+def chunked(body, size=64 * 1024):
+    # A generator body is sent without a Content-Length
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def check(name, response, status, detail_start=None):
+    detail = response.json().get("detail", "") if status != 200 else ""
+    print(f"{name}: {response.status_code} {detail}")
+    if response.status_code != status:
+        failures.append(f"{name}: expected {status}, got {response.status_code}")
+    elif detail_start and not str(detail).startswith(detail_start):
+        failures.append(f"{name}: unexpected detail {detail!r}")
+
+
+with TestClient(main.app) as client:
+    small = json.dumps({"text": "We want an aggressive closer. " * 100}).encode('utf-8')
+    response = client.post("/scan/stream", content=small, headers={"Content-Type": "application/json"})
+    check("/scan/stream under the limit", response, 200)
+    if '"type":"summary"' not in response.text.replace(" ", ""):
+        failures.append("/scan/stream under the limit did not stream a summary")
+
+    large = json.dumps({"text": "x" * (main.MAX_STREAM_BYTES + 1)}).encode('utf-8')
+    check("/scan/stream over the limit", client.post(
+        "/scan/stream", content=large, headers={"Content-Type": "application/json"}
+    ), 400, "Body too large")
+    check("/scan/stream over the limit, chunked", client.post(
+        "/scan/stream", content=chunked(large), headers={"Content-Type": "application/json"}
+    ), 400, "Body too large")
+
+    check("/upload-and-scan under the limit", client.post(
+        "/upload-and-scan", files={"file": ("posting.txt", b"We want an aggressive closer.", "text/plain")}
+    ), 200)
+    check("/upload-and-scan over the limit", client.post(
+        "/upload-and-scan", files={"file": ("big.txt", b"x" * (main.UPLOAD_MAX_BYTES + 1), "text/plain")}
+    ), 400, "File too large")
+
+    # Other endpoints are not limited by the stream cap
+    check("/scan", client.post("/scan", json={"text": "We want an aggressive closer."}), 200)
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Oversized bodies are refused before they are parsed")
+sys.exit(0)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test batch scanning: every document answered once, matching a single /scan"""
+
+import sys
+sys.path.insert(0, 'api/biasradar')
+
+from _batch import iter_batch_results, scan_document
+from _bias_detection import hybrid_detect_bias, build_scan_response
+
+documents = [
+    {"id": f"job-{i}", "text": f"Posting {i}: the chairman wants young, energetic rockstars."}
+    for i in range(6)
+]
+documents += [
+    {"id": "compact", "text": "Our guys are digital natives.", "response_format": "v2"},
+    {"id": "empty", "text": "   "},
+    {"text": "No id here, so the index is used."},
+    None,
+]
+
+print("=" * 80)
+print("BATCH SCAN TEST")
+print("=" * 80)
+
+failures = []
+
+results = {result["id"]: result for result in iter_batch_results(documents)}
+print(f"\n{len(documents)} documents in, {len(results)} results out")
+if len(results) != len(documents):
+    failures.append("every document should produce exactly one result")
+
+for document in documents[:6]:
+    expected = build_scan_response(hybrid_detect_bias(document["text"]))
+    if results.get(document["id"], {}).get("result") != expected:
+        failures.append(f"{document['id']} should match a single scan")
+
+if results.get("compact", {}).get("result", {}).get("format") != "v2":
+    failures.append("per-document response_format should be honoured")
+if "error" not in results.get("empty", {}):
+    failures.append("an empty document should return an error, not fail the batch")
+if "result" not in results.get(8, {}):
+    failures.append("a document without an id should be keyed by its index")
+if "error" not in results.get(9, {}):
+    failures.append("a non-object document should return an error")
+if scan_document({"id": "big", "text": "x" * 50001})["error"] != "Text too long. Maximum 50,000 characters.":
+    failures.append("oversized documents should be rejected")
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! Batch results match single scans!")
+    sys.exit(0)
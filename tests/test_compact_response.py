@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test that the v2 compact response decodes back to the v1 issues and heatmap"""
+
+import json
+import sys
+sys.path.insert(0, 'api/biasradar')
+
+from _bias_detection import hybrid_detect_bias, compact_issues
+
+test_text = " ".join([
+    "The chairman wants young, energetic rockstars who are digital natives.",
+    "Our guys in developing countries handle the crazy deadlines.",
+    "Please review the attached quarterly report before Friday.",
+] * 40)
+
+print("=" * 80)
+print("COMPACT RESPONSE TEST - v2 columnar format")
+print("=" * 80)
+
+failures = []
+
+v1 = hybrid_detect_bias(test_text, all_occurrences=True)
+v2 = hybrid_detect_bias(test_text, all_occurrences=True, response_format="v2")
+columns, tables = compact_issues(v2["issues"])
+
+# Issues: rebuild dicts from the parallel arrays and template table
+decoded = []
+for row in range(len(columns["word"])):
+    issue = {
+        "word": columns["word"][row],
+        "bias_type": tables["bias_type"][columns["bias_type"][row]],
+        "severity": tables["severity"][columns["severity"][row]],
+        "explanation": tables["explanation"][columns["explanation"][row]].replace("{word}", columns["word"][row]),
+        "position": columns["position"][row]
+    }
+    for key, values in columns.items():
+        if key not in issue and values[row] is not None:
+            issue[key] = values[row]
+    decoded.append(issue)
+
+print(f"\n{len(decoded)} issues, {len(tables['explanation'])} explanation template(s)")
+if decoded != v1["issues"]:
+    failures.append("decoded v2 issues differ from v1 issues")
+
+# Heatmap: expand ranges back to per-token severities
+ranges = v2["heatmap"]
+expanded = []
+for offset, length, level in zip(ranges["offset"], ranges["length"], ranges["severity"]):
+    expanded.extend([tables["severity"][level]] * len(test_text[offset:offset + length].split()))
+expected = [entry["severity"] for entry in v1["heatmap"]]
+print(f"{len(ranges['offset'])} heatmap range(s) for {v2['token_count']} tokens")
+if expanded != expected:
+    failures.append("expanded v2 heatmap differs from v1 heatmap")
+if v2["token_count"] != len(v1["heatmap"]):
+    failures.append("token_count should match the number of v1 heatmap entries")
+
+v1_size = len(json.dumps({"issues": v1["issues"], "heatmap": v1["heatmap"]}))
+v2_size = len(json.dumps({"issues": columns, "heatmap": ranges, "tables": tables}, separators=(',', ':')))
+print(f"Payload: v1 {v1_size} bytes, v2 {v2_size} bytes ({v1_size / v2_size:.1f}x smaller)")
+if v2_size * 5 > v1_size:
+    failures.append("v2 payload should be several times smaller than v1")
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! v2 response is lossless and compact!")
+    sys.exit(0)
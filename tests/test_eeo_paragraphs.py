@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test that only EEO paragraphs are skipped, not the whole document"""
+
+import sys
+sys.path.insert(0, 'api/biasradar')
+
+from _bias_detection import hybrid_detect_bias
+
+job_posting = """We are hiring a chairman to lead our sales team.
+
+We are an equal opportunity employer. All qualified applicants will receive consideration without regard to race, color, religion, sex, sexual orientation, gender identity, or veteran status.
+
+The ideal hire is one of the guys and works well with salesmen."""
+
+eeo_only = "We are an equal opportunity employer. Employment decisions will be based on merit."
+
+print("=" * 80)
+print("EEO PARAGRAPH TEST - Skip boilerplate, scan the rest")
+print("=" * 80)
+
+failures = []
+
+result = hybrid_detect_bias(job_posting)
+words = [issue["word"] for issue in result["issues"]]
+print(f"\nJob posting: score {result['score']}, flagged {words}")
+
+for expected in ["chairman", "guys", "salesmen"]:
+    if expected not in words:
+        failures.append(f"'{expected}' outside the EEO paragraph should be flagged")
+if result.get("eeo_paragraphs_skipped") != 1:
+    failures.append("exactly one EEO paragraph should be reported as skipped")
+
+eeo_start = job_posting.index("We are an equal")
+eeo_end = job_posting.index("\n\n", eeo_start)
+for issue in result["issues"]:
+    if eeo_start <= issue["position"] < eeo_end:
+        failures.append(f"'{issue['word']}' was flagged inside the EEO paragraph")
+    elif job_posting.lower().find(issue["word"], issue["position"]) != issue["position"]:
+        failures.append(f"'{issue['word']}' has a wrong document offset {issue['position']}")
+
+eeo_result = hybrid_detect_bias(eeo_only)
+print(f"EEO-only text: score {eeo_result['score']}, method {eeo_result['detection_method']}")
+if eeo_result["detection_method"] != "eeo_whitelisted" or eeo_result["score"] != 0:
+    failures.append("a document made only of EEO paragraphs should still be whitelisted")
+
+# An EEO footer splits the document into segments; lexicon terms are still
+# reported once, stereotype patterns and 'developing countries' at every occurrence
+for name, repeated in [
+    ("Repeated term", "Our chairman wants a rockstar.\n\nThe chairman leads the team.\n\nThe chairman signs off."),
+    ("Repeated patterns", "Aid to developing countries is key.\n\nMore developing nations need help. "
+                          "All women are weak.\n\nAll women are weak, again."),
+]:
+    unsplit = hybrid_detect_bias(repeated)
+    with_footer = hybrid_detect_bias(repeated + "\n\nWe are an equal opportunity employer.")
+    print(f"{name}: score {unsplit['score']} without EEO footer, {with_footer['score']} with it")
+    if (with_footer["score"], len(with_footer["issues"])) != (unsplit["score"], len(unsplit["issues"])):
+        failures.append(f"{name}: an EEO footer changed the result: {len(unsplit['issues'])} issues, score "
+                        f"{unsplit['score']} became {len(with_footer['issues'])} issues, score {with_footer['score']}")
+    if [issue["position"] for issue in with_footer["issues"]] != [issue["position"] for issue in unsplit["issues"]]:
+        failures.append(f"{name}: an EEO footer changed which occurrences are reported")
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! EEO paragraphs skipped, remaining paragraphs scanned!")
+    sys.exit(0)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test streamed /fix: tokens arrive before generation finishes, improvements come last"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+sys.path.insert(0, 'api/biasradar')
+
+print("=" * 80)
+print("STREAMING FIX TEST")
+print("=" * 80)
+
+failures = []
+TOKENS = ["The ", "chairperson ", "should ", "ensure ", "fairness."]
+TOKEN_DELAY = 0.1
+
+
+class StandInLLM(BaseHTTPRequestHandler):
+    """OpenAI-compatible stand-in that generates one token every TOKEN_DELAY seconds"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if not request.get("stream"):
+            if request["messages"][0]["content"].startswith("List"):
+                content = "1. Replaced chairman\n2. Neutral tone"
+            else:
+                time.sleep(TOKEN_DELAY * (len(TOKENS) - 1))
+                content = json.dumps({"fixed_text": "".join(TOKENS), "improvements": ["Replaced chairman", "Neutral tone"]})
+            body = json.dumps({"choices": [{"message": {"content": content}}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        events = [{"choices": [{"delta": {"role": "assistant"}}]}]
+        events += [{"choices": [{"delta": {"content": token}}]} for token in TOKENS]
+        for i, event in enumerate(events):
+            if i > 1:
+                time.sleep(TOKEN_DELAY)
+            self.write_chunk(f"data: {json.dumps(event)}\n\n")
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+llm = ThreadingHTTPServer(("127.0.0.1", 0), StandInLLM)
+llm.daemon_threads = True
+threading.Thread(target=llm.serve_forever, daemon=True).start()
+os.environ["OPENAI_API_KEY"] = "test"
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+
+import fix
+from _llm_transport import get_llm_transport
+
+fix.handler.log_message = lambda *args: None
+api = HTTPServer(("127.0.0.1", 0), fix.handler)
+threading.Thread(target=api.serve_forever, daemon=True).start()
+
+
+def post_fix(payload):
+    conn = http.client.HTTPConnection("127.0.0.1", api.server_address[1], timeout=10)
+    body = json.dumps(payload)
+    conn.request("POST", "/", body=body, headers={"Content-Type": "application/json"})
+    return conn, conn.getresponse()
+
+
+# Buffered /fix: nothing arrives until the whole rewrite and the improvements are done
+start = time.perf_counter()
+conn, response = post_fix({"text": "The chairman should ensure fairness."})
+buffered = json.loads(response.read())
+buffered_total = time.perf_counter() - start
+conn.close()
+
+# Streamed /fix: read events as they arrive
+start = time.perf_counter()
+conn, response = post_fix({"text": "The chairman should ensure fairness.", "stream": True})
+first_token_at = None
+events = []
+event_name = None
+for raw_line in response:
+    line = raw_line.decode('utf-8').rstrip('\n')
+    if line.startswith("event: "):
+        event_name = line[7:]
+    elif line.startswith("data: "):
+        events.append((event_name, json.loads(line[6:])))
+        if event_name == "token" and first_token_at is None:
+            first_token_at = time.perf_counter() - start
+streamed_total = time.perf_counter() - start
+conn.close()
+
+print(f"Buffered: first byte after {buffered_total * 1000:.0f}ms")
+print(f"Streamed: first token after {first_token_at * 1000:.0f}ms, done after {streamed_total * 1000:.0f}ms")
+
+if response.getheader('Content-Type') != 'text/event-stream':
+    failures.append(f"Content-Type {response.getheader('Content-Type')}")
+tokens = [payload["text"] for name, payload in events if name == "token"]
+if tokens != TOKENS:
+    failures.append(f"Token events {tokens}")
+if not events or events[-1][0] != "done":
+    failures.append(f"Last event is {events[-1][0] if events else None}, expected done")
+else:
+    done = events[-1][1]
+    if done["fixed_text"] != "".join(TOKENS).strip() or done["fixed_text"] != buffered["fixed_text"]:
+        failures.append(f"fixed_text mismatch: {done['fixed_text']!r} vs {buffered['fixed_text']!r}")
+    if done["improvements"] != ["Replaced chairman", "Neutral tone"]:
+        failures.append(f"Improvements {done['improvements']}")
+if first_token_at is None or first_token_at > TOKEN_DELAY * 2:
+    failures.append(f"First token took {first_token_at}s; generation takes {TOKEN_DELAY * (len(TOKENS) - 1):.1f}s")
+
+# The streamed call left its connection in the pool for the next request
+transport = get_llm_transport()
+if transport.connections_opened > 2:
+    failures.append(f"Transport opened {transport.connections_opened} connections for 3 LLM calls")
+
+api.shutdown()
+llm.shutdown()
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ /fix streams tokens as they are generated")
+sys.exit(0)
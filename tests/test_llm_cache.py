@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test the on-disk LLM validation cache: replay, eviction, TTL and cross-process sharing"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, 'api/biasradar')
+
+from _llm_cache import LLMResultCache
+
+print("=" * 80)
+print("LLM CACHE TEST")
+print("=" * 80)
+
+failures = []
+workdir = tempfile.mkdtemp()
+
+
+def write_from_child(path):
+    LLMResultCache(path, max_bytes=10000).put("shared", [{"word": "from child"}])
+
+
+# Values survive across instances and processes
+path = os.path.join(workdir, "shared.sqlite3")
+child = multiprocessing.Process(target=write_from_child, args=(path,))
+child.start()
+child.join()
+shared = LLMResultCache(path, max_bytes=10000).get("shared")
+print(f"\nWritten by another process: {shared}")
+if shared != [{"word": "from child"}]:
+    failures.append("a value written by another process should be readable")
+
+# Least recently used rows go first once the byte budget is exceeded
+cache = LLMResultCache(os.path.join(workdir, "lru.sqlite3"), max_bytes=100)
+cache.put("a", "x" * 40)
+cache.put("b", "y" * 40)
+time.sleep(0.01)
+cache.get("a")
+cache.put("c", "z" * 40)
+print(f"After overflow: {cache.stats()}")
+if cache.get("b") is not None or cache.get("a") is None or cache.get("c") is None:
+    failures.append("the least recently used row should be evicted")
+
+# Optional TTL
+expiring = LLMResultCache(os.path.join(workdir, "ttl.sqlite3"), max_bytes=1000, ttl_seconds=0.05)
+expiring.put("k", [1])
+time.sleep(0.1)
+if expiring.get("k") is not None:
+    failures.append("entries should expire after ttl_seconds")
+
+# Cached findings replay with positions recomputed, without an API call
+os.environ["BIASRADAR_LLM_CACHE_PATH"] = os.path.join(workdir, "validation.sqlite3")
+os.environ.pop("AI_INTEGRATIONS_OPENAI_API_KEY", None)
+from _bias_detection import get_llm_cache, OPENAI_VALIDATION_MODEL, VALIDATION_PROMPT_VERSION, validate_with_openai
+import hashlib
+
+text = "Our team lead is a real ninja. Hire a ninja today."
+key = "|".join((hashlib.sha256(text.encode("utf-8")).hexdigest(), OPENAI_VALIDATION_MODEL, VALIDATION_PROMPT_VERSION))
+get_llm_cache().put(key, [{"word": "Ninja", "bias_type": "culture", "severity": "low", "explanation": "jargon"}])
+replayed = validate_with_openai(text, enable_ai=True)
+print(f"Replayed: {replayed}")
+if len(replayed) != 1 or replayed[0]["position"] != text.lower().find("ninja"):
+    failures.append("cached findings should replay with their position in the text")
+if validate_with_openai(text + " ", enable_ai=True) != []:
+    failures.append("different text must miss the cache")
+
+# Threads racing to open the cache share one instance
+import threading
+import _bias_detection
+import _llm_cache
+
+opened = []
+real_default = _llm_cache.default_llm_cache
+
+
+def slow_default():
+    opened.append(1)
+    time.sleep(0.05)
+    return real_default()
+
+
+_llm_cache.default_llm_cache = slow_default
+_bias_detection._LLM_CACHE = None
+start = threading.Barrier(16)
+caches = []
+threads = [threading.Thread(target=lambda: (start.wait(), caches.append(get_llm_cache()))) for _ in range(16)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+_llm_cache.default_llm_cache = real_default
+print(f"16 threads opened the cache {len(opened)} time(s)")
+if len(opened) != 1 or len({id(cache) for cache in caches}) != 1:
+    failures.append(f"concurrent first use opened {len(opened)} caches")
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! LLM results are cached on disk and replayed!")
+    sys.exit(0)
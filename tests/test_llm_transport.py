@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Benchmark the pooled LLM transport against a local OpenAI-compatible stand-in server"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, 'api/biasradar')
+
+from _llm_transport import LLMTransport, LLMError
+
+print("=" * 80)
+print("LLM TRANSPORT BENCHMARK")
+print("=" * 80)
+
+failures = []
+CALLS = 200
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if request.get("model") == "missing-model":
+            status, body = 404, b'{"error": "model not found"}'
+        else:
+            reply = f"echo: {request['messages'][-1]['content']}"
+            body = json.dumps({"choices": [{"message": {"role": "assistant", "content": reply}}]}).encode('utf-8')
+            status = 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Simulate a server dropping a keep-alive connection without announcing it
+        if request['messages'][-1]['content'] == "drop":
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+server.daemon_threads = True
+server.lock = threading.Lock()
+server.connections = 0
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def urllib_chat(content):
+    """The old per-call path: a fresh connection for every request"""
+    payload = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": content}]}
+    req = urllib.request.Request(
+        f"{base_url}/chat/completions",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={"Authorization": "Bearer test", "Content-Type": "application/json"},
+        method='POST'
+    )
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return json.loads(response.read().decode('utf-8'))['choices'][0]['message']['content']
+
+
+def run(label, call):
+    before = server.connections
+    start = time.perf_counter()
+    for i in range(CALLS):
+        reply = call(f"message {i}")
+        if reply != f"echo: message {i}":
+            failures.append(f"{label}: unexpected reply {reply!r}")
+            break
+    elapsed = time.perf_counter() - start
+    opened = server.connections - before
+    print(f"{label:<10} {CALLS} calls in {elapsed * 1000:7.1f}ms "
+          f"({elapsed / CALLS * 1e6:6.0f}us/call), {opened} connections")
+    return elapsed, opened
+
+
+transport = LLMTransport(base_url, "test", pool_size=4, timeout=5.0)
+fresh_time, fresh_connections = run("urllib", urllib_chat)
+pooled_time, pooled_connections = run(
+    "pooled", lambda content: transport.chat([{"role": "user", "content": content}])
+)
+print(f"Speedup: {fresh_time / pooled_time:.1f}x")
+
+if fresh_connections != CALLS:
+    failures.append(f"urllib opened {fresh_connections} connections, expected {CALLS}")
+if pooled_connections != 1:
+    failures.append(f"Sequential pooled calls opened {pooled_connections} connections, expected 1")
+
+# Concurrent callers never open more than pool_size connections
+before, opened_before = server.connections, transport.connections_opened
+with ThreadPoolExecutor(max_workers=16) as pool:
+    replies = list(pool.map(lambda i: transport.chat([{"role": "user", "content": str(i)}]), range(100)))
+if replies != [f"echo: {i}" for i in range(100)]:
+    failures.append("Concurrent replies out of order or wrong")
+if transport.connections_opened > transport.pool_size:
+    failures.append(f"Opened {transport.connections_opened} connections with pool_size {transport.pool_size}")
+if transport.connections_opened - opened_before != server.connections - before:
+    failures.append(f"Counted {transport.connections_opened - opened_before} new connections, "
+                    f"the server accepted {server.connections - before}")
+print(f"Concurrent: 100 calls over 16 threads, {server.connections - before} new connections")
+
+# Async callers share the same pool
+async def async_calls():
+    return await asyncio.gather(*(transport.achat([{"role": "user", "content": f"a{i}"}]) for i in range(20)))
+
+if asyncio.run(async_calls()) != [f"echo: a{i}" for i in range(20)]:
+    failures.append("Async replies wrong")
+
+# Error responses surface as LLMError and leave the connection usable
+try:
+    transport.chat([{"role": "user", "content": "x"}], model="missing-model")
+    failures.append("404 did not raise")
+except LLMError as e:
+    if e.status != 404:
+        failures.append(f"LLMError status {e.status}, expected 404")
+
+# A connection the server dropped while idle is replaced transparently
+transport.close()
+transport.chat([{"role": "user", "content": "drop"}])
+opened = transport.connections_opened
+time.sleep(0.05)
+if transport.chat([{"role": "user", "content": "after drop"}]) != "echo: after drop":
+    failures.append("Call on a dropped connection was not retried")
+if transport.connections_opened != opened + 1:
+    failures.append("Dropped connection was not replaced with a fresh one")
+
+transport.close()
+server.shutdown()
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Pooled transport reuses keep-alive connections")
+sys.exit(0)
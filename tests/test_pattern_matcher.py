@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Test that the single-pass lexicon matcher agrees with per-word regex search"""
+
+import re
+import sys
+sys.path.insert(0, 'api/biasradar')
+
+from _bias_detection import LEXICON_MATCHER, MultiPatternMatcher, find_lexicon_matches
+
+test_texts = [
+    "The chairman is an aggressive rockstar. The CHAIRMAN's chairmanship is fine.",
+    "Old lazy transgender welfare queens and crazy cat ladies on handouts are illegals.",
+    "We need a young, energetic candidate - man-made deadlines, man hours and man-hours.",
+    "Acting like snowflakes, like snowflakes, a snowflake; snowflakes.",
+    "It's a fact that 100% guaranteed results never works for developing countries.",
+    "guy_guy guys,guy. _guy guy",
+    "",
+]
+
+print("=" * 80)
+print("PATTERN MATCHER TEST - Single pass vs per-word regex")
+print("=" * 80)
+
+failures = []
+
+for i, test_text in enumerate(test_texts, 1):
+    text_lower = test_text.lower()
+    matches = find_lexicon_matches(text_lower)
+    print(f"\n{i}. Testing: \"{test_text}\"")
+
+    for phrase in LEXICON_MATCHER.phrases:
+        pattern = r'\b' + re.escape(phrase) + r'\b'
+        expected = [m.start() for m in re.finditer(pattern, text_lower)]
+        found = matches.get(phrase, [])
+        # finditer skips overlapping hits of the same phrase; the automaton does not
+        if expected and found[:1] != expected[:1] or not set(expected) <= set(found):
+            failures.append((test_text, phrase, expected, found))
+            print(f"   ❌ '{phrase}': expected {expected}, got {found}")
+
+    if not any(f[0] == test_text for f in failures):
+        print(f"   ✅ {sum(len(v) for v in matches.values())} hit(s) match regex search")
+
+# Overlapping phrases must all be reported from one pass
+matcher = MultiPatternMatcher(["he", "she", "hers", "his"], word_boundaries=False)
+overlaps = sorted(matcher.finditer("ushers"))
+print(f"\nOverlap check: {overlaps}")
+if overlaps != [(1, "she"), (2, "he"), (2, "hers")]:
+    failures.append(("ushers", "overlap", [(1, "she"), (2, "he"), (2, "hers")], overlaps))
+
+print("\n" + "=" * 80)
+if failures:
+    print(f"⚠️  {len(failures)} MISMATCH(ES)")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! Matcher agrees with regex search on all texts!")
+    sys.exit(0)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Test the model-free pronoun-imbalance analyzer used in place of spaCy"""
+
+import sys
+import time
+sys.path.insert(0, 'modelproof-site/api/biasradar')
+
+started = time.perf_counter()
+from _bias_detection import count_gendered_pronouns, detect_gender_bias, detect_pronoun_imbalance
+import_ms = (time.perf_counter() - started) * 1000
+
+print("=" * 80)
+print("PRONOUN ANALYZER TEST")
+print("=" * 80)
+
+failures = []
+
+# Whole words only; contractions and possessives count like spaCy tokens
+cases = [
+    ("He said his team trusts him. He's proud of himself.", {"male": 5, "female": 0}),
+    ("She told her manager; the report was hers, not her colleague's.", {"male": 0, "female": 3}),
+    ("The hero shed a tear there; the sheet and theme stayed with hehe.", {"male": 0, "female": 0}),
+    ("He/she should submit his or her form", {"male": 2, "female": 2}),
+]
+for text, expected in cases:
+    counted = count_gendered_pronouns(text.lower())
+    status = "✅" if counted == expected else "❌"
+    print(f"{status} {counted} <- {text!r}")
+    if counted != expected:
+        failures.append(f"{text!r}: counted {counted}, expected {expected}")
+
+# Imbalance needs more than three pronouns with over 70% of one gender
+skewed = "He leads. He decides. His word is final and everyone follows him."
+balanced = "He leads the team and she runs operations; his plan and her budget align."
+few = "He said he would call him."
+if not any(issue["word"] == "pronoun imbalance" for issue in detect_gender_bias(skewed.lower())):
+    failures.append("Skewed pronoun usage was not flagged")
+if any(issue["word"] == "pronoun imbalance" for issue in detect_gender_bias(balanced.lower())):
+    failures.append("Balanced pronoun usage was flagged")
+if detect_pronoun_imbalance(count_gendered_pronouns(few.lower())):
+    failures.append("Three pronouns should be too few to flag")
+
+# A realistic document scans fast and without loading any NLP model
+document = (skewed + " " + balanced + " ") * 500
+started = time.perf_counter()
+count_gendered_pronouns(document.lower())
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(f"\nImport: {import_ms:.1f}ms, {len(document):,} chars counted in {elapsed_ms:.2f}ms")
+if "spacy" in sys.modules:
+    failures.append("spaCy was imported")
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Pronoun imbalance detected without a spaCy model")
+sys.exit(0)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test the scan result cache: hits, LRU and TTL eviction, byte bound, thread safety"""
+
+import sys
+import threading
+import time
+sys.path.insert(0, 'api/biasradar')
+
+from _result_cache import ResultCache
+from _bias_detection import SCAN_CACHE, cached_hybrid_detect_bias, hybrid_detect_bias, scan_cache_key
+
+print("=" * 80)
+print("RESULT CACHE TEST")
+print("=" * 80)
+
+failures = []
+
+# LRU eviction by byte size, not entry count
+now = [0.0]
+cache = ResultCache(max_bytes=10, ttl_seconds=60, size_of=len, clock=lambda: now[0])
+cache.put("a", "aaaa")
+cache.put("b", "bbbb")
+cache.get("a")
+cache.put("c", "cccc")
+print(f"\nAfter overflow: {cache.stats()}")
+if cache.get("b") is not None or cache.get("a") != "aaaa" or cache.stats()["evictions"] != 1:
+    failures.append("the least recently used entry should be evicted once the byte budget is exceeded")
+cache.put("huge", "x" * 11)
+if cache.get("huge") is not None:
+    failures.append("a value larger than the whole budget should not be stored")
+
+# TTL expiry
+now[0] = 61.0
+if cache.get("a") is not None or cache.stats()["expirations"] != 1:
+    failures.append("entries should expire after ttl_seconds")
+
+# Disabled cache never stores
+disabled = ResultCache(max_bytes=0, ttl_seconds=60, size_of=len)
+disabled.put("a", "a")
+if disabled.get("a") is not None:
+    failures.append("max_bytes=0 should disable the cache")
+
+# Concurrent puts and gets keep the byte count consistent
+shared = ResultCache(max_bytes=1000, ttl_seconds=60, size_of=len)
+def worker(n):
+    for i in range(2000):
+        shared.put((n, i % 50), "x" * (i % 40))
+        shared.get((n, (i + 7) % 50))
+threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+stats = shared.stats()
+print(f"After concurrent use: {stats}")
+if stats["bytes"] > 1000 or stats["bytes"] != sum(len(v) for v, _, _ in shared._entries.values()):
+    failures.append("byte accounting should stay exact under concurrent access")
+
+# Scan results: repeat scans hit, any option change misses
+text = "The chairman wants young, energetic rockstars. " * 200
+SCAN_CACHE.clear()
+start = time.perf_counter()
+first = cached_hybrid_detect_bias(text)
+miss_time = time.perf_counter() - start
+start = time.perf_counter()
+second = cached_hybrid_detect_bias(text)
+hit_time = time.perf_counter() - start
+print(f"Scan: miss {miss_time * 1000:.1f}ms, hit {hit_time * 1e6:.0f}µs")
+if second is not first or first != hybrid_detect_bias(text):
+    failures.append("a repeat scan should return the cached result")
+if scan_cache_key(text) == scan_cache_key(text, all_occurrences=True) or scan_cache_key(text) == scan_cache_key(text + " "):
+    failures.append("options and exact text should be part of the key")
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! Result cache evicts, expires and hits correctly!")
+    sys.exit(0)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test that windowed streaming scans find the same issues wherever the windows fall"""
+
+import random
+import sys
+sys.path.insert(0, 'api/biasradar')
+
+from _bias_detection import iter_streaming_scan, iter_text_windows
+
+random.seed(7)
+sentences = [
+    "The chairman wants young, energetic rockstars who are digital natives.",
+    "Our guys in developing countries handle the crazy deadlines.",
+    "Please review the attached quarterly report before Friday.",
+    "All women are emotional, he said.",
+    "We are an equal opportunity employer and value diversity regardless of race.",
+    "Salesmen and the crazy manpower plan are a fact that everyone knows.",
+]
+# Some paragraphs run across several windows, with an EEO sentence anywhere in them
+text = "\n\n".join(
+    " ".join(random.choice(sentences) for _ in range(random.choice([1, 2, 3, 4, 5, 40, 80])))
+    for _ in range(250)
+)
+
+
+def scan(window_size, chunk_size, **options):
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    events = list(iter_streaming_scan(chunks, window_size=window_size, **options))
+    issues = sorted((e["position"], e["bias_type"], e["word"]) for kind, e in events if kind == "issue")
+    summary = events[-1][1]
+    return issues, summary
+
+
+print("=" * 80)
+print(f"STREAMING SCAN TEST - {len(text)} characters")
+print("=" * 80)
+
+failures = []
+
+# Owned ranges must tile the document exactly
+owned = [(base + start, base + end) for base, _, start, end in iter_text_windows([text], 1000)]
+if owned[0][0] != 0 or owned[-1][1] != len(text) or any(a[1] != b[0] for a, b in zip(owned, owned[1:])):
+    failures.append("window owned ranges should tile the document")
+
+for options in ({}, {"all_occurrences": True, "max_occurrences_per_term": 5}):
+    reference, reference_summary = scan(10 ** 9, len(text), **options)
+    for window_size in (600, 1000, 4000, 20000):
+        issues, summary = scan(window_size, 777, **options)
+        print(f"\n{options or 'first occurrence'}, window {window_size}: "
+              f"{len(issues)} issues in {summary['windows']} windows")
+        if issues != reference:
+            failures.append(f"window {window_size} {options}: issues differ from a single-window scan")
+        if any(summary.get(key) != reference_summary.get(key)
+               for key in ("score", "occurrences", "eeo_paragraphs_skipped")):
+            failures.append(f"window {window_size} {options}: summary differs from a single-window scan")
+
+for position, bias_type, word in reference:
+    if bias_type not in ("intersectional", "pattern_stereotype") and text.lower().find(word, position) != position:
+        failures.append(f"'{word}' has a wrong document offset {position}")
+        break
+
+print("\n" + "=" * 80)
+if failures:
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    sys.exit(1)
+else:
+    print("✅ SUCCESS! Streaming windows agree with a whole-document scan!")
+    sys.exit(0)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Test single-call structured fixes and the two-call fallback against a stand-in LLM"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, 'api/biasradar')
+sys.path.insert(0, 'backend')
+
+print("=" * 80)
+print("STRUCTURED FIX TEST")
+print("=" * 80)
+
+failures = []
+CALL_LATENCY = 0.1
+TEXT = "The chairman should hire young, energetic salesmen."
+REWRITE = "The chair should hire energetic salespeople."
+stand_in = {"structured_reply": None, "structured_status": 200, "calls": 0, "input_bytes": 0}
+
+
+class StandInLLM(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers['Content-Length']))
+        request = json.loads(raw)
+        stand_in["calls"] += 1
+        stand_in["input_bytes"] += len(raw)
+        time.sleep(CALL_LATENCY)
+        if request.get("response_format") == {"type": "json_object"} and stand_in["structured_status"] != 200:
+            # A model or deployment that does not support JSON mode
+            body = b'{"error": {"message": "response_format is not supported with this model"}}'
+            self.send_response(stand_in["structured_status"])
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if request.get("response_format") == {"type": "json_object"}:
+            content = stand_in["structured_reply"]
+        elif request["messages"][0]["content"].startswith("List"):
+            content = "1. Replaced chairman with chair\n2. Removed age preference\n- Used salespeople"
+        else:
+            content = REWRITE
+        body = json.dumps({"choices": [{"message": {"content": content}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+llm = ThreadingHTTPServer(("127.0.0.1", 0), StandInLLM)
+llm.daemon_threads = True
+threading.Thread(target=llm.serve_forever, daemon=True).start()
+os.environ["OPENAI_API_KEY"] = "test"
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+os.environ["AI_INTEGRATIONS_OPENAI_API_KEY"] = "test"
+os.environ["AI_INTEGRATIONS_OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+
+from fix import (call_openai, generate_fix, improvements_messages, parse_improvements,
+                 parse_structured_fix, rewrite_messages)
+
+
+def measure(run):
+    stand_in.update(calls=0, input_bytes=0)
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start, stand_in["calls"], stand_in["input_bytes"]
+
+
+def two_call_fix():
+    fixed_text = call_openai(messages=rewrite_messages(TEXT), temperature=0.7, max_tokens=500)
+    improvements = call_openai(messages=improvements_messages(TEXT, fixed_text), temperature=0.5, max_tokens=200)
+    return fixed_text, parse_improvements(improvements)
+
+
+stand_in["structured_reply"] = json.dumps({
+    "fixed_text": f"  {REWRITE}  ",
+    "improvements": ["Replaced chairman with chair", "Removed age preference", "", 42, "Used salespeople"]
+})
+two_call, two_call_time, two_call_calls, two_call_bytes = measure(two_call_fix)
+structured, structured_time, structured_calls, structured_bytes = measure(lambda: generate_fix(TEXT))
+print(f"Two calls:  {two_call_time * 1000:.0f}ms, {two_call_calls} LLM calls, {two_call_bytes} request bytes")
+print(f"Structured: {structured_time * 1000:.0f}ms, {structured_calls} LLM call,  {structured_bytes} request bytes")
+
+expected_improvements = ["Replaced chairman with chair", "Removed age preference", "Used salespeople"]
+if structured != (REWRITE, expected_improvements):
+    failures.append(f"Structured fix returned {structured}")
+if two_call != structured:
+    failures.append(f"Two-call and structured fixes differ: {two_call} vs {structured}")
+if structured_calls != 1:
+    failures.append(f"Structured fix made {structured_calls} calls")
+if structured_bytes >= two_call_bytes:
+    failures.append("Structured fix did not send fewer request bytes")
+
+# Unusable structured replies fall back to the two-call path
+for reply in ["not json", "[]", '{"improvements": ["x"]}', '{"fixed_text": "   "}']:
+    stand_in["structured_reply"] = reply
+    result, _, calls, _ = measure(lambda: generate_fix(TEXT))
+    if result != two_call or calls != 3:
+        failures.append(f"Reply {reply!r}: got {result} after {calls} calls, expected fallback")
+
+# A JSON-mode call the API refuses also falls back, in both /fix implementations
+stand_in["structured_status"] = 400
+result, _, calls, _ = measure(lambda: generate_fix(TEXT))
+if result != two_call or calls != 3:
+    failures.append(f"Refused JSON-mode call: got {result} after {calls} calls, expected fallback")
+
+from fastapi.testclient import TestClient
+import main
+
+with TestClient(main.app) as client:
+    response, _, calls, _ = measure(lambda: client.post("/fix", json={"text": TEXT}))
+print(f"Backend /fix with JSON mode refused: {response.status_code} after {calls} LLM calls")
+if response.status_code != 200 or response.json()["fixed_text"] != REWRITE or calls != 3:
+    failures.append(f"Backend /fix did not fall back: {response.status_code} {response.text[:200]}")
+stand_in["structured_status"] = 200
+
+# A usable rewrite without improvements keeps the rewrite and the default list
+parsed = parse_structured_fix(json.dumps({"fixed_text": REWRITE, "improvements": "none"}))
+if parsed is None or parsed[0] != REWRITE or not parsed[1]:
+    failures.append(f"Rewrite without improvements parsed as {parsed}")
+
+llm.shutdown()
+
+print()
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Structured fix needs one LLM round trip")
+sys.exit(0)